@@ -3,20 +3,39 @@ Shared configuration for forge3 hooks.
 
 Single source of truth: workflowd.config
 Hooks read from env vars (if set) or import defaults from workflowd.
+
+workflowd is imported only when a value is actually resolved; ENGINE_URL
+is computed on first access so the no-workflow fast path never pays for it.
+
+SESSION POINTER:
+The workflows root is resolved once per process (per
+WORKFLOW_ENGINE_WORKFLOWS_DIR value). current.json is parsed only when its
+stat (mtime_ns, inode, size) changes; the parsed workflow_id is also written
+to a fixed-layout current.ptr next to it, so other processes answer with
+one stat and one pread instead of a read and a JSON parse.
 """
 
 import json
 import os
+import struct
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple, Union
 
 
 def get_engine_url() -> str:
-    """Resolve engine URL with legacy fallbacks."""
+    """Resolve engine URL with legacy fallbacks.
+
+    Returns an http:// URL, or unix:///path/to/workflowd.sock for the
+    Unix-domain-socket transport (WORKFLOW_ENGINE_URL or WORKFLOW_ENGINE_SOCKET).
+    """
     url = os.environ.get("WORKFLOW_ENGINE_URL")
     if url:
         return url
 
+    socket_path = os.environ.get("WORKFLOW_ENGINE_SOCKET")
+    if socket_path:
+        return f"unix://{os.path.abspath(os.path.expanduser(socket_path))}"
+
     host = os.environ.get("WORKFLOW_ENGINE_HOST")
     port = os.environ.get("WORKFLOW_ENGINE_PORT")
     if host and port:
@@ -31,31 +50,211 @@ def get_engine_url() -> str:
         )
 
 
-ENGINE_URL = get_engine_url()
+def parse_engine_url(url: str) -> Tuple[str, Optional[str]]:
+    """Split an engine URL into (http_base_url, unix_socket_path).
+
+    unix:///run/workflowd.sock -> ("http://workflowd", "/run/workflowd.sock")
+    http://127.0.0.1:8766      -> ("http://127.0.0.1:8766", None)
+    """
+    if url.startswith("unix://"):
+        socket_path = url[len("unix://"):]
+        if not socket_path:
+            raise ValueError(f"unix engine URL has no socket path: {url}")
+        return "http://workflowd", socket_path
+    return url.rstrip("/"), None
+
+
+def __getattr__(name: str):
+    """Resolve ENGINE_URL lazily (PEP 562) and memoize it on the module."""
+    if name == "ENGINE_URL":
+        value = get_engine_url()
+        globals()["ENGINE_URL"] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# WORKFLOW_ENGINE_WORKFLOWS_DIR value -> resolved root
+_workflows_roots: Dict[Optional[str], Path] = {}
 
 
 def get_workflows_root() -> Path:
-    """Resolve workflows root for artifact discovery."""
-    env_root = os.environ.get("WORKFLOW_ENGINE_WORKFLOWS_DIR")
+    """Resolve workflows root for artifact discovery (memoized per process)."""
+    env_root = os.environ.get("WORKFLOW_ENGINE_WORKFLOWS_DIR") or None
+    root = _workflows_roots.get(env_root)
+    if root is not None:
+        return root
+
+    if env_root:
+        root = Path(env_root).expanduser()
+    else:
+        try:
+            from workflowd.config import WORKFLOWS_DIR
+            root = Path(WORKFLOWS_DIR)
+        except ImportError:
+            root = Path.home() / ".claude" / "local" / "workflows"
+    _workflows_roots[env_root] = root
+    return root
+
+
+def get_client():
+    """The hooks' process-wide WorkflowControlClient (see control_client.shared_client).
+
+    control_client (and httpx) is imported on first call, so events without
+    an active workflow exit before paying for it.
+    """
+    from control_client import shared_client
+    return shared_client()
+
+
+def get_cache_dir() -> Path:
+    """Shared cache directory for hook-side caches (under the workflows root)."""
+    return get_workflows_root() / ".cache"
+
+
+def get_plugin_root() -> str:
+    """Plugin root from CLAUDE_PLUGIN_ROOT or this file's location."""
+    env_root = os.environ.get("CLAUDE_PLUGIN_ROOT")
     if env_root:
-        return Path(env_root).expanduser()
+        return env_root
+    # hooks/ sits directly under the plugin root
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+
+def atomic_write(path: Union[str, "os.PathLike[str]"], data: Union[str, bytes]):
+    """Replace a file's content atomically, creating its directory if needed.
+
+    Writes a per-process temp file next to path and os.replace()s it over
+    path, so concurrent readers see the old or the new content, never a
+    partial write. The temp file is removed on failure.
+
+    Raises:
+        OSError: If the file could not be written
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
     try:
-        from workflowd.config import WORKFLOWS_DIR
-        return WORKFLOWS_DIR
-    except ImportError:
-        return Path.home() / ".claude" / "local" / "workflows"
+        with open(tmp_path, "wb") as f:
+            f.write(data.encode("utf-8") if isinstance(data, str) else data)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_json(path: Union[str, "os.PathLike[str]"], data: Any, **dump_kwargs):
+    """atomic_write() for a JSON document; dump_kwargs go to json.dumps."""
+    atomic_write(path, json.dumps(data, **dump_kwargs))
+
+
+CURRENT_POINTER_FILE = "current.json"
+COMPACT_POINTER_FILE = "current.ptr"
+
+# current.ptr layout: magic, then the current.json stat it was derived from
+# (mtime_ns, inode, size), then the workflow_id length and its UTF-8 bytes
+# zero-padded to POINTER_ID_BYTES. Length 0 means "no workflow_id".
+POINTER_MAGIC = b"F3P1"
+POINTER_ID_BYTES = 128
+_POINTER_HEADER = struct.Struct(">4sqQQH")
+POINTER_RECORD_SIZE = _POINTER_HEADER.size + POINTER_ID_BYTES
+
+# current.json path -> ((mtime_ns, inode, size), workflow_id)
+_pointer_cache: Dict[str, Tuple[Tuple[int, int, int], Optional[str]]] = {}
+
+
+def _read_compact_pointer(path: str, stat_key: Tuple[int, int, int]) -> Tuple[bool, Optional[str]]:
+    """Read current.ptr with one pread; (valid, workflow_id)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return False, None
+    try:
+        record = os.pread(fd, POINTER_RECORD_SIZE, 0)
+    except OSError:
+        return False, None
+    finally:
+        os.close(fd)
+    if len(record) != POINTER_RECORD_SIZE:
+        return False, None
+    magic, mtime_ns, inode, size, length = _POINTER_HEADER.unpack_from(record)
+    if magic != POINTER_MAGIC or (mtime_ns, inode, size) != stat_key or length > POINTER_ID_BYTES:
+        return False, None
+    if length == 0:
+        return True, None
+    start = _POINTER_HEADER.size
+    try:
+        return True, record[start:start + length].decode("utf-8")
+    except UnicodeDecodeError:
+        return False, None
+
+
+def write_compact_pointer(path: str, stat_key: Tuple[int, int, int], workflow_id: Optional[str]):
+    """Atomically write current.ptr for a current.json stat (best effort)."""
+    encoded = (workflow_id or "").encode("utf-8")
+    if len(encoded) > POINTER_ID_BYTES:
+        return  # does not fit the fixed layout; readers fall back to current.json
+    record = _POINTER_HEADER.pack(POINTER_MAGIC, *stat_key, len(encoded)) + encoded.ljust(POINTER_ID_BYTES, b"\0")
+    try:
+        atomic_write(path, record)
+    except OSError:
+        pass
 
 
 def get_current_workflow_id(session_id: str) -> Optional[str]:
-    """Read current workflow_id from session pointer."""
+    """Read current workflow_id from session pointer.
+
+    Costs one stat when current.json is missing or unchanged since the last
+    lookup in this process, plus one pread of current.ptr when another
+    process already parsed this version of current.json.
+    """
     if not session_id:
         return None
-    current_path = get_workflows_root() / session_id / "current.json"
-    if not current_path.exists():
-        return None
+    session_dir = os.path.join(get_workflows_root(), session_id)
+    current_path = os.path.join(session_dir, CURRENT_POINTER_FILE)
     try:
-        data = json.loads(current_path.read_text())
-    except json.JSONDecodeError:
+        st = os.stat(current_path)
+    except OSError:
         return None
-    return data.get("workflow_id")
+    stat_key = (st.st_mtime_ns, st.st_ino, st.st_size)
+
+    cached = _pointer_cache.get(current_path)
+    if cached is not None and cached[0] == stat_key:
+        return cached[1]
+
+    compact_path = os.path.join(session_dir, COMPACT_POINTER_FILE)
+    valid, workflow_id = _read_compact_pointer(compact_path, stat_key)
+    if not valid:
+        try:
+            with open(current_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        workflow_id = data.get("workflow_id") if isinstance(data, dict) else None
+        if workflow_id is not None and not isinstance(workflow_id, str):
+            workflow_id = str(workflow_id)
+        write_compact_pointer(compact_path, stat_key, workflow_id)
+
+    _pointer_cache[current_path] = (stat_key, workflow_id)
+    return workflow_id
+
+
+# AF_UNIX paths are limited to 108 bytes on Linux (104 on macOS)
+_MAX_SOCKET_PATH = 100
+
+
+def get_worker_socket_path(session_id: str) -> str:
+    """Resolve the resident hook worker socket path for a session.
+
+    Lives next to the session pointer; falls back to the temp dir when the
+    workflows root is too deep for an AF_UNIX address.
+    """
+    path = str(get_workflows_root() / session_id / "hook-worker.sock")
+    if len(path) <= _MAX_SOCKET_PATH:
+        return path
+    import hashlib
+    import tempfile
+
+    digest = hashlib.sha1(path.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), f"forge3-{digest}.sock")
@@ -11,6 +11,19 @@ CRITICAL BEHAVIOR:
 - NEVER advances phases
 - NO phase transitions here
 
+AUTO-CHAIN:
+- The recommended command is found while stdin is read (see
+  payload_stream.py); the router output is never held in memory whole
+- The workspace root and the chained command's skill injection were
+  prefetched while the router ran (see prefetch.py), so chaining is a
+  single init call; anything not prefetched is resolved live
+- A chained workflow whose first phase skill declares `discovery:` starts
+  with the component inventory attached (see discovery.py)
+
+DEADLINE:
+- SubagentStop is killed after 5s; auto-chain init and its skill
+  injection are skipped when the budget runs low (see deadline.py)
+
 DESIGN PRINCIPLE:
 - This hook logs events ONLY
 - Phase transitions require explicit workflow_transition tool call (MCP: mcp__workflow__workflow_transition)
@@ -20,85 +33,139 @@ DESIGN PRINCIPLE:
 import json
 import sys
 import os
-import re
-import subprocess
 from pathlib import Path
 
-from control_client import WorkflowControlClient
 from skill_loader import get_phase_skill_injection_v2
-from _config import get_current_workflow_id
+from injection_ledger import dedupe_injection
+from workspace import resolve_workspace_root
+from _config import get_client, get_current_workflow_id
+from telemetry import span
+from payload_stream import read_subagent_stop
+import deadline
 
 
-client = WorkflowControlClient()
 COMMANDS = ["assist:plan", "assist:create", "assist:verify", "assist:health-check"]
 
 
-def _git_toplevel(path: str) -> str | None:
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            cwd=path,
-            capture_output=True,
-            text=True,
-            check=False,
+def auto_chain(client, state, recommended: str | None, session_id: str) -> str:
+    """Initialize the workflow the router recommended and build its context.
+
+    Args:
+        client: WorkflowControlClient
+        state: WorkflowState of the finished /assist:wizard workflow
+        recommended: Command the router output recommends (e.g. "/assist:create")
+        session_id: Session identifier
+
+    Returns:
+        Message to append to the prompt, or "" when nothing was chained
+    """
+    if not recommended:
+        return ""
+    if not deadline.allows():
+        # Too close to the SubagentStop timeout; the dispatcher message
+        # still tells the user which command to run
+        sys.stderr.write(f"Auto-chain skipped: hook deadline close ({recommended})\n")
+        return ""
+
+    # Warmed by phase_hook when the router started (see prefetch.py)
+    from prefetch import learn_policy_shape, load_prefetch, prefetched_injection
+    warmed = load_prefetch(session_id, state.workflow_id)
+
+    with span("workspace"):
+        workspace_root = (warmed or {}).get("workspace_root")
+        if not workspace_root or not os.path.isdir(workspace_root):
+            workspace_root = resolve_workspace_root(session_id)
+    next_command = recommended.lstrip("/")
+    next_state = client.init_workflow(
+        command=next_command,
+        session_id=session_id,
+        workspace_root=workspace_root,
+        task=state.prompt,
+        metadata={
+            "source": "auto_chain",
+            "routed_from": state.workflow_id,
+            "recommended_command": recommended,
+        },
+    )
+    if not next_state:
+        return ""
+    # Lets the next wizard run prefetch this command's first phase
+    learn_policy_shape(next_state)
+
+    skill_injection = ""
+    if deadline.allows():
+        with span("skill"):
+            skill_injection = prefetched_injection(warmed, next_state.command, next_state.current_phase)
+            if skill_injection is None:
+                skill_injection = get_phase_skill_injection_v2(
+                    phase=next_state.current_phase,
+                    command=next_state.command,
+                ) or ""
+            skill_injection = dedupe_injection(session_id, next_state.current_phase, next_state.command, skill_injection)
+        with span("discovery"):
+            from discovery import discovery_injection
+            discovery_report = discovery_injection(
+                next_state.command, next_state.current_phase, session_id, workspace_root
+            )
+            if discovery_report:
+                skill_injection = f"{discovery_report}\n\n{skill_injection}"
+                sys.stderr.write(f"Discovery report: {len(discovery_report.encode('utf-8'))} bytes\n")
+        sys.stderr.write(
+            f"Skill injection: {len(skill_injection.encode('utf-8'))} bytes "
+            f"({next_state.command}/{next_state.current_phase})\n"
         )
-    except Exception:
-        return None
+    else:
+        sys.stderr.write("Skill injection skipped: hook deadline close\n")
 
-    if result.returncode != 0:
-        return None
-    return result.stdout.strip() or None
+    phase_sequence = list(next_state.phases)
+    if next_state.final_phase and next_state.final_phase not in phase_sequence:
+        phase_sequence.append(next_state.final_phase)
+    phase_num = phase_sequence.index(next_state.current_phase) + 1 if next_state.current_phase in phase_sequence else 1
+    total_phases = len(phase_sequence)
 
+    return f"""
 
-def resolve_workspace_root() -> str:
-    env_root = os.environ.get("WORKFLOW_WORKSPACE_ROOT")
-    if env_root:
-        return os.path.abspath(os.path.expanduser(env_root))
+---
+[Phase {phase_num}/{total_phases}: {next_state.current_phase.capitalize()}] Starting...
+---
 
-    cwd = os.path.abspath(os.getcwd())
-    git_root = _git_toplevel(cwd)
-    return git_root if git_root else cwd
+<workflow-context>
+Auto-started: /{next_state.command}
+Workflow: {next_state.workflow_id}
+Session: {next_state.session_id or "default"}
+Current phase: {next_state.current_phase}
 
+Required action: Invoke {next_state.required_agent} agent using Task tool.
+</workflow-context>
 
-def extract_tool_text(input_data: dict) -> str:
-    tool_output = input_data.get("tool_output")
-    if isinstance(tool_output, dict):
-        for key in ("stdout", "output", "content", "text", "message"):
-            value = tool_output.get(key)
-            if isinstance(value, str) and value.strip():
-                return value
-        if isinstance(tool_output.get("content"), list):
-            for item in tool_output.get("content", []):
-                if isinstance(item, dict) and isinstance(item.get("text"), str):
-                    return item["text"]
-    if isinstance(tool_output, str) and tool_output.strip():
-        return tool_output
+{skill_injection}"""
 
-    for key in ("output", "result", "content"):
-        value = input_data.get(key)
-        if isinstance(value, str) and value.strip():
-            return value
 
-    env_output = os.environ.get("TOOL_OUTPUT", "")
-    if env_output.strip():
-        return env_output
-    return ""
+def record_and_chain(client, recommended: str | None, state, agent_name: str, session_id: str) -> str:
+    """Record the completion event and, for the wizard, run the auto-chain.
 
+    Without a resident worker the event is a synchronous POST, so while
+    auto-chaining it is sent from a thread and the init call goes out on
+    this one.
 
-def find_recommended_command(text: str) -> str | None:
-    if not text:
-        return None
-    lowered = text.lower()
-    pattern = re.compile(r"/assist:(plan|create|verify|health-check)", re.IGNORECASE)
+    Returns:
+        Auto-chain message, or "" when nothing was chained
+    """
+    record = (client.record_agent_complete, state.workflow_id, agent_name, state.current_phase)
+    if not (recommended and state.is_dispatcher and state.command == "assist:wizard"):
+        record[0](*record[1:])
+        return ""
 
-    for marker in ("recommendation", "recommended command", "recommended"):
-        idx = lowered.find(marker)
-        if idx != -1:
-            match = pattern.search(text[idx:])
-            if match:
-                return f"/assist:{match.group(1).lower()}"
+    import contextvars
+    import threading
 
-    return None
+    # Runs in this hook's context: same deadline and telemetry invocation
+    recorder = threading.Thread(target=contextvars.copy_context().run, args=record, name="forge3-record-event")
+    recorder.start()
+    try:
+        return auto_chain(client, state, recommended, session_id)
+    finally:
+        recorder.join()
 
 
 def main():
@@ -106,13 +173,16 @@ def main():
 
     EVENT LOGGING ONLY - does NOT advance phases.
     """
+    # Decoded incrementally: the payload can hold the whole subagent
+    # transcript, and only subagent_type and the recommendation are needed
     try:
-        input_data = json.load(sys.stdin)
-    except (json.JSONDecodeError, EOFError):
+        with span("stdin"):
+            payload = read_subagent_stop(sys.stdin, agent_prefix="forge3:")
+    except (ValueError, EOFError):
         sys.exit(0)
 
     # Get the agent type that just completed
-    subagent_type = input_data.get("subagent_type", "")
+    subagent_type = payload.subagent_type
 
     # Only handle forge3 agents
     if not subagent_type.startswith("forge3:"):
@@ -122,11 +192,13 @@ def main():
     agent_name = subagent_type.replace("forge3:", "")
 
     session_id = os.environ.get("CSC_SESSION_ID", "")
-    workflow_id = get_current_workflow_id(session_id)
+    with span("pointer"):
+        workflow_id = get_current_workflow_id(session_id)
     if not workflow_id:
         sys.exit(0)
 
     # Query workflow daemon for current state
+    client = get_client()
     state = client.get_status(workflow_id)
 
     if not state:
@@ -140,56 +212,10 @@ def main():
     allowed_next_phases = state.allowed_next_phases
     is_dispatcher = state.is_dispatcher
 
-    # Record agent completion event (EVENT LOGGING ONLY)
+    # Record agent completion event (EVENT LOGGING ONLY) and, for the
+    # wizard, auto-chain the routed workflow. Independent, so overlapped.
     # This does NOT advance the phase
-    recorded = client.record_agent_complete(workflow_id, agent_name, current_phase)
-
-    auto_chain_message = ""
-    if state.is_dispatcher and state.command == "assist:wizard":
-        router_output = extract_tool_text(input_data)
-        recommended = find_recommended_command(router_output)
-        if recommended:
-            workspace_root = resolve_workspace_root()
-            next_command = recommended.lstrip("/")
-            next_state = client.init_workflow(
-                command=next_command,
-                session_id=session_id,
-                workspace_root=workspace_root,
-                task=state.prompt,
-                metadata={
-                    "source": "auto_chain",
-                    "routed_from": state.workflow_id,
-                    "recommended_command": recommended,
-                },
-            )
-            if next_state:
-                skill_injection = get_phase_skill_injection_v2(
-                    phase=next_state.current_phase,
-                    command=next_state.command,
-                ) or ""
-
-                phase_sequence = list(next_state.phases)
-                if next_state.final_phase and next_state.final_phase not in phase_sequence:
-                    phase_sequence.append(next_state.final_phase)
-                phase_num = phase_sequence.index(next_state.current_phase) + 1 if next_state.current_phase in phase_sequence else 1
-                total_phases = len(phase_sequence)
-
-                auto_chain_message = f"""
-
----
-[Phase {phase_num}/{total_phases}: {next_state.current_phase.capitalize()}] Starting...
----
-
-<workflow-context>
-Auto-started: /{next_state.command}
-Workflow: {next_state.workflow_id}
-Session: {next_state.session_id or "default"}
-Current phase: {next_state.current_phase}
-
-Required action: Invoke {next_state.required_agent} agent using Task tool.
-</workflow-context>
-
-{skill_injection}"""
+    auto_chain_message = record_and_chain(client, payload.recommended_command, state, agent_name, session_id)
 
     # Calculate phase number for display
     phase_num = phases.index(current_phase) + 1 if current_phase in phases else "?"
@@ -230,17 +256,9 @@ Required action: Invoke {next_state.required_agent} agent using Task tool.
         # No more phases - workflow complete
         next_steps = "\nWorkflow complete. All phases finished.\n"
 
-    warning = ""
-    if not recorded:
-        warning = (
-            "\n[WARN] Failed to record agent completion with workflow daemon.\n"
-            "Workflow status and progress may be stale.\n"
-            "Ensure workflow-daemon is running and reachable at WORKFLOW_ENGINE_URL.\n"
-        )
-
     announcement = (
         f"\n---\n{complete_banner}\n---\n"
-        f"{next_steps}{warning}{auto_chain_message}"
+        f"{next_steps}{auto_chain_message}"
     )
 
     # Output the announcement as appendToPrompt
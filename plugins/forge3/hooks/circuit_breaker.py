@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Circuit Breaker - Fail fast across hook processes while the daemon is down.
+
+Usage: circuit_breaker.py probe
+
+Without it every hook waits out its full request timeout against a dead
+daemon before allowing the action. The breaker state is shared by all
+hook processes of all sessions through one small file:
+
+    closed  - requests go out; transport failures (connect errors,
+              timeouts, 502/503/504) are counted
+    open    - FAILURE_THRESHOLD failures within FAILURE_WINDOW seconds;
+              requests raise CircuitOpenError without touching the network
+
+While open, exactly one background probe (a detached `circuit_breaker.py
+probe` process holding a lease) polls the daemon with backoff and closes
+the circuit as soon as it answers. A successful request from any process
+also closes it. Disable with FORGE3_CIRCUIT_BREAKER=0.
+
+FILES (under <workflows_root>/):
+- daemon-circuit.json  - {"engine_url", "state", "failures", "opened_at", "probe_until"}
+- daemon-circuit.lock  - Short lock for read-modify-write updates
+"""
+
+import contextlib
+import fcntl
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from _config import atomic_write_json, get_engine_url, get_workflows_root, parse_engine_url
+
+
+CIRCUIT_FILE = "daemon-circuit.json"
+CIRCUIT_LOCK_FILE = "daemon-circuit.lock"
+
+FAILURE_THRESHOLD = 3
+FAILURE_WINDOW = 30.0      # seconds in which FAILURE_THRESHOLD failures open the circuit
+PROBE_LEASE = 60.0         # a probe that has not closed the circuit by then gives up
+PROBE_MAX_INTERVAL = 5.0
+
+CLOSED = "closed"
+OPEN = "open"
+
+# Parsed circuit file, keyed by its (mtime_ns, size, inode)
+_state_cache: Dict[str, Tuple[Tuple[int, int, int], Dict[str, Any]]] = {}
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of sending a request while the circuit is open."""
+
+
+def breaker_enabled() -> bool:
+    return os.environ.get("FORGE3_CIRCUIT_BREAKER", "1") != "0"
+
+
+def _closed_state(engine_url: str) -> Dict[str, Any]:
+    return {"engine_url": engine_url, "state": CLOSED, "failures": 0, "first_failure_at": 0.0,
+            "opened_at": 0.0, "probe_until": 0.0}
+
+
+class CircuitBreaker:
+    """Cross-process breaker for one engine URL."""
+
+    def __init__(self, engine_url: str, directory: Optional[str] = None):
+        self.engine_url = engine_url
+        self.directory = directory or str(get_workflows_root())
+        self.path = os.path.join(self.directory, CIRCUIT_FILE)
+        self.lock_path = os.path.join(self.directory, CIRCUIT_LOCK_FILE)
+
+    def read(self) -> Dict[str, Any]:
+        """Current state; one stat when the file has not changed."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return _closed_state(self.engine_url)
+        key = (st.st_mtime_ns, st.st_size, st.st_ino)
+        cached = _state_cache.get(self.path)
+        if cached is not None and cached[0] == key:
+            state = cached[1]
+        else:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                return _closed_state(self.engine_url)
+            _state_cache[self.path] = (key, state)
+        # State recorded for another daemon does not apply to this one
+        if state.get("engine_url") != self.engine_url:
+            return _closed_state(self.engine_url)
+        return state
+
+    def _write(self, state: Dict[str, Any]):
+        atomic_write_json(self.path, state)
+
+    @contextlib.contextmanager
+    def _locked(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.lock_path, "a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def before_request(self):
+        """Raise CircuitOpenError if the circuit is open (and make sure a probe runs)."""
+        state = self.read()
+        if state.get("state") != OPEN:
+            return
+        if state.get("probe_until", 0.0) < time.time():
+            self._claim_probe()
+        raise CircuitOpenError(f"workflow daemon circuit open since {state.get('opened_at', 0.0):.0f}")
+
+    def record_success(self):
+        """A response arrived: close the circuit / forget failures."""
+        state = self.read()
+        if state.get("state") == CLOSED and not state.get("failures"):
+            return
+        try:
+            with self._locked():
+                self._write(_closed_state(self.engine_url))
+        except OSError:
+            pass
+
+    def record_failure(self):
+        """Count a transport failure; opens the circuit at FAILURE_THRESHOLD."""
+        try:
+            with self._locked():
+                state = self.read()
+                if state.get("state") == OPEN:
+                    return
+                now = time.time()
+                if now - state.get("first_failure_at", 0.0) > FAILURE_WINDOW:
+                    state = dict(_closed_state(self.engine_url), first_failure_at=now)
+                else:
+                    state = dict(state)
+                state["failures"] = state.get("failures", 0) + 1
+                if state["failures"] >= FAILURE_THRESHOLD:
+                    state.update(state=OPEN, opened_at=now, probe_until=0.0)
+                self._write(state)
+        except OSError:
+            pass
+
+    def _claim_probe(self):
+        """Take the probe lease and start the probe process (one at a time)."""
+        try:
+            with self._locked():
+                state = self.read()
+                if state.get("state") != OPEN or state.get("probe_until", 0.0) >= time.time():
+                    return
+                self._write(dict(state, probe_until=time.time() + PROBE_LEASE))
+        except OSError:
+            return
+        spawn_probe_process(self.engine_url)
+
+    def probe(self, request) -> bool:
+        """Poll the daemon until it answers or the lease runs out.
+
+        Args:
+            request: Callable sending one health request; True if the daemon answered
+
+        Returns:
+            True if the circuit was closed
+        """
+        interval = 0.25
+        deadline = time.time() + PROBE_LEASE
+        while time.time() < deadline:
+            if self.read().get("state") != OPEN:
+                return True
+            if request():
+                self.record_success()
+                return True
+            time.sleep(interval)
+            interval = min(interval * 2, PROBE_MAX_INTERVAL)
+        return False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def breaker_for(engine_url: str) -> Optional[CircuitBreaker]:
+    """Process-wide breaker for an engine URL; None when disabled."""
+    if not breaker_enabled():
+        return None
+    breaker = _breakers.get(engine_url)
+    if breaker is None:
+        breaker = _breakers[engine_url] = CircuitBreaker(engine_url)
+    return breaker
+
+
+def spawn_probe_process(engine_url: str):
+    """Probe the daemon from a detached process; returns immediately."""
+    import subprocess
+
+    try:
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "probe"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env=dict(os.environ, WORKFLOW_ENGINE_URL=engine_url),
+            start_new_session=True,
+            close_fds=True,
+        )
+    except OSError:
+        pass
+
+
+def main():
+    """CLI: probe the daemon and close the circuit when it answers."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Probe the forge3 workflow daemon circuit")
+    parser.add_argument("action", choices=["probe"])
+    parser.parse_args()
+
+    import httpx
+
+    engine_url = get_engine_url()
+    base_url, socket_path = parse_engine_url(engine_url)
+    breaker = CircuitBreaker(engine_url)
+
+    with httpx.Client(base_url=base_url, transport=httpx.HTTPTransport(uds=socket_path), timeout=2.0) as http:
+        def request() -> bool:
+            try:
+                # Any answer short of a gateway error means the daemon is back
+                return http.get("/health").status_code not in (502, 503, 504)
+            except httpx.HTTPError:
+                return False
+
+        sys.exit(0 if breaker.probe(request) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Compact Hook - Reset skill injection dedupe when the context is compacted.
+
+Event: PreCompact
+Trigger: Always (manual and auto compaction)
+
+CRITICAL BEHAVIOR:
+- Clears the session's injection ledger so the next workflow start
+  re-injects full skill content instead of a reference tag
+- Never blocks compaction; always exits 0
+"""
+
+import os
+import sys
+
+from injection_ledger import reset_ledger
+
+
+def main():
+    """Handle PreCompact event."""
+    reset_ledger(os.environ.get("CSC_SESSION_ID", ""))
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
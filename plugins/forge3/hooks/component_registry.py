@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Component Registry - (command, phase) -> skill, agent and subagent_type from frontmatter.
+
+Usage: component_registry.py [show] [--json]
+
+The plugin's own files are the single source for injection hints:
+
+- skills/*/SKILL.md  - `phase:` the skill serves; `command:` if it is
+                       specific to one command (else it serves that
+                       phase in every command); `discovery:` (health or
+                       verify) if its phase gets a component inventory
+                       attached (see discovery.py)
+- agents/*.md        - `name:`; an agent is only bound if its file exists
+- commands/*.md      - `name:` and `phases:` (phase -> agent)
+
+These are hints only. Which phases a command runs, and in what order, is
+the daemon's policy; `phases:` only names the agent for each phase, and
+where it disagrees with the daemon, the daemon wins. A skill without
+`phase:` (verify-skill) is reference material that no phase injects.
+
+The scan runs once and the resulting (command, phase) table is cached.
+Every lookup after that is a dict hit.
+
+CACHE:
+- <workflows_root>/.cache/component-registry.json  - {"fingerprint", "registry"}
+
+The fingerprint covers the mtimes of the component directories (entries
+added, removed or replaced) and the (mtime_ns, size) of every component
+file (edits in place). Any change rebuilds the registry on next use; a
+long-lived process (the hook worker) rechecks it every RECHECK_INTERVAL.
+"""
+
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from _config import atomic_write_json, get_cache_dir, get_plugin_root
+
+
+REGISTRY_CACHE_FILE = "component-registry.json"
+REGISTRY_FORMAT = 2
+RECHECK_INTERVAL = 1.0   # seconds a long-lived process trusts its fingerprint
+
+# (fingerprint, time.monotonic() it was checked, registry)
+_registry: Optional[Tuple[str, float, "ComponentRegistry"]] = None
+
+
+def _scalar(value: str) -> str:
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def parse_frontmatter(content: str) -> Dict[str, Any]:
+    """Parse the YAML frontmatter subset the plugin's components use.
+
+    Supports `key: value` scalars (optionally quoted), `[a, b]` inline
+    lists, and a key followed by indented `- item` lines (list) or
+    indented `sub: value` lines (mapping, order kept).
+
+    Returns:
+        Frontmatter fields, or {} if the content has no frontmatter
+    """
+    lines = content.split("\n")
+    if not lines or lines[0].strip() != "---":
+        return {}
+    fields: Dict[str, Any] = {}
+    key: Optional[str] = None
+    for line in lines[1:]:
+        stripped = line.strip()
+        if stripped == "---":
+            return fields
+        if not stripped or stripped.startswith("#"):
+            continue
+        if line[0] in " \t" and key is not None:
+            if stripped.startswith("- "):
+                if not isinstance(fields[key], list):
+                    fields[key] = []
+                fields[key].append(_scalar(stripped[2:]))
+            elif ":" in stripped:
+                if not isinstance(fields[key], dict):
+                    fields[key] = {}
+                sub_key, _, sub_value = stripped.partition(":")
+                fields[key][sub_key.strip()] = _scalar(sub_value)
+            continue
+        name, _, value = stripped.partition(":")
+        key = name.strip()
+        value = value.strip()
+        if value.startswith("[") and value.endswith("]"):
+            fields[key] = [_scalar(item) for item in value[1:-1].split(",") if item.strip()]
+        else:
+            fields[key] = _scalar(value) if value else ""
+    return {}  # unterminated frontmatter
+
+
+def read_frontmatter(path: str) -> Dict[str, Any]:
+    """Frontmatter of a component file ({} if unreadable)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return parse_frontmatter(f.read())
+    except (OSError, UnicodeDecodeError):
+        return {}
+
+
+class PhaseBinding:
+    """What a (command, phase) resolves to."""
+
+    __slots__ = ("skill", "agent", "subagent_type")
+
+    def __init__(self, skill: Optional[str], agent: Optional[str], subagent_type: Optional[str]):
+        self.skill = skill                    # Skill directory name
+        self.agent = agent                    # Agent name, e.g. "discovery-agent"
+        self.subagent_type = subagent_type    # Task subagent_type, e.g. "forge3:discovery-agent"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PhaseBinding):
+            return NotImplemented
+        return (self.skill, self.agent, self.subagent_type) == (other.skill, other.agent, other.subagent_type)
+
+    def __repr__(self) -> str:
+        return f"PhaseBinding(skill={self.skill!r}, agent={self.agent!r}, subagent_type={self.subagent_type!r})"
+
+
+class ComponentRegistry:
+    """Precomputed injection hints for one plugin tree."""
+
+    def __init__(
+        self,
+        commands: Dict[str, List[str]],
+        bindings: Dict[Tuple[str, str], PhaseBinding],
+        phase_skills: Dict[str, str],
+        phase_agents: Dict[str, str],
+        agents: Dict[str, str],
+        discovery: Dict[str, str],
+    ):
+        self.commands = commands            # command -> phases its frontmatter names
+        self.bindings = bindings            # (command, phase) -> PhaseBinding
+        self.phase_skills = phase_skills    # phase -> skill serving it in every command
+        self.phase_agents = phase_agents    # phase -> agent every command runs it with
+        self.agents = agents                # agent name -> subagent_type
+        self.discovery = discovery          # skill name -> discovery report mode
+        self._digest: Optional[str] = None
+
+    def binding(self, phase: str, command: Optional[str] = None) -> Optional[PhaseBinding]:
+        """Binding of a phase; without a (command, phase) entry, the phase's generic skill and agent."""
+        if command:
+            binding = self.bindings.get((command, phase))
+            if binding is not None:
+                return binding
+        skill = self.phase_skills.get(phase)
+        agent = self.phase_agents.get(phase)
+        if not skill and not agent:
+            return None
+        return PhaseBinding(skill, agent, self.agents.get(agent) if agent else None)
+
+    def discovery_mode(self, phase: str, command: Optional[str] = None) -> Optional[str]:
+        """Discovery report mode of the skill bound to a phase, if it declares one."""
+        binding = self.binding(phase, command)
+        if binding is None or not binding.skill:
+            return None
+        return self.discovery.get(binding.skill)
+
+    def digest(self) -> str:
+        """Digest of the bindings alone: unchanged by edits outside frontmatter."""
+        if self._digest is None:
+            import hashlib
+
+            encoded = json.dumps(self.to_dict(), sort_keys=True).encode("utf-8")
+            self._digest = hashlib.sha1(encoded).hexdigest()
+        return self._digest
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "commands": self.commands,
+            "bindings": [
+                [command, phase, binding.skill, binding.agent, binding.subagent_type]
+                for (command, phase), binding in self.bindings.items()
+            ],
+            "phase_skills": self.phase_skills,
+            "phase_agents": self.phase_agents,
+            "agents": self.agents,
+            "discovery": self.discovery,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ComponentRegistry":
+        return cls(
+            commands={command: list(phases) for command, phases in data["commands"].items()},
+            bindings={
+                (command, phase): PhaseBinding(skill, agent, subagent_type)
+                for command, phase, skill, agent, subagent_type in data["bindings"]
+            },
+            phase_skills=dict(data["phase_skills"]),
+            phase_agents=dict(data["phase_agents"]),
+            agents=dict(data["agents"]),
+            discovery=dict(data["discovery"]),
+        )
+
+
+def _component_files(plugin_root: str) -> Tuple[List[Tuple[str, int]], List[Tuple[str, str]]]:
+    """(directory, mtime_ns) pairs and (kind, path) component files of a plugin tree."""
+    directories: List[Tuple[str, int]] = []
+    files: List[Tuple[str, str]] = []
+    for kind in ("skills", "agents", "commands"):
+        directory = os.path.join(plugin_root, kind)
+        try:
+            directories.append((directory, os.stat(directory).st_mtime_ns))
+            entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+        except OSError:
+            continue
+        for entry in entries:
+            if kind == "skills":
+                if not entry.is_dir():
+                    continue
+                try:
+                    directories.append((entry.path, entry.stat().st_mtime_ns))
+                except OSError:
+                    continue
+                files.append((kind, os.path.join(entry.path, "SKILL.md")))
+            elif entry.name.endswith(".md") and entry.is_file():
+                files.append((kind, entry.path))
+    return directories, files
+
+
+def registry_fingerprint(plugin_root: Optional[str] = None) -> str:
+    """Digest of the component directories' mtimes and the component files' stats."""
+    import hashlib
+
+    plugin_root = plugin_root or get_plugin_root()
+    directories, files = _component_files(plugin_root)
+    parts: List[Any] = [REGISTRY_FORMAT, plugin_root, directories]
+    for _, path in files:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        parts.append((path, st.st_mtime_ns, st.st_size))
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+
+def _plugin_name(plugin_root: str) -> str:
+    manifest = os.path.join(plugin_root, ".claude-plugin", "plugin.json")
+    try:
+        with open(manifest, "r", encoding="utf-8") as f:
+            return str(json.load(f).get("name") or "forge3")
+    except (OSError, ValueError):
+        return "forge3"
+
+
+def build_registry(plugin_root: Optional[str] = None) -> ComponentRegistry:
+    """Scan the plugin's components and precompute every (command, phase) binding."""
+    plugin_root = plugin_root or get_plugin_root()
+    plugin_name = _plugin_name(plugin_root)
+    _, files = _component_files(plugin_root)
+
+    agents: Dict[str, str] = {}
+    commands: Dict[str, List[str]] = {}
+    command_agents: Dict[Tuple[str, str], str] = {}
+    phase_skills: Dict[str, str] = {}
+    command_skills: Dict[Tuple[str, str], str] = {}
+    discovery: Dict[str, str] = {}
+    for kind, path in files:
+        fields = read_frontmatter(path)
+        if kind == "agents":
+            name = fields.get("name") or os.path.splitext(os.path.basename(path))[0]
+            agents[name] = f"{plugin_name}:{name}"
+        elif kind == "commands":
+            name = fields.get("name")
+            phases = fields.get("phases")
+            if not name or not isinstance(phases, dict):
+                continue
+            commands[name] = list(phases)
+            for phase, agent in phases.items():
+                command_agents[(name, phase)] = agent
+        else:
+            name = fields.get("name") or os.path.basename(os.path.dirname(path))
+            phase = fields.get("phase")
+            if not phase:
+                continue
+            if fields.get("command"):
+                command_skills[(fields["command"], phase)] = name
+            else:
+                phase_skills[phase] = name
+            if fields.get("discovery"):
+                discovery[name] = fields["discovery"]
+
+    bindings: Dict[Tuple[str, str], PhaseBinding] = {}
+    for key in list(command_agents) + [key for key in command_skills if key not in command_agents]:
+        command, phase = key
+        agent = command_agents.get(key)
+        if agent not in agents:
+            agent = None  # declared, but there is no such agent file
+        bindings[key] = PhaseBinding(
+            command_skills.get(key) or phase_skills.get(phase),
+            agent,
+            agents.get(agent) if agent else None,
+        )
+
+    phase_agents: Dict[str, str] = {}
+    conflicting = set()
+    for (_, phase), binding in bindings.items():
+        if not binding.agent or phase in conflicting:
+            continue
+        if phase_agents.setdefault(phase, binding.agent) != binding.agent:
+            conflicting.add(phase)
+            del phase_agents[phase]
+    return ComponentRegistry(commands, bindings, phase_skills, phase_agents, agents, discovery)
+
+
+def _cache_path() -> str:
+    return os.path.join(get_cache_dir(), REGISTRY_CACHE_FILE)
+
+
+def _load_cached(fingerprint: str) -> Optional[ComponentRegistry]:
+    try:
+        with open(_cache_path(), "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("fingerprint") != fingerprint:
+            return None
+        return ComponentRegistry.from_dict(cached["registry"])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _store_cached(fingerprint: str, registry: ComponentRegistry):
+    try:
+        atomic_write_json(_cache_path(), {"fingerprint": fingerprint, "registry": registry.to_dict()})
+    except OSError:
+        pass
+
+
+def _current() -> Tuple[str, float, ComponentRegistry]:
+    global _registry
+    now = time.monotonic()
+    if _registry is not None and now - _registry[1] < RECHECK_INTERVAL:
+        return _registry
+    fingerprint = registry_fingerprint()
+    if _registry is not None and _registry[0] == fingerprint:
+        _registry = (fingerprint, now, _registry[2])
+        return _registry
+    registry = _load_cached(fingerprint)
+    if registry is None:
+        registry = build_registry()
+        _store_cached(fingerprint, registry)
+    _registry = (fingerprint, now, registry)
+    return _registry
+
+
+def load_registry() -> ComponentRegistry:
+    """The current registry: from memory, the on-disk cache, or a fresh scan."""
+    return _current()[2]
+
+
+def main():
+    """CLI: print the (command, phase) table."""
+    args = sys.argv[1:]
+    if args and args[0] == "show":
+        args = args[1:]
+    if any(arg != "--json" for arg in args):
+        sys.stderr.write("Usage: component_registry.py [show] [--json]\n")
+        sys.exit(1)
+    registry = load_registry()
+    if "--json" in args:
+        print(json.dumps(registry.to_dict(), indent=2))
+        return
+    for (command, phase), binding in registry.bindings.items():
+        print(f"{command:20} {phase:14} {binding.skill or '-':26} {binding.subagent_type or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,14 +12,34 @@ Daemon API (AUTHORITATIVE):
 - /workflow/transition - Validated phase transition
 - /workflow/can-stop   - Check if workflow can be stopped
 - /event/record     - Record events (agent_completed, etc.)
+- /event/batch      - Record spooled events in order (falls back to /event/record)
+- /sse/events       - State change feed (keeps the status cache live)
+
+Transport: HTTP over TCP by default; unix:///path/to/workflowd.sock engine
+URLs use a Unix domain socket. Bodies are JSON unless msgpack is enabled
+(WORKFLOW_ENGINE_ENCODING=msgpack), negotiated per request by content type.
+Typed responses are decoded straight from the body bytes (see
+workflow_types.py; schema-driven with msgspec when installed).
+
+Requests go through a circuit breaker shared by all hook processes
+(see circuit_breaker.py): while the daemon is down they fail immediately
+instead of waiting out their timeouts. Inside a hook each request's
+timeout is also capped by the hook's remaining budget (see deadline.py).
+
+With a state mirror (see state_mirror.py) and a connected status stream,
+every full state the client sees is also written to the session's
+state.json, which phase_hook and stop_hook read before asking the daemon.
 """
 
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
 import httpx
 
 try:
-    from _config import ENGINE_URL
+    from _config import get_engine_url, parse_engine_url
 except ImportError:
     import importlib.util
     from pathlib import Path
@@ -29,78 +49,147 @@ except ImportError:
     _module = importlib.util.module_from_spec(_spec)
     assert _spec and _spec.loader
     _spec.loader.exec_module(_module)
-    ENGINE_URL = _module.ENGINE_URL
-
-
-@dataclass
-class WorkflowState:
-    """Workflow state returned by daemon."""
-    workflow_id: str
-    command: str                      # "assist:wizard", "assist:plan", "assist:create", "assist:verify", "assist:health-check"
-    workflow_type: str                # "dispatch", "plan", "create", "verify", "health"
-    phases: List[str]                 # From daemon policy
-    final_phase: Optional[str]        # "schema-check" or None for dispatcher
-    current_phase: str
-    phase_status: str                 # "agent_required", "agent_running", "agent_complete"
-    allowed_next_phases: List[str]    # Valid next phases from current
-    is_dispatcher: bool               # True for /assist
-    session_id: Optional[str]
-    required_agent: Optional[str]     # Agent required for current phase
-    prompt: Optional[str] = None
-    metadata: Dict[str, Any] = field(default_factory=dict)
-    
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "WorkflowState":
-        """Create WorkflowState from dict response."""
-        return cls(
-            workflow_id=data.get("workflow_id", ""),
-            command=data.get("command", ""),
-            workflow_type=data.get("workflow_type", ""),
-            phases=data.get("phases", []),
-            final_phase=data.get("final_phase"),
-            current_phase=data.get("current_phase", ""),
-            phase_status=data.get("phase_status", ""),
-            allowed_next_phases=data.get("allowed_next_phases", []),
-            is_dispatcher=data.get("is_dispatcher", False),
-            session_id=data.get("session_id"),
-            required_agent=data.get("required_agent"),
-            prompt=data.get("prompt"),
-            metadata=data.get("metadata") or {},
-        )
+    get_engine_url = _module.get_engine_url
+    parse_engine_url = _module.parse_engine_url
 
+import deadline
+import telemetry
+from circuit_breaker import CircuitOpenError, breaker_for
+from workflow_types import (
+    CanStopResult,
+    TransitionResult,
+    WorkflowState,
+    decode_can_stop_result,
+    decode_transition_result,
+    decode_workflow_state,
+)
 
-@dataclass
-class TransitionResult:
-    """Result of a phase transition."""
-    success: bool
-    message: str
-    new_phase: Optional[str]
-    new_status: Optional[str]
-    missing_conditions: List[str]
-    
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "TransitionResult":
-        return cls(
-            success=data.get("success", False),
-            message=data.get("message", ""),
-            new_phase=data.get("new_phase"),
-            new_status=data.get("new_status"),
-            missing_conditions=data.get("missing_conditions", []),
-        )
 
+JSON_CONTENT_TYPE = "application/json"
+MSGPACK_CONTENT_TYPE = "application/msgpack"
 
-@dataclass
-class CanStopResult:
-    """Result of can-stop check."""
-    can_stop: bool
-    reason: str
-    
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "CanStopResult":
-        return cls(
-            can_stop=data.get("can_stop", True),
-            reason=data.get("reason", ""),
-        )
+# Responses that count against the circuit breaker like a transport failure
+GATEWAY_ERRORS = (502, 503, 504)
+
+# Added by the event spool for /event/batch dedupe; /event/record has no such fields
+SPOOL_ONLY_FIELDS = ("event_id", "spooled_at")
+
+
+def http2_enabled() -> bool:
+    """HTTP/2 is opt-in (WORKFLOW_ENGINE_HTTP2=1) and needs the h2 package."""
+    if os.environ.get("WORKFLOW_ENGINE_HTTP2") != "1":
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_encoding(encoding: Optional[str] = None) -> str:
+    """Body encoding: "msgpack" when requested and installed, else "json"."""
+    encoding = encoding or os.environ.get("WORKFLOW_ENGINE_ENCODING", "json")
+    if encoding != "msgpack":
+        return "json"
+    try:
+        import msgpack  # noqa: F401
+    except ImportError:
+        return "json"
+    return "msgpack"
+
+
+class StatusStream:
+    """Background subscriber to the daemon's /sse/events feed.
+
+    Each event carrying a workflow_id either replaces the client's cached
+    WorkflowState (when the payload is a full state) or evicts it, so the
+    next get_status refetches. While connected, cached entries are trusted
+    without a round trip; on disconnect the cache is dropped and the
+    stream reconnects with backoff.
+    """
+
+    def __init__(self, client: "WorkflowControlClient", max_backoff: float = 30.0):
+        self.client = client
+        self.max_backoff = max_backoff
+        self.connected = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._http: Optional[httpx.Client] = None
+
+    def start(self):
+        """Start the subscriber thread (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="forge3-status-stream", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the subscriber and close its connection."""
+        self._stop.set()
+        if self._http is not None:
+            self._http.close()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _run(self):
+        backoff = 0.5
+        while not self._stop.is_set():
+            try:
+                self._http = self.client._make_http(httpx.Timeout(5.0, read=None))
+                with self._http.stream(
+                    "GET", "/sse/events", headers={"Accept": "text/event-stream"}
+                ) as resp:
+                    if resp.status_code == 200:
+                        # Changes made before we subscribed were never seen
+                        self.client.invalidate_status()
+                        self.client._invalidate_mirror()
+                        self.connected.set()
+                        backoff = 0.5
+                        self._consume(resp.iter_lines())
+            except Exception:
+                pass
+            finally:
+                self.connected.clear()
+                self.client.invalidate_status()
+                # Pushed states are only trustworthy while pushes arrive
+                self.client._remove_mirror()
+                if self._http is not None:
+                    self._http.close()
+                    self._http = None
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def _consume(self, lines):
+        data_lines: List[str] = []
+        for line in lines:
+            if self._stop.is_set():
+                return
+            if line.startswith("data:"):
+                data_lines.append(line[5:].lstrip())
+            elif not line and data_lines:
+                self._dispatch("\n".join(data_lines))
+                data_lines = []
+
+    def _dispatch(self, data: str):
+        try:
+            payload = json.loads(data)
+        except ValueError:
+            return
+        if not isinstance(payload, dict):
+            return
+        state = payload.get("state") if isinstance(payload.get("state"), dict) else payload
+        workflow_id = payload.get("workflow_id") or state.get("workflow_id")
+        if not workflow_id:
+            # Event without a target: trust nothing cached
+            self.client.invalidate_status()
+        elif "current_phase" in state and "phase_status" in state:
+            workflow_state = WorkflowState.from_dict(state)
+            self.client._cache_status(workflow_id, workflow_state, etag=None)
+            self.client._mirror_state(workflow_state, "sse")
+        else:
+            self.client.invalidate_status(workflow_id)
 
 
 class WorkflowControlClient:
@@ -110,10 +199,401 @@ class WorkflowControlClient:
     - Sends only command name to /workflow/init
     - Receives policy-resolved state
     - Never hardcodes workflow definitions
+
+    Calls share one pooled keep-alive httpx.Client, created on first use.
+    Use as a context manager (or call close()) to release the connection:
+
+        with WorkflowControlClient() as client:
+            state = client.get_status(workflow_id)
+
+    get_status results are cached per workflow_id and revalidated with
+    ETag/If-None-Match. Long-lived processes can call
+    start_status_stream() so the cache is kept current from /sse/events
+    and repeated lookups cost no round trip at all.
     """
 
-    def __init__(self, base_url: str = ENGINE_URL):
-        self.base_url = base_url.rstrip("/")
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        http2: Optional[bool] = None,
+        encoding: Optional[str] = None,
+        max_keepalive_connections: int = 4,
+        keepalive_expiry: float = 30.0,
+        event_spool: Optional[Any] = None,
+        state_mirror: Optional[Any] = None,
+    ):
+        self.engine_url = base_url or get_engine_url()
+        self.base_url, self.socket_path = parse_engine_url(self.engine_url)
+        self.http2 = http2_enabled() if http2 is None else http2
+        self.encoding = resolve_encoding(encoding)
+        self._peer_msgpack = False
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self._status_cache: Dict[str, Tuple[Optional[str], WorkflowState]] = {}
+        self._status_lock = threading.Lock()
+        self._stream: Optional[StatusStream] = None
+        self.event_spool = event_spool
+        self.state_mirror = state_mirror
+        self._spool_flusher = None
+        self._batch_supported = True
+        self.breaker = breaker_for(self.engine_url)
+        self._http: Optional[httpx.Client] = None
+        self._http_lock = threading.Lock()
+
+    def _transport_options(self) -> Dict[str, Any]:
+        """Keyword arguments for httpx.HTTPTransport."""
+        return {
+            "uds": self.socket_path,
+            # Loopback daemons speak cleartext, so HTTP/2 means prior knowledge
+            "http1": not self.http2,
+            "http2": self.http2,
+            "limits": httpx.Limits(
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+        }
+
+    def _encode(
+        self,
+        body: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+    ) -> Tuple[Dict[str, str], Optional[Dict[str, Any]], Optional[bytes]]:
+        """Negotiate the body encoding for one request.
+
+        With msgpack enabled the client advertises it via Accept and only
+        switches request bodies to msgpack once the daemon has answered in
+        msgpack.
+
+        Returns:
+            (headers, json_body, content) for httpx
+        """
+        headers = dict(headers or {})
+        if self.encoding == "msgpack":
+            import msgpack
+
+            headers["Accept"] = f"{MSGPACK_CONTENT_TYPE}, {JSON_CONTENT_TYPE};q=0.9"
+            if body is not None and self._peer_msgpack:
+                headers["Content-Type"] = MSGPACK_CONTENT_TYPE
+                return headers, None, msgpack.packb(body, use_bin_type=True)
+        return headers, body, None
+
+    def _rejected_encoding(self, resp: httpx.Response, content: Optional[bytes]) -> bool:
+        """A 415 for a msgpack body downgrades this client to JSON (caller retries)."""
+        if resp.status_code == 415 and content is not None:
+            self.encoding = "json"
+            return True
+        return False
+
+    def _body_encoding(self, resp: httpx.Response) -> str:
+        """Body encoding of a response by its content type: "msgpack" or "json"."""
+        content_type = resp.headers.get("content-type", "")
+        if content_type.startswith((MSGPACK_CONTENT_TYPE, "application/x-msgpack")):
+            self._peer_msgpack = True
+            return "msgpack"
+        return "json"
+
+    def _before_request(self):
+        """Raise CircuitOpenError instead of sending while the circuit is open."""
+        if self.breaker is not None:
+            self.breaker.before_request()
+
+    def _after_request(
+        self,
+        resp: Optional[httpx.Response] = None,
+        error: Optional[Exception] = None,
+        clipped: bool = False,
+    ):
+        """Feed the outcome of a sent request to the circuit breaker.
+
+        A timeout that only happened because the hook deadline cut the
+        request short says nothing about the daemon and is not counted.
+        """
+        if self.breaker is None:
+            return
+        if resp is not None and resp.status_code not in GATEWAY_ERRORS:
+            self.breaker.record_success()
+        elif clipped and isinstance(error, httpx.TimeoutException):
+            return
+        elif resp is not None or isinstance(error, httpx.TransportError):
+            self.breaker.record_failure()
+
+    @staticmethod
+    def _record_rpc(method: str, path: str, started: float, resp: Optional[httpx.Response] = None, error: Optional[Exception] = None):
+        """Report one request to telemetry (no-op unless FORGE3_TELEMETRY=1)."""
+        if not telemetry.enabled():
+            return
+        if resp is None:
+            if isinstance(error, CircuitOpenError):
+                outcome = "circuit_open"
+            elif isinstance(error, deadline.DeadlineExceeded):
+                outcome = "deadline"
+            elif isinstance(error, httpx.TimeoutException):
+                outcome = "timeout"
+            else:
+                outcome = "error"
+            telemetry.record_rpc(method, path, started, outcome)
+            return
+        telemetry.record_rpc(
+            method,
+            path,
+            started,
+            "ok" if resp.status_code < 400 else "http_error",
+            status_code=resp.status_code,
+            bytes_sent=len(resp.request.content),
+            bytes_received=len(resp.content),
+        )
+
+    def _cache_status(self, workflow_id: str, state: WorkflowState, etag: Optional[str]):
+        with self._status_lock:
+            self._status_cache[workflow_id] = (etag, state)
+
+    def _cached_status(self, workflow_id: str) -> Optional[Tuple[Optional[str], WorkflowState]]:
+        with self._status_lock:
+            return self._status_cache.get(workflow_id)
+
+    def _mirror_state(self, state: WorkflowState, source: str):
+        """Write a full state of this session's workflow to the state mirror.
+
+        Only while the status stream is connected: without pushes readers
+        trust no record, so writing one would be wasted work.
+        """
+        if self.state_mirror is None or not self._stream_is_live():
+            return
+        if state.session_id and state.session_id != self.state_mirror.session_id:
+            return
+        self.state_mirror.write(state, source)
+
+    def _invalidate_mirror(self):
+        if self.state_mirror is not None:
+            self.state_mirror.invalidate()
+
+    def _remove_mirror(self):
+        if self.state_mirror is not None:
+            self.state_mirror.remove()
+
+    def _mirror_version(self, workflow_id: str) -> Optional[int]:
+        return self.state_mirror.version(workflow_id) if self.state_mirror is not None else None
+
+    def _mirror_can_stop(self, workflow_id: str, version: Optional[int], result: "CanStopResult"):
+        """Cache a daemon can-stop verdict for the mirror version it was asked at."""
+        if self.state_mirror is not None and version is not None:
+            self.state_mirror.store_can_stop(workflow_id, version, result.can_stop, result.reason)
+
+    def _stream_is_live(self) -> bool:
+        return self._stream is not None and self._stream.connected.is_set()
+
+    def _status_from_response(
+        self,
+        workflow_id: str,
+        resp: httpx.Response,
+        cached: Optional[Tuple[Optional[str], WorkflowState]],
+    ) -> Optional[WorkflowState]:
+        """Resolve a /workflow/status response against the cached entry."""
+        if resp.status_code == 304 and cached:
+            self._mirror_state(cached[1], "status")
+            return cached[1]
+        if resp.status_code == 200:
+            state = decode_workflow_state(resp.content, self._body_encoding(resp))
+            self._cache_status(workflow_id, state, resp.headers.get("etag"))
+            self._mirror_state(state, "status")
+            return state
+        return None
+
+    def invalidate_status(self, workflow_id: Optional[str] = None):
+        """Drop the cached status for one workflow, or all of them."""
+        with self._status_lock:
+            if workflow_id is None:
+                self._status_cache.clear()
+            else:
+                self._status_cache.pop(workflow_id, None)
+
+    def _spool_event(self, event: Dict[str, Any]) -> bool:
+        """Append an event to the spool and wake the flusher, if any; False if not spooled."""
+        if self.event_spool is None:
+            return False
+        try:
+            self.event_spool.append(event)
+        except OSError:
+            return False
+        if self._spool_flusher is not None:
+            self._spool_flusher.wake()
+        return True
+
+    @staticmethod
+    def _record_body(event: Dict[str, Any]) -> Dict[str, Any]:
+        """A spooled event as /event/record expects it."""
+        return {key: value for key, value in event.items() if key not in SPOOL_ONLY_FIELDS}
+
+    @staticmethod
+    def _init_body(
+        command: str,
+        session_id: Optional[str],
+        workspace_root: str,
+        task: Optional[str],
+        metadata: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        return {
+            "command": command,
+            "session_id": session_id,
+            "workspace_root": workspace_root,
+            "task": task,
+            "metadata": metadata or {},
+        }
+
+    @staticmethod
+    def _transition_body(
+        workflow_id: str,
+        from_phase: str,
+        to_phase: str,
+        evidence: Dict[str, Any],
+        conditions_met: List[str],
+        session_id: Optional[str],
+        commit_sha: Optional[str],
+    ) -> Dict[str, Any]:
+        return {
+            "workflow_id": workflow_id,
+            "session_id": session_id,
+            "from_phase": from_phase,
+            "to_phase": to_phase,
+            "evidence": evidence,
+            "conditions_met": conditions_met,
+            "commit_sha": commit_sha,
+        }
+
+    @staticmethod
+    def _event_body(
+        workflow_id: str,
+        event_type: str,
+        phase: str,
+        agent: Optional[str],
+        data: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        return {
+            "workflow_id": workflow_id,
+            "event_type": event_type,
+            "phase": phase,
+            "agent": agent,
+            "data": data or {},
+        }
+
+    @staticmethod
+    def _transition_failure(error: Exception) -> TransitionResult:
+        return TransitionResult(
+            success=False,
+            message=f"Daemon unavailable: {error}",
+            new_phase=None,
+            new_status=None,
+            missing_conditions=[],
+        )
+
+    def _make_http(self, timeout: Optional[httpx.Timeout] = None) -> httpx.Client:
+        """Build an httpx.Client for the configured transport."""
+        return httpx.Client(
+            base_url=self.base_url,
+            transport=httpx.HTTPTransport(**self._transport_options()),
+            timeout=timeout or httpx.Timeout(5.0),
+        )
+
+    @property
+    def http(self) -> httpx.Client:
+        """Pooled connection to the daemon, created lazily.
+
+        Guarded, since hook threads (announce_hook's event recorder) and the
+        worker's spool flusher share one client.
+        """
+        http = self._http
+        if http is None:
+            with self._http_lock:
+                if self._http is None:
+                    self._http = self._make_http()
+                http = self._http
+        return http
+
+    def start_status_stream(self) -> StatusStream:
+        """Keep the status cache live from /sse/events (for resident processes)."""
+        if self._stream is None:
+            self._stream = StatusStream(self)
+        self._stream.start()
+        return self._stream
+
+    def start_spool_flusher(self):
+        """Deliver spooled events from a thread instead of flush processes."""
+        if self.event_spool is not None and self._spool_flusher is None:
+            from event_spool import SpoolFlusher
+            self._spool_flusher = SpoolFlusher(self.event_spool, self.deliver_events)
+            self._spool_flusher.wake()
+
+    def _drain_spool(self) -> bool:
+        """Deliver our own spooled events before reading state they affect.
+
+        Never waits for another flusher: events it is delivering are
+        already on their way, and a hook cannot afford to queue behind it.
+
+        Returns:
+            True if nothing is left pending
+        """
+        if self.event_spool is None or not self.event_spool.has_pending():
+            return True
+        try:
+            self.event_spool.flush(self.deliver_events)
+        except OSError:
+            return False
+        return not self.event_spool.has_pending()
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        timeout: float,
+        params: Optional[Dict[str, Any]] = None,
+        body: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        """Send one RPC, encoding the body per the negotiated encoding.
+
+        timeout is the method's default; inside a hook it is capped by the
+        remaining deadline budget.
+        """
+        send_headers, json_body, content = self._encode(body, headers)
+        started = time.perf_counter()
+        budget = timeout
+        try:
+            self._before_request()
+            budget = deadline.rpc_timeout(timeout)
+            resp = self.http.request(
+                method,
+                path,
+                params=params,
+                json=json_body,
+                content=content,
+                headers=send_headers,
+                timeout=budget,
+            )
+        except Exception as e:
+            self._record_rpc(method, path, started, error=e)
+            self._after_request(error=e, clipped=budget < timeout)
+            raise
+        self._record_rpc(method, path, started, resp)
+        self._after_request(resp)
+        if self._rejected_encoding(resp, content):
+            return self._request(method, path, timeout, params=params, body=body, headers=headers)
+        return resp
+
+    def close(self):
+        """Close the pooled connection; the next call reopens it."""
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream = None
+        with self._http_lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+
+    def __enter__(self) -> "WorkflowControlClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
     def init_workflow(
         self,
@@ -138,19 +618,16 @@ class WorkflowControlClient:
             WorkflowState with policy-resolved phases, or None on error
         """
         try:
-            resp = httpx.post(
-                f"{self.base_url}/workflow/init",
-                json={
-                    "command": command,
-                    "session_id": session_id,
-                    "workspace_root": workspace_root,
-                    "task": task,
-                    "metadata": metadata or {},
-                },
+            resp = self._request(
+                "POST",
+                "/workflow/init",
                 timeout=5.0,
+                body=self._init_body(command, session_id, workspace_root, task, metadata),
             )
             if resp.status_code == 200:
-                return WorkflowState.from_dict(resp.json())
+                state = decode_workflow_state(resp.content, self._body_encoding(resp))
+                self._mirror_state(state, "init")
+                return state
         except Exception:
             pass
         return None
@@ -166,14 +643,21 @@ class WorkflowControlClient:
         """
         if not workflow_id:
             return None
+        self._drain_spool()
+        cached = self._cached_status(workflow_id)
+        if cached and self._stream_is_live():
+            return cached[1]
+
+        headers = {"If-None-Match": cached[0]} if cached and cached[0] else None
         try:
-            resp = httpx.get(
-                f"{self.base_url}/workflow/status",
-                params={"workflow_id": workflow_id},
+            resp = self._request(
+                "GET",
+                "/workflow/status",
                 timeout=3.0,
+                params={"workflow_id": workflow_id},
+                headers=headers,
             )
-            if resp.status_code == 200:
-                return WorkflowState.from_dict(resp.json())
+            return self._status_from_response(workflow_id, resp, cached)
         except Exception:
             pass
         return None
@@ -204,29 +688,21 @@ class WorkflowControlClient:
         Returns:
             TransitionResult with success/failure and new state
         """
+        self._drain_spool()
+        self.invalidate_status(workflow_id)
+        self._invalidate_mirror()
         try:
-            resp = httpx.post(
-                f"{self.base_url}/workflow/transition",
-                json={
-                    "workflow_id": workflow_id,
-                    "session_id": session_id,
-                    "from_phase": from_phase,
-                    "to_phase": to_phase,
-                    "evidence": evidence,
-                    "conditions_met": conditions_met,
-                    "commit_sha": commit_sha,
-                },
+            resp = self._request(
+                "POST",
+                "/workflow/transition",
                 timeout=5.0,
+                body=self._transition_body(
+                    workflow_id, from_phase, to_phase, evidence, conditions_met, session_id, commit_sha
+                ),
             )
-            return TransitionResult.from_dict(resp.json())
+            return decode_transition_result(resp.content, self._body_encoding(resp))
         except Exception as e:
-            return TransitionResult(
-                success=False,
-                message=f"Daemon unavailable: {e}",
-                new_phase=None,
-                new_status=None,
-                missing_conditions=[],
-            )
+            return self._transition_failure(e)
 
     def can_stop(self, workflow_id: str) -> CanStopResult:
         """Check if workflow can be stopped.
@@ -236,14 +712,19 @@ class WorkflowControlClient:
         """
         if not workflow_id:
             return CanStopResult(can_stop=True, reason="No active workflow")
+        self._drain_spool()
+        version = self._mirror_version(workflow_id)
         try:
-            resp = httpx.get(
-                f"{self.base_url}/workflow/can-stop",
-                params={"workflow_id": workflow_id},
+            resp = self._request(
+                "GET",
+                "/workflow/can-stop",
                 timeout=3.0,
+                params={"workflow_id": workflow_id},
             )
             if resp.status_code == 200:
-                return CanStopResult.from_dict(resp.json())
+                result = decode_can_stop_result(resp.content, self._body_encoding(resp))
+                self._mirror_can_stop(workflow_id, version, result)
+                return result
         except Exception as e:
             return CanStopResult(can_stop=True, reason=f"Daemon check failed: {e}")
         return CanStopResult(can_stop=True, reason="Daemon check failed")
@@ -259,6 +740,10 @@ class WorkflowControlClient:
         """Record a workflow event.
         
         Events are logged but do NOT trigger phase transitions.
+        In the resident worker the event is spooled and its flusher thread
+        delivers it. Elsewhere it is sent synchronously (after any older
+        spooled events); if that fails it is spooled for the next drain,
+        so it is not lost while the daemon is down.
         
         Args:
             workflow_id: Workflow ID
@@ -268,24 +753,50 @@ class WorkflowControlClient:
             data: Optional event data
             
         Returns:
-            True if recorded successfully
+            True if recorded (or spooled) successfully
         """
+        event = self._event_body(workflow_id, event_type, phase, agent, data)
+        # agent_* events move phase_status on the daemon side
+        self.invalidate_status(workflow_id)
+        self._invalidate_mirror()
+        if self._spool_flusher is None and self._drain_spool() and self._post_event(event):
+            return True
+        return self._spool_event(event)
+
+    def _post_event(self, event: Dict[str, Any]) -> bool:
         try:
-            resp = httpx.post(
-                f"{self.base_url}/event/record",
-                json={
-                    "workflow_id": workflow_id,
-                    "event_type": event_type,
-                    "phase": phase,
-                    "agent": agent,
-                    "data": data or {},
-                },
-                timeout=3.0,
-            )
+            resp = self._request("POST", "/event/record", timeout=3.0, body=event)
             return resp.status_code == 200
         except Exception:
             return False
 
+    def deliver_events(self, events: List[Dict[str, Any]]) -> int:
+        """Deliver spooled events in order.
+
+        Uses /event/batch when the daemon has it, else /event/record one
+        by one. Batched events carry their event_id for daemon-side dedupe.
+
+        Returns:
+            Number of leading events the daemon acknowledged
+        """
+        if self._batch_supported:
+            try:
+                resp = self._request("POST", "/event/batch", timeout=3.0, body={"events": events})
+            except Exception:
+                return 0
+            if resp.status_code == 200:
+                return len(events)
+            if resp.status_code not in (404, 405, 501):
+                return 0
+            self._batch_supported = False
+
+        delivered = 0
+        for event in events:
+            if not self._post_event(self._record_body(event)):
+                break
+            delivered += 1
+        return delivered
+
     def record_agent_invoke(self, workflow_id: str, agent_name: str, phase: str) -> bool:
         """Record agent invocation (legacy compatibility wrapper).
         
@@ -326,6 +837,33 @@ class WorkflowControlClient:
         )
 
 
+_shared_client: Optional[WorkflowControlClient] = None
+
+
+def shared_client() -> WorkflowControlClient:
+    """Process-wide client shared by the hooks.
+
+    In the resident hook worker this keeps one pooled connection and one
+    status cache across every hook event of the session. Undelivered events
+    go to the session's spool unless FORGE3_EVENT_SPOOL=0, and while its status
+    stream is connected states seen are mirrored to the session's state.json
+    unless FORGE3_STATE_MIRROR=0.
+    """
+    global _shared_client
+    if _shared_client is None:
+        from state_mirror import StateMirror
+
+        session_id = os.environ.get("CSC_SESSION_ID", "")
+        event_spool = None
+        if os.environ.get("FORGE3_EVENT_SPOOL", "1") != "0":
+            from event_spool import EventSpool
+            event_spool = EventSpool.for_session(session_id)
+        _shared_client = WorkflowControlClient(
+            event_spool=event_spool, state_mirror=StateMirror.for_session(session_id)
+        )
+    return _shared_client
+
+
 # Legacy compatibility: aliases
 DaemonControlClient = WorkflowControlClient
 ControlClient = WorkflowControlClient
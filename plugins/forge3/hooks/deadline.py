@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Deadline - One time budget per hook invocation, derived from hooks.json.
+
+Claude Code kills a hook at its hooks.json timeout (10s, 5s for
+SubagentStop and PreCompact). begin() starts the budget when the hook
+process (or the shim forwarding to the worker) starts; every daemon call
+then gets the remaining budget minus SAFETY_MARGIN instead of a fixed
+timeout, so a hook making several sequential calls still has time to
+print a well-formed decision.
+
+Optional work (skill injection, auto-chain init) checks allows() first
+and is skipped when less than OPTIONAL_RESERVE seconds remain.
+
+The deadline is held in a context variable, so it only applies to the
+thread that called begin() and to work that thread runs under
+contextvars.copy_context() (announce_hook's event recorder). Elsewhere
+there is no deadline and callers keep their default timeouts: scripts,
+and the resident worker's spool flusher and SSE threads, whose requests
+must not be clipped because an unrelated hook is nearly out of time.
+"""
+
+import contextvars
+import json
+import os
+import time
+from typing import Dict, Optional
+
+
+DEFAULT_HOOK_TIMEOUT = 10.0
+SAFETY_MARGIN = 0.75       # seconds kept back to build and print the decision
+MIN_RPC_TIMEOUT = 0.05     # below this a request is not worth sending
+OPTIONAL_RESERVE = 1.0     # budget optional work needs to be attempted at all
+
+# time.monotonic() by which the hook running in this context must have returned
+_deadline: "contextvars.ContextVar[Optional[float]]" = contextvars.ContextVar("forge3_deadline", default=None)
+_hook_timeouts: Optional[Dict[str, float]] = None
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised instead of sending a request the hook has no budget left for."""
+
+
+def hook_timeouts() -> Dict[str, float]:
+    """hook module -> timeout seconds, from hooks.json (read once per process)."""
+    global _hook_timeouts
+    if _hook_timeouts is not None:
+        return _hook_timeouts
+    hooks_json = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hooks.json")
+    timeouts: Dict[str, float] = {}
+    try:
+        with open(hooks_json, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        config = {}
+    for entries in config.get("hooks", {}).values():
+        for entry in entries:
+            for hook in entry.get("hooks", []):
+                command = hook.get("command", "").split()
+                if command and "timeout" in hook:
+                    timeouts[os.path.splitext(os.path.basename(command[-1]))[0]] = float(hook["timeout"])
+    _hook_timeouts = timeouts
+    return timeouts
+
+
+def hook_timeout(hook: str) -> float:
+    """A hook's hooks.json timeout in seconds."""
+    return hook_timeouts().get(hook, DEFAULT_HOOK_TIMEOUT)
+
+
+def begin(hook: str, started: Optional[float] = None):
+    """Start the budget for one hook invocation.
+
+    Args:
+        hook: Hook module name (key in hooks.json)
+        started: time.monotonic() when the hook process started, if earlier than now
+    """
+    _deadline.set((started if started is not None else time.monotonic()) + hook_timeout(hook))
+
+
+def clear():
+    """End the current budget (the resident worker serves many hooks)."""
+    _deadline.set(None)
+
+
+def remaining(margin: float = SAFETY_MARGIN) -> Optional[float]:
+    """Seconds left before the deadline minus margin; None without a deadline."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - margin - time.monotonic()
+
+
+def rpc_timeout(default: float) -> float:
+    """Timeout for one daemon request: the default, capped by the remaining budget.
+
+    Raises:
+        DeadlineExceeded: Less than MIN_RPC_TIMEOUT left
+    """
+    left = remaining()
+    if left is None:
+        return default
+    if left < MIN_RPC_TIMEOUT:
+        raise DeadlineExceeded(f"hook deadline reached ({left:.3f}s left)")
+    return min(default, left)
+
+
+def allows(seconds: float = OPTIONAL_RESERVE) -> bool:
+    """True if at least `seconds` of budget remain for optional work."""
+    left = remaining()
+    return left is None or left >= seconds
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Discovery - Parallel component inventory for the discover phases.
+
+Usage: discovery.py [--root PATH] [--mode health|verify] [--session ID] [--workers N]
+
+The discover phases of /assist:verify and /assist:health-check enumerate
+skills, agents, commands, hooks and manifests and collect trigger counts,
+tool counts and content lengths. Instead of an agent reading files one at
+a time, discover() does it in-process:
+
+1. Walk the root with os.scandir, one thread pool task per directory, to
+   find plugin roots (directories holding .claude-plugin/plugin.json)
+2. Stat every component file; parse the new or changed ones in the pool
+3. Emit the HEALTH_DISCOVERY_REPORT (or DISCOVERY_REPORT) data as JSON
+
+When a workflow enters a phase whose skill declares `discovery: health`
+or `discovery: verify` in its frontmatter (see component_registry.py),
+workflow_hook and the wizard auto-chain attach the report to the phase
+context (see discovery_injection) and the discovery-agent reports from it.
+
+FILES:
+- <workflows_root>/.cache/discovery-cache.json  - {"<path>": {"mtime_ns", "size", "record"}}
+- <workflows_root>/<session_id>/discovery.json  - Last report for the session
+
+Parsed records are cached per file by (mtime_ns, size), so a re-run only
+reads files that changed. A root that is itself a plugin root is taken
+as is. Otherwise the walk skips hidden and dependency directories and
+stops at MAX_DEPTH / MAX_DIRECTORIES or when its time budget runs out.
+Inside a hook that budget is what the hook deadline leaves after
+OPTIONAL_RESERVE, at most HOOK_WALK_BUDGET (see deadline.py). A report
+cut short says "truncated": true.
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from _config import atomic_write_json, get_cache_dir, get_workflows_root
+
+
+DISCOVERY_CACHE_FILE = "discovery-cache.json"
+DISCOVERY_REPORT_FILE = "discovery.json"
+
+MAX_DEPTH = 6
+MAX_DIRECTORIES = 5000
+DEFAULT_WORKERS = 8
+INLINE_LIMIT = 16 * 1024   # reports larger than this are referenced by path only
+HOOK_WALK_BUDGET = 2.0     # seconds a hook may spend on discovery at most
+
+SKIP_DIRS = frozenset({"node_modules", "__pycache__", "venv", "dist", "build", "site-packages"})
+MANIFEST_REQUIRED_FIELDS = ("name", "version", "description")
+
+_FRONTMATTER = re.compile(r"^---\s*\n.*?\n---\s*(?:\n|$)", re.DOTALL)
+
+
+def _plugin_root_marker(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, ".claude-plugin", "plugin.json"))
+
+
+def _scan_directory(path: str, stop_at: Optional[float] = None) -> Optional[Tuple[List[str], bool, bool]]:
+    """(subdirectories to descend into, is a plugin root, has a marketplace manifest).
+
+    Returns None, without touching the directory, once stop_at (time.monotonic()) has passed.
+    """
+    if stop_at is not None and time.monotonic() >= stop_at:
+        return None
+    subdirs: List[str] = []
+    is_plugin = _plugin_root_marker(path)
+    has_marketplace = os.path.isfile(os.path.join(path, ".claude-plugin", "marketplace.json"))
+    if is_plugin:
+        return subdirs, True, has_marketplace  # components are enumerated directly
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or entry.name in SKIP_DIRS:
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return subdirs, False, has_marketplace
+
+
+def find_plugin_roots(root: str, pool, stop_at: Optional[float] = None) -> Tuple[List[str], List[str], bool]:
+    """Plugin roots and marketplace manifests under root, breadth first in parallel.
+
+    Args:
+        root: Directory to search
+        pool: Executor the directory scans run on
+        stop_at: time.monotonic() after which no further directory is scanned
+
+    Returns:
+        (plugin roots, marketplace.json paths, truncated); the lists are sorted
+    """
+    plugin_roots: List[str] = []
+    marketplaces: List[str] = []
+    truncated = False
+    level = [root]
+    seen = 0
+    for _ in range(MAX_DEPTH + 1):
+        if not level:
+            break
+        if seen + len(level) > MAX_DIRECTORIES:
+            truncated = True
+            level = level[:MAX_DIRECTORIES - seen]
+        seen += len(level)
+        next_level: List[str] = []
+        for path, scanned in zip(level, pool.map(lambda path: _scan_directory(path, stop_at), level)):
+            if scanned is None:
+                truncated = True
+                continue
+            subdirs, is_plugin, has_marketplace = scanned
+            if is_plugin:
+                plugin_roots.append(path)
+            if has_marketplace:
+                marketplaces.append(os.path.join(path, ".claude-plugin", "marketplace.json"))
+            next_level.extend(subdirs)
+        level = next_level
+    if level:
+        truncated = True  # MAX_DEPTH reached
+    return sorted(plugin_roots), sorted(marketplaces), truncated
+
+
+def _list(path: str) -> List[os.DirEntry]:
+    try:
+        with os.scandir(path) as entries:
+            return sorted(entries, key=lambda entry: entry.name)
+    except OSError:
+        return []
+
+
+def component_files(plugin_root: str) -> List[Tuple[str, str]]:
+    """(kind, path) of every component file of a plugin."""
+    files: List[Tuple[str, str]] = []
+    for entry in _list(os.path.join(plugin_root, "skills")):
+        skill_path = os.path.join(entry.path, "SKILL.md")
+        if entry.is_dir() and os.path.isfile(skill_path):
+            files.append(("skill", skill_path))
+    for kind, directory in (("agent", "agents"), ("command", "commands")):
+        for entry in _list(os.path.join(plugin_root, directory)):
+            if entry.name.endswith(".md") and entry.is_file():
+                files.append((kind, entry.path))
+    for entry in _list(os.path.join(plugin_root, "hooks")):
+        if entry.name == "hooks.json":
+            files.append(("hooks_config", entry.path))
+        elif entry.name.endswith(".py") and entry.is_file():
+            files.append(("hook_script", entry.path))
+    for manifest in (
+        os.path.join(plugin_root, ".claude-plugin", "plugin.json"),
+        os.path.join(plugin_root, "plugin.json"),
+    ):
+        if os.path.isfile(manifest):
+            files.append(("manifest", manifest))
+    return files
+
+
+def _markdown_record(kind: str, path: str, content: str) -> Dict[str, Any]:
+    from component_registry import parse_frontmatter
+
+    fields = parse_frontmatter(content)
+    match = _FRONTMATTER.match(content)
+    body = (content[match.end():] if match else content).strip()
+    default_name = os.path.basename(os.path.dirname(path)) if kind == "skill" else os.path.splitext(os.path.basename(path))[0]
+
+    def count(key: str) -> int:
+        value = fields.get(key)
+        return len(value) if isinstance(value, list) else 0
+
+    record: Dict[str, Any] = {
+        "name": fields.get("name") or default_name,
+        "chars": len(body),
+        "has_frontmatter": match is not None,
+        "has_description": bool(fields.get("description")),
+    }
+    if kind == "skill":
+        record["triggers"] = count("triggers")
+    elif kind == "agent":
+        record["tools"] = count("tools")
+        record["model"] = fields.get("model") or None
+    else:
+        record["tools"] = count("allowed-tools")
+        record["has_docs"] = bool(body)
+    return record
+
+
+def _json_record(kind: str, content: str) -> Dict[str, Any]:
+    try:
+        data = json.loads(content)
+    except ValueError as e:
+        return {"valid_json": False, "error": str(e)}
+    if not isinstance(data, dict):
+        return {"valid_json": False, "error": "not a JSON object"}
+    if kind == "hooks_config":
+        hooks = data.get("hooks") if isinstance(data.get("hooks"), dict) else {}
+        scripts = set()
+        handlers = 0
+        for entries in hooks.values():
+            for entry in entries if isinstance(entries, list) else []:
+                for hook in entry.get("hooks", []) if isinstance(entry, dict) else []:
+                    handlers += 1
+                    command = hook.get("command", "").split() if isinstance(hook, dict) else []
+                    if command:
+                        scripts.add(os.path.basename(command[-1]))
+        return {"valid_json": True, "events": sorted(hooks), "handlers": handlers, "scripts": sorted(scripts)}
+    if kind == "marketplace":
+        plugins = data.get("plugins")
+        return {"valid_json": True, "name": data.get("name"), "plugins": len(plugins) if isinstance(plugins, list) else 0}
+    return {
+        "valid_json": True,
+        "name": data.get("name"),
+        "version": data.get("version"),
+        "fields": sorted(data),
+        "missing": [field for field in MANIFEST_REQUIRED_FIELDS if not data.get(field)],
+    }
+
+
+def parse_component(kind: str, path: str) -> Dict[str, Any]:
+    """Metadata record of one component file."""
+    if kind == "hook_script":
+        return {"name": os.path.basename(path)}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return {"readable": False, "error": str(e)}
+    if kind in ("skill", "agent", "command"):
+        return _markdown_record(kind, path, content)
+    return _json_record(kind, content)
+
+
+def _cache_path() -> str:
+    return os.path.join(get_cache_dir(), DISCOVERY_CACHE_FILE)
+
+
+def _load_cache() -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(_cache_path(), "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _store_cache(cache: Dict[str, Dict[str, Any]]):
+    try:
+        atomic_write_json(_cache_path(), cache)
+    except OSError:
+        pass
+
+
+def _stat_key(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _plugin_report(plugin_root: str, records: Dict[str, Dict[str, Any]], files: List[Tuple[str, str]]) -> Dict[str, Any]:
+    def entry(kind_path: Tuple[str, str]) -> Dict[str, Any]:
+        return dict(records[kind_path[1]], path=os.path.relpath(kind_path[1], plugin_root))
+
+    by_kind: Dict[str, List[Dict[str, Any]]] = {}
+    for kind, path in files:
+        if path in records:
+            by_kind.setdefault(kind, []).append(entry((kind, path)))
+    hook_configs = by_kind.get("hooks_config", [])
+    config = hook_configs[0] if hook_configs else None
+    report = {
+        "plugin_root": plugin_root,
+        "name": next((m.get("name") for m in by_kind.get("manifest", []) if m.get("name")), os.path.basename(plugin_root)),
+        "skills": by_kind.get("skill", []),
+        "agents": by_kind.get("agent", []),
+        "commands": by_kind.get("command", []),
+        "hooks": {
+            "config": config,
+            "events": (config or {}).get("events", []),
+            "handlers": (config or {}).get("handlers", 0),
+            "scripts": [script["path"] for script in by_kind.get("hook_script", [])],
+        },
+        "manifests": by_kind.get("manifest", []),
+    }
+    report["total_count"] = (
+        len(report["skills"]) + len(report["agents"]) + len(report["commands"])
+        + len(hook_configs) + len(report["manifests"])
+    )
+    return report
+
+
+def discover(
+    root: str,
+    mode: str = "health",
+    workers: int = DEFAULT_WORKERS,
+    budget: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Inventory every plugin under root.
+
+    Args:
+        root: Directory to search (a plugin root or a workspace holding plugins)
+        mode: "health" (HEALTH_DISCOVERY_REPORT) or "verify" (DISCOVERY_REPORT)
+        workers: Thread pool size for the walk and the parsing
+        budget: Seconds the walk for plugin roots may take (None: unbounded)
+
+    Returns:
+        The report as a JSON-serializable dict
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    started = time.monotonic()
+    root = os.path.abspath(root)
+    cache = _load_cache()
+    records: Dict[str, Dict[str, Any]] = {}
+    fresh: Dict[str, Dict[str, Any]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        if _plugin_root_marker(root):
+            marketplace = os.path.join(root, ".claude-plugin", "marketplace.json")
+            plugin_roots, marketplaces, truncated = [root], [marketplace] if os.path.isfile(marketplace) else [], False
+        else:
+            stop_at = started + budget if budget is not None else None
+            plugin_roots, marketplaces, truncated = find_plugin_roots(root, pool, stop_at)
+        files_per_plugin = dict(zip(plugin_roots, pool.map(component_files, plugin_roots)))
+        all_files = [item for files in files_per_plugin.values() for item in files]
+        all_files += [("marketplace", path) for path in marketplaces]
+
+        stale: List[Tuple[str, str, Tuple[int, int]]] = []
+        for (kind, path), stat_key in zip(all_files, pool.map(_stat_key, [path for _, path in all_files])):
+            if stat_key is None:
+                continue
+            cached = cache.get(path)
+            if cached and (cached.get("mtime_ns"), cached.get("size")) == stat_key and cached.get("kind") == kind:
+                records[path] = cached["record"]
+                fresh[path] = cached
+            else:
+                stale.append((kind, path, stat_key))
+        for (kind, path, stat_key), record in zip(
+            stale, pool.map(lambda item: parse_component(item[0], item[1]), stale)
+        ):
+            records[path] = record
+            fresh[path] = {"mtime_ns": stat_key[0], "size": stat_key[1], "kind": kind, "record": record}
+
+    if stale or any(path.startswith(root + os.sep) and path not in fresh for path in cache):
+        # Keep entries of other roots; replace this root's with what exists now
+        kept = {path: entry for path, entry in cache.items() if not path.startswith(root + os.sep) and path != root}
+        kept.update(fresh)
+        _store_cache(kept)
+
+    plugins = [_plugin_report(plugin_root, records, files_per_plugin[plugin_root]) for plugin_root in plugin_roots]
+    return {
+        "report": "HEALTH_DISCOVERY_REPORT" if mode == "health" else "DISCOVERY_REPORT",
+        "mode": mode,
+        "root": root,
+        "plugins": plugins,
+        "marketplaces": [dict(records[path], path=path) for path in marketplaces if path in records],
+        "total_count": sum(plugin["total_count"] for plugin in plugins) + len(marketplaces),
+        "truncated": truncated,
+        "files": len(records),
+        "parsed": len(stale),
+        "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+    }
+
+
+def _report_path(session_id: str) -> str:
+    return os.path.join(get_workflows_root(), session_id, DISCOVERY_REPORT_FILE)
+
+
+def write_report(session_id: str, report: Dict[str, Any]) -> Optional[str]:
+    """Save the session's report; returns its path, or None if it could not be written."""
+    path = _report_path(session_id)
+    try:
+        atomic_write_json(path, report, indent=1)
+    except OSError:
+        return None
+    return path
+
+
+def discovery_injection(command: str, phase: str, session_id: str, workspace_root: str) -> str:
+    """<discovery-report> block for a phase whose skill declares `discovery:`, else "".
+
+    The report is inlined when small, else referenced by the path it was
+    saved to (the discovery-agent can Read it).
+    """
+    if not workspace_root:
+        return ""
+    from component_registry import load_registry
+
+    mode = load_registry().discovery_mode(phase, command)
+    if mode not in ("health", "verify"):
+        return ""
+    import deadline
+
+    # Leave the hook what it needs to print its decision after us
+    left = deadline.remaining(deadline.SAFETY_MARGIN + deadline.OPTIONAL_RESERVE)
+    budget = HOOK_WALK_BUDGET if left is None else min(HOOK_WALK_BUDGET, left)
+    if budget <= 0:
+        return ""
+    report = discover(workspace_root, mode, budget=budget)
+    path = write_report(session_id, report) if session_id else None
+    encoded = json.dumps(report, separators=(",", ":"))
+    if len(encoded) <= INLINE_LIMIT or path is None:
+        return f'<discovery-report mode="{mode}">\n{encoded}\n</discovery-report>'
+    summary = {
+        "report": report["report"],
+        "root": report["root"],
+        "plugins": [{"plugin_root": plugin["plugin_root"], "total_count": plugin["total_count"]} for plugin in report["plugins"]],
+        "total_count": report["total_count"],
+        "truncated": report["truncated"],
+    }
+    return (
+        f'<discovery-report mode="{mode}" path="{path}">\n'
+        f"{json.dumps(summary, separators=(',', ':'))}\n"
+        f"Full report ({len(encoded)} bytes): {path}\n"
+        "</discovery-report>"
+    )
+
+
+def main():
+    """CLI: print the discovery report for a directory."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inventory plugin components for forge3 discover phases")
+    parser.add_argument("--root", default=os.getcwd())
+    parser.add_argument("--mode", choices=["health", "verify"], default="health")
+    parser.add_argument("--session", default="", help="Also save the report as <session>/discovery.json")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args()
+    report = discover(args.root, args.mode, args.workers)
+    if args.session:
+        write_report(args.session, report)
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
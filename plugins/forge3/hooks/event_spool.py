@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Event Spool - Non-blocking, at-least-once delivery of workflow events.
+
+Usage: event_spool.py flush --session <session_id>
+
+Events are log-only (they do NOT trigger phase transitions), so hooks do
+not need to wait for the daemon to acknowledge them. In the resident hook
+worker record_event appends one JSON line to a per-session spool next to
+current.json and returns; its SpoolFlusher thread delivers spooled events
+in order, in batches. Without a worker, events are posted synchronously
+(a detached flush process per event costs more than the POST) and only
+spooled when the post fails; the next state read or event drains them.
+
+FILES (under <workflows_root>/<session_id>/):
+- events.spool.jsonl   - Appended events, one JSON object per line
+- events.spool.offset  - Byte offset of the first undelivered event
+- events.spool.lock    - Short lock for append/commit/compaction
+- events.flush.lock    - Held by the single active flusher
+
+DELIVERY:
+- Each event carries an event_id so the daemon can drop redeliveries
+- The offset only advances after the daemon acknowledged a batch, so a
+  crashed flusher redelivers (at-least-once), never skips
+- Once everything is delivered the spool is truncated
+- `event_spool.py flush` delivers a session's spool by hand
+"""
+
+import contextlib
+import fcntl
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from _config import atomic_write, get_workflows_root
+
+
+SPOOL_FILE = "events.spool.jsonl"
+OFFSET_FILE = "events.spool.offset"
+SPOOL_LOCK_FILE = "events.spool.lock"
+FLUSH_LOCK_FILE = "events.flush.lock"
+
+DEFAULT_BATCH_SIZE = 100
+
+
+def _try_lock(handle) -> bool:
+    try:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+@contextlib.contextmanager
+def _locked(path: Path, timeout: Optional[float] = None):
+    """flock a lock file; yields True if the lock was taken.
+
+    timeout=None blocks; otherwise polls for up to timeout seconds.
+    """
+    with open(path, "a") as handle:
+        if timeout is None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            acquired = True
+        else:
+            deadline = time.monotonic() + timeout
+            while not (acquired := _try_lock(handle)) and time.monotonic() < deadline:
+                time.sleep(0.01)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+class EventSpool:
+    """Append-only per-session event spool."""
+
+    def __init__(self, session_dir: Path):
+        self.session_dir = Path(session_dir)
+        self.path = self.session_dir / SPOOL_FILE
+        self.offset_path = self.session_dir / OFFSET_FILE
+        self.lock_path = self.session_dir / SPOOL_LOCK_FILE
+        self.flush_lock_path = self.session_dir / FLUSH_LOCK_FILE
+
+    @classmethod
+    def for_session(cls, session_id: str) -> Optional["EventSpool"]:
+        """Spool for a session, or None when there is no session."""
+        if not session_id:
+            return None
+        return cls(get_workflows_root() / session_id)
+
+    def append(self, event: Dict[str, Any]) -> str:
+        """Spool one event and return its event_id."""
+        event = dict(event)
+        event.setdefault("event_id", uuid.uuid4().hex)
+        event.setdefault("spooled_at", time.time())
+        line = json.dumps(event, separators=(",", ":")) + "\n"
+        self.session_dir.mkdir(parents=True, exist_ok=True)
+        with _locked(self.lock_path):
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+        return event["event_id"]
+
+    def _read_offset(self) -> int:
+        try:
+            return int(self.offset_path.read_text().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def _write_offset(self, offset: int):
+        atomic_write(self.offset_path, str(offset))
+
+    def has_pending(self) -> bool:
+        """True if some spooled event has not been acknowledged yet."""
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            return False
+        return size > self._read_offset()
+
+    def pending(self, limit: int = DEFAULT_BATCH_SIZE) -> List[Tuple[int, Dict[str, Any]]]:
+        """Undelivered events in order, as (end_offset, event) pairs."""
+        offset = self._read_offset()
+        events: List[Tuple[int, Dict[str, Any]]] = []
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break  # partially written line; picked up next time
+                    offset += len(raw)
+                    try:
+                        events.append((offset, json.loads(raw)))
+                    except ValueError:
+                        continue  # corrupt line; skipped by the offset advance
+                    if len(events) >= limit:
+                        break
+        except OSError:
+            pass
+        return events
+
+    def commit(self, offset: int):
+        """Mark everything before offset delivered; truncate once drained."""
+        with _locked(self.lock_path):
+            try:
+                size = self.path.stat().st_size
+            except OSError:
+                size = 0
+            if offset >= size:
+                with contextlib.suppress(OSError):
+                    os.truncate(self.path, 0)
+                self._write_offset(0)
+            else:
+                self._write_offset(offset)
+
+    def flush(
+        self,
+        deliver: Callable[[List[Dict[str, Any]]], int],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        lock_timeout: float = 0.0,
+    ) -> int:
+        """Deliver pending events in order.
+
+        Args:
+            deliver: Sends a batch, returns how many leading events were acknowledged
+            batch_size: Events per batch
+            lock_timeout: Seconds to wait for another flusher to finish
+
+        Returns:
+            Number of events delivered
+        """
+        delivered = 0
+        if not self.session_dir.is_dir():
+            return delivered
+        with _locked(self.flush_lock_path, timeout=lock_timeout) as acquired:
+            if not acquired:
+                return delivered
+            while True:
+                batch = self.pending(batch_size)
+                if not batch:
+                    break
+                acked = deliver([event for _, event in batch])
+                if acked > 0:
+                    self.commit(batch[acked - 1][0])
+                    delivered += acked
+                if acked < len(batch):
+                    break
+        return delivered
+
+
+class SpoolFlusher:
+    """Background thread that drains a spool whenever it is woken.
+
+    Used by long-lived processes (the resident hook worker), where
+    record_event spools instead of posting.
+    """
+
+    def __init__(self, spool: EventSpool, deliver: Callable[[List[Dict[str, Any]]], int], retry_interval: float = 2.0):
+        self.spool = spool
+        self.deliver = deliver
+        self.retry_interval = retry_interval
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="forge3-spool-flusher", daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        """Ask the flusher to deliver newly spooled events."""
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.retry_interval)
+            self._wake.clear()
+            with contextlib.suppress(Exception):
+                if self.spool.has_pending():
+                    self.spool.flush(self.deliver)
+
+
+def main():
+    """CLI: flush a session's spool."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Deliver spooled forge3 workflow events")
+    parser.add_argument("action", choices=["flush"])
+    parser.add_argument("--session", default=os.environ.get("CSC_SESSION_ID", ""))
+    args = parser.parse_args()
+
+    spool = EventSpool.for_session(args.session)
+    if spool is None:
+        sys.exit(0)
+
+    from control_client import WorkflowControlClient
+
+    with WorkflowControlClient() as client:
+        # Keep going while hooks append. A zero-delivery round means either
+        # another flusher holds the lock or the daemon is failing: retry
+        # briefly, then leave the rest for the next flush or status read.
+        idle_rounds = 0
+        while spool.has_pending() and idle_rounds < 20:
+            if spool.flush(client.deliver_events, lock_timeout=0.1) == 0:
+                idle_rounds += 1
+                time.sleep(0.1)
+            else:
+                idle_rounds = 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Hook Shim - Forward a hook event to the resident hook worker.
+
+Usage: hook_shim.py <hook_module>   (e.g. hook_shim.py phase_hook)
+
+Reads the hook payload from stdin and forwards it, along with the
+working directory and the environment the hooks read, to the session's
+hook_worker.py over its Unix socket. The worker's stdout, stderr and exit
+code are replayed verbatim, so Claude Code sees the same decision as if
+the hook script had run directly.
+
+FALLBACK:
+- No CSC_SESSION_ID, no socket, or the worker did not accept the event
+  within (1 - FALLBACK_SHARE) of the hook's hooks.json timeout: run the
+  hook in-process in the time left
+- Once the worker has accepted an event the shim never runs it again, so
+  side effects (init_workflow, recorded events, ledger entries) happen
+  once; a reply that does not arrive in time skips the event (exit 0)
+- Payload over FORWARD_LIMIT (e.g. a SubagentStop carrying a whole
+  transcript): run in-process with stdin still streaming, so hooks that
+  decode incrementally (announce_hook) never hold it in memory
+- FORGE3_HOOK_WORKER=1: also start a worker for the session in the
+  background so later events are served warm
+"""
+
+import io
+import json
+import os
+import socket
+import sys
+import time
+from typing import Optional
+
+# The hook's hooks.json budget runs from process start (see deadline.py)
+STARTED = time.monotonic()
+
+from hook_worker import ACCEPTED, FORWARDED_ENV, HOOK_MODULES, recv_all
+from _config import get_worker_socket_path
+from deadline import MIN_RPC_TIMEOUT, hook_timeout
+
+
+CONNECT_TIMEOUT = 0.2
+FALLBACK_SHARE = 0.5          # of the hook's timeout kept for the in-process fallback
+REPLY_MARGIN = 0.5            # seconds kept back to replay the worker's reply
+FORWARD_LIMIT = 1024 * 1024   # characters of stdin read before deciding to forward
+
+
+class PrefixedStdin:
+    """Text stream yielding an already-read prefix, then the rest of stdin."""
+
+    def __init__(self, prefix: str, rest):
+        self._prefix = prefix
+        self._rest = rest
+
+    def read(self, size: Optional[int] = -1) -> str:
+        if size is None or size < 0:
+            data, self._prefix = self._prefix + self._rest.read(), ""
+            return data
+        if not self._prefix:
+            return self._rest.read(size)
+        data, self._prefix = self._prefix[:size], self._prefix[size:]
+        return data
+
+
+def _wait_accepted(conn: socket.socket, accept_by: float) -> bool:
+    """True once the worker has sent ACCEPTED; False if it did not by accept_by."""
+    conn.settimeout(max(accept_by - time.monotonic(), MIN_RPC_TIMEOUT))
+    try:
+        return conn.recv(1) == ACCEPTED
+    except socket.timeout:
+        pass
+    # Catch an ACCEPTED that landed as the wait ran out; after the close
+    # below the worker's send fails and it drops the event
+    conn.setblocking(False)
+    try:
+        return conn.recv(1) == ACCEPTED
+    except OSError:
+        return False
+
+
+def forward(socket_path: str, hook: str, payload: str) -> Optional[dict]:
+    """Send one event to the worker and return its reply.
+
+    Returns:
+        The reply; a skip (exit 0) if the worker accepted the event but did
+        not answer in time; None if it never accepted it (run in-process)
+    """
+    timeout = hook_timeout(hook)
+    request = {
+        "hook": hook,
+        "stdin": payload,
+        "cwd": os.getcwd(),
+        "started": STARTED,
+        "accept_by": STARTED + timeout * (1 - FALLBACK_SHARE),
+        "env": {key: os.environ[key] for key in FORWARDED_ENV if key in os.environ},
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        try:
+            conn.settimeout(CONNECT_TIMEOUT)
+            conn.connect(socket_path)
+            conn.sendall(json.dumps(request).encode("utf-8"))
+            conn.shutdown(socket.SHUT_WR)
+            if not _wait_accepted(conn, request["accept_by"]):
+                return None
+        except OSError:
+            return None
+
+        # The worker is running the hook: never run it a second time
+        try:
+            conn.setblocking(True)
+            conn.settimeout(max(STARTED + timeout - REPLY_MARGIN - time.monotonic(), MIN_RPC_TIMEOUT))
+            reply = json.loads(recv_all(conn).decode("utf-8"))
+        except (OSError, ValueError):
+            reply = None
+    if not isinstance(reply, dict) or not isinstance(reply.get("exit_code"), int):
+        return {"exit_code": 0, "stdout": "", "stderr": f"{hook}: no reply from the hook worker in time; event skipped\n"}
+    return reply
+
+
+def spawn_worker(session_id: str):
+    """Start a detached worker for the session; it serves events after this one."""
+    import subprocess
+
+    worker_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hook_worker.py")
+    try:
+        subprocess.Popen(
+            [sys.executable, worker_path, "--session", session_id],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            close_fds=True,
+        )
+    except OSError:
+        pass
+
+
+def run_in_process(hook: str, stdin):
+    """Run the hook's main() directly, exactly like the standalone script.
+
+    Args:
+        hook: Hook module name
+        stdin: Text stream the hook reads its payload from
+    """
+    import importlib
+    import deadline
+    import telemetry
+
+    sys.stdin = stdin
+    deadline.begin(hook, STARTED)
+    telemetry.begin(hook)
+    exit_code = 1
+    try:
+        module = importlib.import_module(hook)
+        module.main()
+        exit_code = 0
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        raise
+    finally:
+        telemetry.finish(exit_code)
+
+
+def main():
+    """Forward a hook event to the worker, falling back to in-process."""
+    if len(sys.argv) < 2 or sys.argv[1] not in HOOK_MODULES:
+        sys.stderr.write(f"Usage: hook_shim.py <{'|'.join(HOOK_MODULES)}>\n")
+        sys.exit(0)
+    hook = sys.argv[1]
+    payload = sys.stdin.read(FORWARD_LIMIT + 1)
+    if len(payload) > FORWARD_LIMIT:
+        run_in_process(hook, PrefixedStdin(payload, sys.stdin))
+        sys.exit(0)
+
+    session_id = os.environ.get("CSC_SESSION_ID", "")
+    if session_id:
+        socket_path = get_worker_socket_path(session_id)
+        reply = forward(socket_path, hook, payload) if os.path.exists(socket_path) else None
+        if reply is not None:
+            sys.stdout.write(reply.get("stdout") or "")
+            sys.stderr.write(reply.get("stderr") or "")
+            sys.stdout.flush()
+            sys.exit(reply["exit_code"])
+        if os.environ.get("FORGE3_HOOK_WORKER") == "1":
+            spawn_worker(session_id)
+
+    run_in_process(hook, io.StringIO(payload))
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
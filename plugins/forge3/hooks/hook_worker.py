@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Hook Worker - Resident per-session process that runs forge3 hooks warm.
+
+Usage: hook_worker.py --session <session_id> [--idle-timeout <seconds>]
+
+Every hook event normally pays a fresh interpreter plus imports of httpx,
+control_client and _config. The worker imports the hook modules once and
+keeps their module-level state (the shared WorkflowControlClient and its
+SSE-fed status cache, loaded skills, session pointer) alive between events. hook_shim.py forwards each event
+over a Unix socket and replays the worker's decision.
+
+PROTOCOL (one request per connection):
+- Shim sends a JSON object, then shuts down its write side:
+  {"hook": "phase_hook", "stdin": "...", "cwd": "...", "env": {...},
+   "started": <shim monotonic start>, "accept_by": <monotonic deadline>}
+- Worker sends ACCEPTED (one byte) right before running the hook; a
+  request read after accept_by is dropped unanswered, since the shim has
+  already run it in-process
+- Worker then replies with a JSON object and closes:
+  {"exit_code": 0, "stdout": "...", "stderr": "..."}
+
+DESIGN PRINCIPLE:
+- The worker is optional; the shim falls back to running in-process
+- Requests are handled one at a time because hooks read os.environ,
+  the working directory and sys.stdio
+- A hook still running at its hooks.json timeout retires the worker:
+  the socket goes away, so queued and later shims fall back in-process
+  at once instead of each waiting behind it
+- Exits after an idle timeout or when another worker owns the session
+"""
+
+import contextlib
+import fcntl
+import importlib
+import io
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from _config import get_worker_socket_path
+import deadline
+import telemetry
+
+
+# Hook modules the worker is allowed to run
+HOOK_MODULES = ("workflow_hook", "phase_hook", "announce_hook", "stop_hook", "compact_hook", "session_hook")
+
+# Environment variables hooks read, forwarded per event by the shim
+FORWARDED_ENV = (
+    "CSC_SESSION_ID",
+    "TOOL_OUTPUT",
+    "WORKFLOW_WORKSPACE_ROOT",
+    "CLAUDE_PLUGIN_ROOT",
+    "CLAUDE_PROJECT_DIR",
+    "FORGE3_TELEMETRY",
+    "FORGE3_TELEMETRY_PROM",
+)
+
+DEFAULT_IDLE_TIMEOUT = 1800.0
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+ACCEPTED = b"+"   # sent before the hook runs: from here the shim must not run it again
+
+
+def recv_all(conn: socket.socket, limit: int = MAX_REQUEST_BYTES) -> bytes:
+    """Read from a connection until EOF."""
+    chunks = []
+    total = 0
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > limit:
+            raise ValueError("request too large")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+@contextlib.contextmanager
+def _hook_context(request: Dict[str, Any]):
+    """Apply the event's env, cwd and stdio for the duration of one hook run."""
+    saved_env = {key: os.environ.get(key) for key in FORWARDED_ENV}
+    saved_cwd = os.getcwd()
+    saved_stdin = sys.stdin
+    env = request.get("env") or {}
+    try:
+        for key in FORWARDED_ENV:
+            if key in env:
+                os.environ[key] = env[key]
+            else:
+                os.environ.pop(key, None)
+        cwd = request.get("cwd")
+        if cwd and os.path.isdir(cwd):
+            os.chdir(cwd)
+        sys.stdin = io.StringIO(request.get("stdin") or "")
+        yield
+    finally:
+        sys.stdin = saved_stdin
+        with contextlib.suppress(OSError):
+            os.chdir(saved_cwd)
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def run_hook(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one hook's main() and capture its decision.
+
+    Args:
+        request: Decoded shim request
+
+    Returns:
+        Dict with exit_code, stdout and stderr
+    """
+    hook = request.get("hook")
+    if hook not in HOOK_MODULES:
+        return {"exit_code": 0, "stdout": "", "stderr": f"Unknown hook: {hook}\n"}
+
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    exit_code = 0
+    with _hook_context(request), contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        started = request.get("started")
+        deadline.begin(hook, started if isinstance(started, (int, float)) else None)
+        telemetry.begin(hook)
+        try:
+            module = importlib.import_module(hook)
+            module.main()
+        except SystemExit as e:
+            if e.code is None:
+                exit_code = 0
+            elif isinstance(e.code, int):
+                exit_code = e.code
+            else:
+                sys.stderr.write(f"{e.code}\n")
+                exit_code = 1
+        except Exception as e:
+            # Never take the worker down with a hook; report like a crashed script
+            sys.stderr.write(f"{hook} failed in worker: {e!r}\n")
+            exit_code = 1
+        telemetry.finish(exit_code)
+        deadline.clear()
+
+    return {"exit_code": exit_code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+def run_hook_capped(request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """run_hook() on a thread, waiting no longer than the hook's hooks.json timeout.
+
+    Returns:
+        The response, or None if the hook is still running (hung)
+    """
+    started = request.get("started")
+    limit = deadline.hook_timeout(str(request.get("hook")))
+    if isinstance(started, (int, float)):
+        limit = max(started + limit - time.monotonic(), 0.0)
+    result: Dict[str, Any] = {}
+    runner = threading.Thread(target=lambda: result.update(run_hook(request)), name="forge3-hook", daemon=True)
+    runner.start()
+    runner.join(limit)
+    return None if runner.is_alive() else result
+
+
+class HookWorker:
+    """Unix socket server that runs hook events for one session."""
+
+    def __init__(self, session_id: str, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.session_id = session_id
+        self.idle_timeout = idle_timeout
+        self.socket_path = get_worker_socket_path(session_id)
+        self._lock_file = None
+        self._server = None
+
+    def acquire(self) -> bool:
+        """Take the per-session lock so only one worker serves a session."""
+        os.makedirs(os.path.dirname(self.socket_path), exist_ok=True)
+        self._lock_file = open(f"{self.socket_path}.lock", "a")
+        try:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._lock_file.close()
+            self._lock_file = None
+            return False
+        return True
+
+    def bind(self):
+        """Bind the listening socket, replacing any stale one."""
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.socket_path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o077)
+        try:
+            server.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        server.listen(16)
+        server.settimeout(self.idle_timeout)
+        self._server = server
+
+    def warm(self):
+        """Import hook modules up front so the first event is already warm.
+
+        Also (re)builds the skill bundle if it is missing or stale, starts
+        the shared client's spool flusher thread and subscribes
+        it to the daemon's SSE feed so status lookups are answered from the
+        live cache (FORGE3_STATUS_STREAM=0 disables the feed).
+        """
+        for hook in HOOK_MODULES:
+            with contextlib.suppress(Exception):
+                importlib.import_module(hook)
+        with contextlib.suppress(Exception):
+            from skill_bundle import ensure_bundle
+            ensure_bundle()
+        with contextlib.suppress(Exception):
+            from control_client import shared_client
+
+            client = shared_client()
+            client.start_spool_flusher()
+            if os.environ.get("FORGE3_STATUS_STREAM", "1") != "0":
+                client.start_status_stream()
+
+    def handle(self, conn: socket.socket) -> bool:
+        """Serve a single shim connection.
+
+        Returns:
+            False if the hook overran its timeout and the worker must retire
+        """
+        with conn:
+            conn.settimeout(30.0)
+            try:
+                request = json.loads(recv_all(conn).decode("utf-8"))
+            except (OSError, ValueError):
+                return True
+            accept_by = request.get("accept_by")
+            if isinstance(accept_by, (int, float)) and time.monotonic() > accept_by:
+                return True
+            try:
+                conn.sendall(ACCEPTED)
+            except OSError:
+                return True   # the shim gave up and runs the hook itself
+            response = run_hook_capped(request)
+            if response is None:
+                return False
+            with contextlib.suppress(OSError):
+                conn.sendall(json.dumps(response).encode("utf-8"))
+            return True
+
+    def serve_forever(self):
+        """Accept events until idle for idle_timeout seconds or a hook hangs."""
+        try:
+            while True:
+                try:
+                    conn, _ = self._server.accept()
+                except socket.timeout:
+                    break
+                if not self.handle(conn):
+                    break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        """Remove the socket and release the session lock."""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.socket_path)
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+def main():
+    """Run the resident hook worker for a session."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Resident forge3 hook worker")
+    parser.add_argument("--session", default=os.environ.get("CSC_SESSION_ID", ""))
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=float(os.environ.get("FORGE3_HOOK_WORKER_IDLE", DEFAULT_IDLE_TIMEOUT)),
+    )
+    args = parser.parse_args()
+
+    if not args.session:
+        sys.stderr.write("hook_worker: --session or CSC_SESSION_ID is required\n")
+        sys.exit(1)
+
+    worker = HookWorker(args.session, idle_timeout=args.idle_timeout)
+    if not worker.acquire():
+        # Another worker already serves this session
+        sys.exit(0)
+    # Unwind through serve_forever's cleanup; hooks never catch KeyboardInterrupt
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    worker.warm()
+    worker.bind()
+    worker.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
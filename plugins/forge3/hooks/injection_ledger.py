@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Injection Ledger - Per-session record of skill injections already sent.
+
+workflow_hook and the announce_hook auto-chain append a full
+<phase-skill-reference> to the prompt whenever a workflow starts. Within
+one session the model already has that text in context after the first
+time, so repeats are replaced by a short reference tag.
+
+FILES (under <workflows_root>/<session_id>/):
+- skill-injections.json      - {"<sha256>": {"phase", "command", "bytes", "injected_at"}}
+- skill-injections.json.lock - Serializes check-and-record and resets (the
+                               worker, in-process hooks and announce_hook's
+                               recorder thread can overlap)
+
+RULES:
+- Same payload hash as an earlier injection: emit a reference tag
+- Changed skill content hashes differently: full re-injection
+- Context compaction (PreCompact, compact_hook.py) clears the ledger,
+  since the earlier text may have been summarized away
+- So does every conversation start in the session (SessionStart:
+  startup, clear, resume, compact; session_hook.py), since the new
+  context never saw the earlier text
+"""
+
+import contextlib
+import fcntl
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from _config import atomic_write_json, get_workflows_root
+
+
+LEDGER_FILE = "skill-injections.json"
+
+
+def get_ledger_path(session_id: str) -> Path:
+    return get_workflows_root() / session_id / LEDGER_FILE
+
+
+@contextlib.contextmanager
+def _locked(session_id: str):
+    path = get_ledger_path(session_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(f"{path}.lock", "a") as handle:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def load_ledger(session_id: str) -> Dict[str, dict]:
+    """Injections recorded for a session ({} if none or unreadable)."""
+    try:
+        with open(get_ledger_path(session_id), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_ledger(session_id: str, ledger: Dict[str, dict]):
+    try:
+        atomic_write_json(get_ledger_path(session_id), ledger, separators=(",", ":"))
+    except OSError:
+        pass
+
+
+def reset_ledger(session_id: str):
+    """Forget every injection of a session (e.g. after context compaction)."""
+    if not session_id or not get_ledger_path(session_id).exists():
+        return
+    try:
+        with _locked(session_id):
+            os.unlink(get_ledger_path(session_id))
+    except OSError:
+        pass
+
+
+def content_hash(injection: str) -> str:
+    import hashlib
+
+    return hashlib.sha256(injection.encode("utf-8")).hexdigest()
+
+
+def format_reference_tag(phase: str, command: Optional[str], digest: str) -> str:
+    """Short stand-in for a skill injection the session already received."""
+    command_attr = f' command="{command}"' if command else ""
+    return (
+        f'<phase-skill-reference phase="{phase}"{command_attr} ref="{digest[:12]}" unchanged="true">\n'
+        f"Skill content is unchanged since it was injected earlier in this session; "
+        f"follow that phase-skill-reference.\n"
+        f"</phase-skill-reference>"
+    )
+
+
+def dedupe_injection(session_id: Optional[str], phase: str, command: Optional[str], injection: str) -> str:
+    """Return the injection to send: the full payload or a reference tag.
+
+    Args:
+        session_id: Session identifier (no session: always the full payload)
+        phase: The phase name
+        command: Optional command name
+        injection: Full <phase-skill-reference> payload
+
+    Returns:
+        The full payload the first time (or after a change/compaction),
+        otherwise a short reference tag
+    """
+    if not session_id or not injection:
+        return injection
+
+    digest = content_hash(injection)
+    try:
+        with _locked(session_id):
+            ledger = load_ledger(session_id)
+            if digest in ledger:
+                return format_reference_tag(phase, command, digest)
+            ledger[digest] = {
+                "phase": phase,
+                "command": command,
+                "bytes": len(injection.encode("utf-8")),
+                "injected_at": time.time(),
+            }
+            _save_ledger(session_id, ledger)
+    except OSError:
+        pass
+    return injection
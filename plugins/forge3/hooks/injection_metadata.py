@@ -7,69 +7,52 @@ Policy comes from the workflow daemon (workflow-daemon).
 This module provides read-only hints for skill/agent injection only.
 """
 
-from typing import Optional, Dict
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 # Read-only metadata for skill injection
 # Policy comes from daemon, this is just injection hints
+#
+# Phase -> skill/agent hints are not kept here: component_registry builds
+# them from the frontmatter of skills/, agents/ and commands/ (see there).
+# Imported on first lookup, so hooks that never resolve a phase skip it.
 
-# Map generic phase names to their skill directory names
-PHASE_SKILL_MAP: Dict[str, Optional[str]] = {
-    # Common phases
-    "router": "router-skill",
-    "semantic": "semantic-skill",
-    "execute": "execute-skill",
-    "schema-check": "schema-check-skill",
-    # Phases that vary by command (resolved via COMMAND_PHASE_SKILLS)
-    "discover": None,
-    "validate": None,
-    "connectivity": None,
-    "analyze": None,
-    "aggregate": None,
-}
 
-# Command-specific phase-to-skill mappings
-# Used when PHASE_SKILL_MAP returns None for a phase
-COMMAND_PHASE_SKILLS: Dict[str, Dict[str, str]] = {
-    "assist:verify": {
-        "discover": "verify-discover-skill",
-        "validate": "verify-validate-skill",
-        "connectivity": "verify-connectivity-skill",
-    },
-    "assist:health-check": {
-        "discover": "health-discover-skill",
-        "analyze": "health-analyze-skill",
-        "aggregate": "health-aggregate-skill",
-    },
+# Heading selectors per (command, phase): inject only these sections of the
+# skill (each with its subsections) plus the text before the first section.
+# command None applies to every command; no entry means the whole skill.
+PHASE_SKILL_SECTIONS: Dict[Tuple[Optional[str], str], Tuple[str, ...]] = {
+    # /assist:plan validates a plan, not written plugin.json/marketplace.json
+    ("assist:plan", "schema-check"): (
+        "Purpose",
+        "File Location Rules",
+        "YAML Frontmatter Rules",
+        "Cross-Reference Validation",
+        "Output Format",
+        "Transition Conditions",
+    ),
+    # Location tables and the mistakes table cover the directory diagrams
+    ("assist:create", "execute"): (
+        "File Location Rules",
+        "Exact Templates",
+        "Quick Reference: Common Mistakes",
+        "Execution Process",
+    ),
 }
 
-# Map phase names to their required agent
-PHASE_AGENT_MAP: Dict[str, Optional[str]] = {
-    # Common phases
-    "router": "router-agent",
-    "semantic": "semantic-agent",
-    "execute": "execute-agent",
-    "schema-check": "schema-check-agent",
-    # Phases that vary by command (resolved via COMMAND_PHASE_AGENTS)
-    "discover": None,
-    "validate": None,
-    "connectivity": None,
-    "analyze": None,
-    "aggregate": None,
-}
 
-# Command-specific phase-to-agent mappings
-COMMAND_PHASE_AGENTS: Dict[str, Dict[str, str]] = {
-    "assist:verify": {
-        "discover": "verify-discovery-agent",
-        "validate": "verify-validate-agent",
-        "connectivity": "verify-connectivity-agent",
-    },
-    "assist:health-check": {
-        "discover": "health-discovery-agent",
-        "analyze": "health-analyze-agent",
-        "aggregate": "health-aggregate-agent",
-    },
-}
+def get_phase_binding(phase: str, command: Optional[str] = None) -> Optional[Any]:
+    """Get the skill, agent and subagent_type for a phase.
+
+    Args:
+        phase: The phase name
+        command: Optional command name for command-specific phases
+
+    Returns:
+        component_registry.PhaseBinding, or None if no component serves the phase
+    """
+    from component_registry import load_registry
+
+    return load_registry().binding(phase, command)
 
 
 def get_skill_for_phase(phase: str, command: Optional[str] = None) -> Optional[str]:
@@ -82,16 +65,8 @@ def get_skill_for_phase(phase: str, command: Optional[str] = None) -> Optional[s
     Returns:
         Skill directory name, or None if not found
     """
-    # First check generic mapping
-    skill = PHASE_SKILL_MAP.get(phase)
-    if skill:
-        return skill
-    
-    # Then check command-specific mapping
-    if command and command in COMMAND_PHASE_SKILLS:
-        return COMMAND_PHASE_SKILLS[command].get(phase)
-    
-    return None
+    binding = get_phase_binding(phase, command)
+    return binding.skill if binding else None
 
 
 def get_agent_for_phase(phase: str, command: Optional[str] = None) -> Optional[str]:
@@ -104,13 +79,42 @@ def get_agent_for_phase(phase: str, command: Optional[str] = None) -> Optional[s
     Returns:
         Agent name, or None if not found
     """
-    # First check generic mapping
-    agent = PHASE_AGENT_MAP.get(phase)
-    if agent:
-        return agent
-    
-    # Then check command-specific mapping
-    if command and command in COMMAND_PHASE_AGENTS:
-        return COMMAND_PHASE_AGENTS[command].get(phase)
-    
-    return None
+    binding = get_phase_binding(phase, command)
+    return binding.agent if binding else None
+
+
+def get_sections_for_phase(phase: str, command: Optional[str] = None) -> Optional[Tuple[str, ...]]:
+    """Get the heading selectors for a phase.
+
+    Args:
+        phase: The phase name
+        command: Optional command name for command-specific selectors
+
+    Returns:
+        Section titles to inject, or None to inject the whole skill
+    """
+    sections = PHASE_SKILL_SECTIONS.get((command, phase))
+    if sections is None:
+        sections = PHASE_SKILL_SECTIONS.get((None, phase))
+    return sections
+
+
+def sections_fingerprint() -> str:
+    """Stable string identifying the current selectors (for precompiled bundles)."""
+    return repr(sorted(PHASE_SKILL_SECTIONS.items(), key=lambda item: (item[0][0] or "", item[0][1])))
+
+
+def iter_skill_phases() -> Iterator[Tuple[Optional[str], str, str]]:
+    """Yield every (command, phase, skill) injection the hints can resolve.
+
+    Generic phase skills are yielded once without a command; every
+    (command, phase) binding with a skill once for its command.
+    """
+    from component_registry import load_registry
+
+    registry = load_registry()
+    for phase, skill in registry.phase_skills.items():
+        yield None, phase, skill
+    for (command, phase), binding in registry.bindings.items():
+        if binding.skill:
+            yield command, phase, binding.skill
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Payload Stream - Incremental SubagentStop decoding with flat memory.
+
+A SubagentStop payload can carry a subagent's complete transcript.
+read_subagent_stop() reads it from stdin in CHUNK_SIZE pieces and keeps
+only what announce_hook needs:
+
+- subagent_type
+- the recommended /assist:* command in the agent's text output
+
+Text fields are never materialized: each candidate string is decoded
+segment by segment and fed to a MarkerScanner, which searches bounded,
+lowercased windows. Everything else is skipped without decoding.
+
+TEXT FIELD PRIORITY (first match wins, as the dict-based lookup did):
+1. tool_output.{stdout, output, content, text, message}  - non-blank strings
+2. tool_output.content[] - "text" of the first object item that has one
+3. tool_output                                          - non-blank string
+4. top-level output, result, content                    - non-blank strings
+5. the TOOL_OUTPUT environment variable
+
+MARKER SEMANTICS (find_recommended_command):
+For each marker in MARKERS order, take its first occurrence
+(case-insensitive) and the first /assist:<command> at or after it; the
+first marker with such a match decides.
+
+Payloads whose subagent_type does not match the agent prefix are drained
+without parsing. As with json.load, a repeated key replaces the earlier
+value; unlike it, values that are skipped are not fully validated.
+"""
+
+import json
+import os
+import re
+from typing import Dict, Iterator, List, Optional
+
+
+CHUNK_SIZE = 64 * 1024
+WINDOW_SIZE = 64 * 1024
+
+MARKERS = ("recommendation", "recommended command", "recommended")
+COMMAND_PATTERN = re.compile(r"/assist:(plan|create|verify|health-check)")
+
+# A marker or command split across two windows is still seen whole
+_CARRY = max(max(len(m) for m in MARKERS), len("/assist:health-check")) - 1
+
+TOOL_OUTPUT_TEXT_KEYS = ("stdout", "output", "content", "text", "message")
+TOP_LEVEL_TEXT_KEYS = ("output", "result", "content")
+_CONTENT_ITEM_TEXT = "tool_output.content[].text"
+TEXT_PRIORITY = tuple(f"tool_output.{key}" for key in TOOL_OUTPUT_TEXT_KEYS) + (
+    _CONTENT_ITEM_TEXT,
+    "tool_output",
+) + TOP_LEVEL_TEXT_KEYS
+
+_SKIP_TOKEN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]"]')
+_SCALAR_END = re.compile(r"[,}\]\s]")
+_WHITESPACE = re.compile(r"\s*")
+
+
+class MarkerScanner:
+    """Streaming, case-insensitive recommended-command search."""
+
+    __slots__ = ("nonblank", "_tail", "_offset", "_marker_at", "_found")
+
+    def __init__(self):
+        self.nonblank = False
+        self._tail = ""                                  # last _CARRY lowered chars seen
+        self._offset = 0                                 # text position of _tail[0]
+        self._marker_at: List[Optional[int]] = [None] * len(MARKERS)
+        self._found: List[Optional[str]] = [None] * len(MARKERS)
+
+    def feed(self, text: str):
+        """Scan the next piece of the text."""
+        for start in range(0, len(text), WINDOW_SIZE):
+            self._scan(text[start:start + WINDOW_SIZE])
+
+    def _scan(self, chunk: str):
+        if not self.nonblank and chunk and not chunk.isspace():
+            self.nonblank = True
+        if self._found[0] is not None:
+            return  # the highest-priority marker already decided
+        window = self._tail + chunk.lower()
+        base = self._offset
+        for i, marker in enumerate(MARKERS):
+            if self._found[i] is not None:
+                continue
+            if self._marker_at[i] is None:
+                index = window.find(marker)
+                if index == -1:
+                    continue
+                self._marker_at[i] = base + index
+            match = COMMAND_PATTERN.search(window, max(self._marker_at[i] - base, 0))
+            if match:
+                self._found[i] = f"/assist:{match.group(1)}"
+        keep = min(len(window), _CARRY)
+        self._offset = base + len(window) - keep
+        self._tail = window[len(window) - keep:]
+
+    def result(self) -> Optional[str]:
+        """Recommended command, e.g. "/assist:create", or None."""
+        for found in self._found:
+            if found is not None:
+                return found
+        return None
+
+
+def find_recommended_command(text: str) -> Optional[str]:
+    """Recommended /assist:* command in text (see MARKER SEMANTICS)."""
+    if not text:
+        return None
+    scanner = MarkerScanner()
+    scanner.feed(text)
+    return scanner.result()
+
+
+def _decode_segment(raw: str) -> str:
+    return json.loads(f'"{raw}"')
+
+
+def _closing_quote(buf: str, start: int) -> int:
+    """Index of the quote ending the string body at start, or -1 if not in buf."""
+    scan = start
+    while True:
+        quote = buf.find('"', scan)
+        if quote == -1:
+            return -1
+        backslash = quote
+        while backslash > start and buf[backslash - 1] == "\\":
+            backslash -= 1
+        if (quote - backslash) % 2 == 0:
+            return quote
+        scan = quote + 1
+
+
+def _complete_escapes_end(buf: str, start: int) -> int:
+    """End of buf[start:] without a trailing, incomplete escape."""
+    end = len(buf)
+    index = buf.rfind("\\", max(start, end - 5), end)
+    if index == -1:
+        return end
+    if index + 1 < end and (buf[index + 1] != "u" or index + 6 <= end):
+        return end
+    run = 0
+    while index - run >= start and buf[index - run] == "\\":
+        run += 1
+    return index if run % 2 else end
+
+
+class _JsonStream:
+    """Pull reader over a text stream, holding at most about two chunks."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.stream.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def drain(self):
+        """Consume the rest of the stream without keeping it."""
+        self.buf, self.pos = "", 0
+        while self.stream.read(CHUNK_SIZE):
+            pass
+        self.eof = True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ("" at end of input)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} in SubagentStop payload")
+        self.pos += 1
+
+    def string_pieces(self, decode: bool = True) -> Iterator[str]:
+        """Pieces of the string at the cursor, each at most about one chunk."""
+        self.expect('"')
+        while True:
+            start = self.pos
+            end = _closing_quote(self.buf, start)
+            if end != -1:
+                if start < end:
+                    yield _decode_segment(self.buf[start:end]) if decode else ""
+                self.pos = end + 1
+                return
+            # The buffer ends inside the string, maybe inside an escape:
+            # emit what is complete and refill
+            cut = _complete_escapes_end(self.buf, start)
+            if start < cut:
+                yield _decode_segment(self.buf[start:cut]) if decode else ""
+            self.pos = cut
+            if not self._fill():
+                raise ValueError("unterminated string in SubagentStop payload")
+
+    def read_string(self) -> str:
+        return "".join(self.string_pieces())
+
+    def skip_value(self):
+        char = self.peek()
+        if char == '"':
+            for _ in self.string_pieces(decode=False):
+                pass
+        elif char in ("{", "["):
+            depth = 0
+            while True:
+                match = _SKIP_TOKEN.search(self.buf, self.pos)
+                if match is None:
+                    self.pos = len(self.buf)
+                    if not self._fill():
+                        raise ValueError("unterminated container in SubagentStop payload")
+                    continue
+                token = match.group()
+                if token == '"':
+                    # String running past the buffer: skip it piecewise
+                    self.pos = match.start()
+                    for _ in self.string_pieces(decode=False):
+                        pass
+                    continue
+                self.pos = match.end()
+                if token[0] == '"':
+                    continue
+                depth += 1 if token in "{[" else -1
+                if depth == 0:
+                    return
+        elif char:
+            while True:
+                match = _SCALAR_END.search(self.buf, self.pos)
+                if match is not None:
+                    self.pos = match.start()
+                    return
+                self.pos = len(self.buf)
+                if not self._fill():
+                    return
+        else:
+            raise ValueError("unexpected end of SubagentStop payload")
+
+    def object_keys(self) -> Iterator[str]:
+        """Keys of the object at the cursor; the caller consumes each value."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.read_string()
+            self.expect(":")
+            yield key
+            char = self.peek()
+            self.pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise ValueError("expected ',' or '}' in SubagentStop payload")
+
+    def array_items(self) -> Iterator[None]:
+        """One step per item of the array at the cursor; the caller consumes each item."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield None
+            char = self.peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError("expected ',' or ']' in SubagentStop payload")
+
+
+class SubagentStopPayload:
+    """What announce_hook needs from a SubagentStop payload."""
+
+    __slots__ = ("subagent_type", "recommended_command")
+
+    def __init__(self, subagent_type: str = "", recommended_command: Optional[str] = None):
+        self.subagent_type = subagent_type
+        self.recommended_command = recommended_command
+
+
+def _scan_string(reader: _JsonStream) -> MarkerScanner:
+    scanner = MarkerScanner()
+    for piece in reader.string_pieces():
+        scanner.feed(piece)
+    return scanner
+
+
+def _read_content_items(reader: _JsonStream, candidates: Dict[str, MarkerScanner]):
+    """tool_output.content list: the first object item with a string "text"."""
+    for _ in reader.array_items():
+        if _CONTENT_ITEM_TEXT in candidates or reader.peek() != "{":
+            reader.skip_value()
+            continue
+        item_text = None
+        for key in reader.object_keys():
+            if key == "text" and reader.peek() == '"':
+                item_text = _scan_string(reader)
+            else:
+                if key == "text":
+                    item_text = None
+                reader.skip_value()
+        if item_text is not None:
+            candidates[_CONTENT_ITEM_TEXT] = item_text
+
+
+def _read_tool_output(reader: _JsonStream, candidates: Dict[str, MarkerScanner]):
+    for key in reader.object_keys():
+        name = f"tool_output.{key}"
+        candidates.pop(name, None)
+        if key == "content":
+            candidates.pop(_CONTENT_ITEM_TEXT, None)
+        kind = reader.peek()
+        if key in TOOL_OUTPUT_TEXT_KEYS and kind == '"':
+            candidates[name] = _scan_string(reader)
+        elif key == "content" and kind == "[":
+            _read_content_items(reader, candidates)
+        else:
+            reader.skip_value()
+
+
+def read_subagent_stop(stream, agent_prefix: Optional[str] = None) -> SubagentStopPayload:
+    """Decode a SubagentStop payload incrementally.
+
+    Args:
+        stream: Text stream holding the JSON payload (sys.stdin)
+        agent_prefix: If given and subagent_type does not start with it,
+            the rest of the payload is drained unparsed
+
+    Returns:
+        SubagentStopPayload
+
+    Raises:
+        ValueError: The payload is not a JSON object
+    """
+    reader = _JsonStream(stream)
+    payload = SubagentStopPayload()
+    candidates: Dict[str, MarkerScanner] = {}
+
+    if reader.peek() != "{":
+        raise ValueError("SubagentStop payload is not a JSON object")
+    for key in reader.object_keys():
+        kind = reader.peek()
+        if key == "subagent_type" and kind == '"':
+            payload.subagent_type = reader.read_string()
+            if agent_prefix and not payload.subagent_type.startswith(agent_prefix):
+                reader.drain()
+                return payload
+        elif key == "tool_output":
+            for name in [name for name in candidates if name.startswith("tool_output")]:
+                del candidates[name]
+            if kind == '"':
+                candidates["tool_output"] = _scan_string(reader)
+            elif kind == "{":
+                _read_tool_output(reader, candidates)
+            else:
+                reader.skip_value()
+        elif key in TOP_LEVEL_TEXT_KEYS:
+            candidates.pop(key, None)
+            if kind == '"':
+                candidates[key] = _scan_string(reader)
+            else:
+                reader.skip_value()
+        else:
+            reader.skip_value()
+
+    for name in TEXT_PRIORITY:
+        scanner = candidates.get(name)
+        # The content item text is taken even when blank, as before
+        if scanner is not None and (scanner.nonblank or name == _CONTENT_ITEM_TEXT):
+            payload.recommended_command = scanner.result()
+            return payload
+
+    env_output = os.environ.get("TOOL_OUTPUT", "")
+    if env_output.strip():
+        payload.recommended_command = find_recommended_command(env_output)
+    return payload
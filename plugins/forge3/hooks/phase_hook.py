@@ -17,6 +17,13 @@ DESIGN PRINCIPLE:
 - Daemon owns ALL workflow policy
 - This hook queries daemon for allowed phases (NO hardcoding)
 - Validates transitions via daemon only
+- Gate fields come from the session's state mirror while it is fed by
+  the worker's SSE subscription (see state_mirror.py); otherwise the
+  daemon is queried.
+  Allowing a transition drops the mirror, since the MCP tool is about
+  to change the state.
+- Starting the /assist:wizard router spawns a background prefetch of
+  the auto-chain targets (see prefetch.py)
 
 Exit codes:
 - 0: Allow tool execution
@@ -27,9 +34,8 @@ import json
 import sys
 import os
 
-from control_client import WorkflowControlClient
-from injection_metadata import get_agent_for_phase
-from _config import get_current_workflow_id
+from _config import get_client, get_current_workflow_id
+from telemetry import span
 
 
 # Build agent mapping dynamically for all known agents
@@ -47,9 +53,6 @@ def get_agent_subagent_type(agent_name: str, command: str = None) -> str:
     return f"forge3:{agent_name}"
 
 
-client = WorkflowControlClient()
-
-
 def block_with_message(message: str):
     """Output block response and exit."""
     result = {
@@ -68,7 +71,8 @@ def allow():
 def main():
     """Handle PreToolUse event."""
     try:
-        input_data = json.load(sys.stdin)
+        with span("stdin"):
+            input_data = json.load(sys.stdin)
     except (json.JSONDecodeError, EOFError):
         # No input - allow by default
         allow()
@@ -77,25 +81,32 @@ def main():
     tool_input = input_data.get("tool_input", {})
 
     session_id = os.environ.get("CSC_SESSION_ID", "")
-    workflow_id = get_current_workflow_id(session_id)
+    with span("pointer"):
+        workflow_id = get_current_workflow_id(session_id)
 
     if not workflow_id:
         # No active workflow for this session - allow tool execution
         allow()
 
-    # Get workflow status from daemon
-    state = client.get_status(workflow_id)
+    # Gate fields from the state mirror, else from the daemon
+    # Imported past the no-workflow exit, like the client
+    import state_mirror
 
-    # If no active workflow, allow tool execution
+    with span("mirror"):
+        state = state_mirror.read_state(session_id, workflow_id)
     if state is None:
-        allow()
+        daemon_state = get_client().get_status(workflow_id)
+        # If no active workflow, allow tool execution
+        if daemon_state is None:
+            allow()
+        state = state_mirror.state_fields(daemon_state)
 
-    workflow_id = state.workflow_id
-    command = state.command
-    current_phase = state.current_phase
-    phase_status = state.phase_status
-    required_agent = state.required_agent
-    allowed_next_phases = state.allowed_next_phases
+    workflow_id = state["workflow_id"]
+    command = state["command"]
+    current_phase = state["current_phase"]
+    phase_status = state["phase_status"]
+    required_agent = state["required_agent"]
+    allowed_next_phases = state["allowed_next_phases"] or []
 
     # Handle Task tool (agent invocation)
     if tool_name == "Task":
@@ -108,7 +119,11 @@ def main():
             # Only allow the required agent
             if subagent_type == expected_subagent or subagent_type == required_agent:
                 # Record agent invocation
-                client.record_agent_invoke(workflow_id, required_agent, current_phase)
+                get_client().record_agent_invoke(workflow_id, required_agent, current_phase)
+                if command == "assist:wizard":
+                    # Warm the auto-chain targets while the router runs
+                    from prefetch import spawn_prefetch_process
+                    spawn_prefetch_process(session_id, workflow_id)
                 allow()
             else:
                 block_with_message(
@@ -148,7 +163,9 @@ def main():
                 f"Current status: {phase_status}. Complete the required agent first."
             )
 
-        # Allow tool execution; MCP tool will call the daemon
+        # Allow tool execution; MCP tool will call the daemon and change
+        # the state behind the mirror's back
+        state_mirror.invalidate(session_id)
         allow()
 
     # For any other tool, allow by default
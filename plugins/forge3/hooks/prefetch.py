@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Prefetch - Warm the wizard's auto-chain targets while the router runs.
+
+Usage: prefetch.py warm --session <session_id> --workflow <wizard_workflow_id>
+
+When phase_hook lets the router-agent Task of /assist:wizard start, it
+spawns a detached `prefetch.py warm`. By the time the router finishes
+and announce_hook auto-chains, everything but the init call is ready:
+
+- skill injections for the first phase of each chainable command
+- the workspace root
+- the skill bundle (built if missing or stale)
+
+The daemon owns workflow policy, so the first phase of each command is
+not hardcoded: POLICY SHAPES are learned from the auto-chain's init
+responses (phases, final phase, first phase and its agent per command)
+and cached. A command the wizard never chained into on this machine has
+no shape and is not prefetched; its auto-chain reads the skill live as
+before.
+
+FILES:
+- <workflows_root>/.cache/policy-shapes.json   - {"<command>": {"phases", "final_phase",
+                                                   "first_phase", "required_agent"}}
+- <workflows_root>/<session_id>/prefetch.json  - {"workflow_id", "written_at", "workspace_root",
+                                                   "injections": {"<command>": {"phase", "injection"}}}
+
+Prefetched injections are keyed to the wizard workflow that triggered
+them and expire after PREFETCH_TTL seconds.
+"""
+
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Optional
+
+from _config import atomic_write_json, get_cache_dir, get_workflows_root
+
+
+POLICY_SHAPES_FILE = "policy-shapes.json"
+PREFETCH_FILE = "prefetch.json"
+PREFETCH_TTL = 1800.0
+
+# Commands the wizard can chain into (see payload_stream.find_recommended_command)
+CHAIN_TARGETS = ("assist:plan", "assist:create", "assist:verify", "assist:health-check")
+
+
+def _load_json(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_json(path: str, data: Dict[str, Any]):
+    try:
+        atomic_write_json(path, data)
+    except OSError:
+        pass
+
+
+def _shapes_path() -> str:
+    return os.path.join(get_cache_dir(), POLICY_SHAPES_FILE)
+
+
+def _prefetch_path(session_id: str) -> str:
+    return os.path.join(get_workflows_root(), session_id, PREFETCH_FILE)
+
+
+def load_policy_shapes() -> Dict[str, Dict[str, Any]]:
+    """Learned policy shape per command."""
+    return _load_json(_shapes_path())
+
+
+def learn_policy_shape(state: Any):
+    """Remember the policy shape of a freshly initialized workflow (best effort).
+
+    Args:
+        state: WorkflowState returned by /workflow/init
+    """
+    if not state.command or not state.current_phase:
+        return
+    shape = {
+        "phases": list(state.phases or []),
+        "final_phase": state.final_phase,
+        "first_phase": state.current_phase,
+        "required_agent": state.required_agent,
+    }
+    shapes = load_policy_shapes()
+    if shapes.get(state.command) == shape:
+        return
+    shapes[state.command] = shape
+    _write_json(_shapes_path(), shapes)
+
+
+def warm(session_id: str, workflow_id: str) -> Dict[str, Any]:
+    """Prefetch everything the wizard auto-chain needs except the init call.
+
+    Args:
+        session_id: Session running the wizard
+        workflow_id: The wizard workflow whose router is running
+
+    Returns:
+        The prefetch record written for the session
+    """
+    from skill_bundle import ensure_bundle
+    from skill_loader import get_phase_skill_injection_v2
+    from workspace import resolve_workspace_root
+
+    ensure_bundle()
+    shapes = load_policy_shapes()
+    injections: Dict[str, Dict[str, str]] = {}
+    for command in CHAIN_TARGETS:
+        phase = (shapes.get(command) or {}).get("first_phase")
+        if not phase:
+            continue
+        injections[command] = {
+            "phase": phase,
+            "injection": get_phase_skill_injection_v2(phase=phase, command=command) or "",
+        }
+    record = {
+        "workflow_id": workflow_id,
+        "written_at": time.time(),
+        "workspace_root": resolve_workspace_root(session_id),
+        "injections": injections,
+    }
+    _write_json(_prefetch_path(session_id), record)
+    return record
+
+
+def load_prefetch(session_id: str, workflow_id: str) -> Optional[Dict[str, Any]]:
+    """The session's prefetch record if it was made for workflow_id and is recent."""
+    if not session_id:
+        return None
+    record = _load_json(_prefetch_path(session_id))
+    if record.get("workflow_id") != workflow_id:
+        return None
+    if time.time() - record.get("written_at", 0.0) > PREFETCH_TTL:
+        return None
+    return record
+
+
+def prefetched_injection(record: Optional[Dict[str, Any]], command: str, phase: str) -> Optional[str]:
+    """Prefetched injection for the chained (command, phase), if it was warmed."""
+    entry = ((record or {}).get("injections") or {}).get(command)
+    if not isinstance(entry, dict) or entry.get("phase") != phase:
+        return None
+    return entry.get("injection")
+
+
+def spawn_prefetch_process(session_id: str, workflow_id: str):
+    """Warm the auto-chain targets from a detached process; returns immediately."""
+    import subprocess
+
+    try:
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "warm", "--session", session_id, "--workflow", workflow_id],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            close_fds=True,
+        )
+    except OSError:
+        pass
+
+
+def main():
+    """CLI: prefetch the wizard auto-chain targets for a session."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Warm forge3 wizard auto-chain targets")
+    parser.add_argument("action", choices=["warm"])
+    parser.add_argument("--session", default=os.environ.get("CSC_SESSION_ID", ""))
+    parser.add_argument("--workflow", required=True)
+    args = parser.parse_args()
+    if not args.session:
+        sys.exit(0)
+    warm(args.session, args.workflow)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Session Hook - Reset skill injection dedupe when a conversation starts.
+
+Event: SessionStart
+Trigger: startup, clear, resume, compact
+
+CRITICAL BEHAVIOR:
+- Clears the session's injection ledger: a new, cleared or resumed
+  conversation in the same CSC session has not seen the skill content
+  the ledger says was injected, so reference tags would point at nothing
+- Never blocks the session start; always exits 0
+"""
+
+import os
+import sys
+
+from injection_ledger import reset_ledger
+
+
+def main():
+    """Handle SessionStart event."""
+    reset_ledger(os.environ.get("CSC_SESSION_ID", ""))
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Skill Bundle - Precompiled <phase-skill-reference> payloads per plugin version.
+
+Usage: skill_bundle.py build [--force]
+
+Instead of resolving (phase, command) through injection_metadata and
+reading/formatting markdown on every workflow start, a build step writes
+every injection payload the hints can produce into one file:
+
+    <workflows_root>/.cache/skill-bundle-<version>.bin
+
+LAYOUT:
+- 8 bytes   magic b"F3SKB01\\n"
+- 4 bytes   big-endian header length
+- header    JSON {"version", "sections", "registry", "entries":
+            {"<command>|<phase>": [offset, length, skill_path, mtime_ns, size]}}
+            (command "" = no command; "sections" fingerprints the section
+            selectors, "registry" the component registry bindings)
+- payloads  UTF-8 injection payloads, back to back
+
+Payloads are stored already sliced to the (command, phase) section
+selectors. A lookup is one mmap of the bundle, a header parse (memoized per process)
+and a slice at the entry's offset. An entry whose SKILL.md stat no longer
+matches is stale; callers then fall back to the live files. When no bundle
+file exists the lookup stops at its stat; the selector fingerprint and
+registry digest a header is checked against are computed once per process.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Any, Dict, Optional, Tuple
+
+from _config import atomic_write, get_cache_dir, get_plugin_root
+
+
+BUNDLE_MAGIC = b"F3SKB01\n"
+_HEADER_LEN = struct.Struct(">I")
+
+# bundle path -> ((mtime_ns, size, ino), header)
+_header_cache: Dict[str, Tuple[Tuple[int, int, int], Dict[str, Any]]] = {}
+_plugin_version: Optional[str] = None
+# (sections fingerprint, registry digest) bundles are checked against, once per process
+_expected_stamps: Optional[Tuple[str, str]] = None
+
+
+def get_plugin_version() -> str:
+    """Version from .claude-plugin/plugin.json (read once per process)."""
+    global _plugin_version
+    if _plugin_version is None:
+        manifest = os.path.join(get_plugin_root(), ".claude-plugin", "plugin.json")
+        try:
+            with open(manifest, "r", encoding="utf-8") as f:
+                _plugin_version = str(json.load(f).get("version") or "0")
+        except (OSError, ValueError):
+            _plugin_version = "0"
+    return _plugin_version
+
+
+def get_bundle_path(version: Optional[str] = None) -> str:
+    """Bundle file for a plugin version."""
+    return str(get_cache_dir() / f"skill-bundle-{version or get_plugin_version()}.bin")
+
+
+def entry_key(phase: str, command: Optional[str]) -> str:
+    return f"{command or ''}|{phase}"
+
+
+def _read_header(path: str) -> Optional[Dict[str, Any]]:
+    """Parse (or reuse) a bundle's header."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    stat_key = (st.st_mtime_ns, st.st_size, st.st_ino)
+    cached = _header_cache.get(path)
+    if cached and cached[0] == stat_key:
+        return cached[1]
+
+    try:
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                if view[:len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+                    return None
+                start = len(BUNDLE_MAGIC)
+                (header_len,) = _HEADER_LEN.unpack_from(view, start)
+                start += _HEADER_LEN.size
+                header = json.loads(view[start:start + header_len])
+    except (OSError, ValueError, struct.error):
+        return None
+    header["payload_start"] = start + header_len
+    _header_cache[path] = (stat_key, header)
+    return header
+
+
+def _current_stamps() -> Tuple[str, str]:
+    """Selector fingerprint and registry digest, computed once per process."""
+    global _expected_stamps
+    if _expected_stamps is None:
+        from component_registry import load_registry
+        from injection_metadata import sections_fingerprint
+
+        _expected_stamps = (sections_fingerprint(), load_registry().digest())
+    return _expected_stamps
+
+
+def _header_current(header: Dict[str, Any]) -> bool:
+    """True if a bundle was built for this plugin version, these selectors and this registry."""
+    if header.get("version") != get_plugin_version():
+        return False
+    return (header.get("sections"), header.get("registry")) == _current_stamps()
+
+
+def lookup_injection(phase: str, command: Optional[str] = None) -> Optional[str]:
+    """Injection payload from the current version's bundle.
+
+    Returns:
+        The payload, or None if there is no bundle, no entry, or the
+        entry's SKILL.md changed since the build (stale)
+    """
+    path = get_bundle_path()
+    header = _read_header(path)
+    if header is None:
+        # Only the worker or the CLI builds a bundle; without one there is nothing to check
+        return None
+    if not _header_current(header):
+        return None
+    entry = header["entries"].get(entry_key(phase, command))
+    if entry is None:
+        return None
+
+    offset, length, skill_path, mtime_ns, size = entry
+    try:
+        st = os.stat(skill_path)
+    except OSError:
+        return None
+    if (st.st_mtime_ns, st.st_size) != (mtime_ns, size):
+        return None
+
+    start = header["payload_start"] + offset
+    try:
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                return view[start:start + length].decode("utf-8")
+    except (OSError, ValueError):
+        return None
+
+
+def is_fresh(version: Optional[str] = None) -> bool:
+    """True if the bundle exists and no source SKILL.md changed since the build."""
+    header = _read_header(get_bundle_path(version))
+    if header is None or not _header_current(header):
+        return False
+    for _, _, skill_path, mtime_ns, size in header["entries"].values():
+        try:
+            st = os.stat(skill_path)
+        except OSError:
+            return False
+        if (st.st_mtime_ns, st.st_size) != (mtime_ns, size):
+            return False
+    return True
+
+
+def build_bundle(version: Optional[str] = None) -> str:
+    """Write the bundle for every (command, phase) injection; returns its path.
+
+    Also resets this process's stamps to the ones written, so a long-lived
+    worker that rebuilds checks lookups against the new bundle.
+    """
+    global _expected_stamps
+    from component_registry import load_registry
+    from injection_metadata import iter_skill_phases, sections_fingerprint
+    from skill_loader import format_skill_tag, read_skill_file, select_skill_sections
+
+    version = version or get_plugin_version()
+    plugin_root = get_plugin_root()
+    entries: Dict[str, list] = {}
+    payloads = []
+    offset = 0
+    for command, phase, skill in iter_skill_phases():
+        skill_path = os.path.join(plugin_root, "skills", skill, "SKILL.md")
+        try:
+            st = os.stat(skill_path)
+        except OSError:
+            continue
+        content = read_skill_file(skill_path)
+        if not content:
+            continue
+        content = select_skill_sections(content, phase, command, skill)
+        payload = format_skill_tag(phase, content, command).encode("utf-8")
+        entries[entry_key(phase, command)] = [offset, len(payload), skill_path, st.st_mtime_ns, st.st_size]
+        payloads.append(payload)
+        offset += len(payload)
+
+    _expected_stamps = (sections_fingerprint(), load_registry().digest())
+    header = json.dumps({
+        "version": version,
+        "sections": _expected_stamps[0],
+        "registry": _expected_stamps[1],
+        "entries": entries,
+    }).encode("utf-8")
+    path = get_bundle_path(version)
+    atomic_write(path, b"".join([BUNDLE_MAGIC, _HEADER_LEN.pack(len(header)), header, *payloads]))
+    return path
+
+
+def ensure_bundle() -> Optional[str]:
+    """Build the bundle if it is missing or stale; returns its path or None."""
+    try:
+        if not is_fresh():
+            return build_bundle()
+        return get_bundle_path()
+    except OSError:
+        return None
+
+
+def main():
+    """CLI: build the bundle for the installed plugin version."""
+    if len(sys.argv) < 2 or sys.argv[1] != "build":
+        sys.stderr.write("Usage: skill_bundle.py build [--force]\n")
+        sys.exit(1)
+    if "--force" in sys.argv[2:] or not is_fresh():
+        path = build_bundle()
+        print(f"Built {path}")
+    else:
+        print(f"Up to date: {get_bundle_path()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,32 +5,27 @@ Skill Loader - Utility for loading skill content for phase injection.
 Maps workflow phases to their corresponding skills and provides
 functions to read skill content with frontmatter stripped.
 
-Uses injection_metadata.py for phase-to-skill mapping (read-only hints).
+Uses injection_metadata.py for phase-to-skill mapping (read-only hints,
+built from skill frontmatter by component_registry.py).
+
+Stripped skill bodies are cached in memory by (path, mtime_ns, size) for
+long-lived processes (the resident hook worker); any edit to a SKILL.md
+changes its stat and invalidates the entry immediately. There is no
+on-disk copy: a cold process reads and strips the one SKILL.md it needs
+faster than it could parse an index of every skill body.
+
+Skills are indexed by heading (fenced code blocks excluded). When
+injection_metadata has section selectors for a (command, phase), only the
+selected sections are injected.
 """
 
 import os
 import re
-from typing import Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from injection_metadata import get_skill_for_phase
-
-
-# Legacy mapping for backward compatibility
-PHASE_TO_SKILL = {
-    "router": "router-skill",
-    "semantic": "semantic-skill",
-    "execute": "execute-skill",
-    "verify": "verify-skill",
-}
-
-
-def get_plugin_root() -> str:
-    """Get the plugin root directory from environment or derive from this file's location."""
-    env_root = os.environ.get("CLAUDE_PLUGIN_ROOT")
-    if env_root:
-        return env_root
-    # Derive from this file's location (hooks/ directory is under plugin root)
-    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+from _config import get_plugin_root
+from injection_metadata import get_sections_for_phase, get_skill_for_phase
+from skill_bundle import lookup_injection
 
 
 def strip_frontmatter(content: str) -> str:
@@ -45,6 +40,38 @@ def strip_frontmatter(content: str) -> str:
     return stripped.strip()
 
 
+# path -> (mtime_ns, size, stripped content)
+_content_cache: Dict[str, Tuple[int, int, str]] = {}
+
+
+def read_skill_file(skill_path: str) -> Optional[str]:
+    """Read a SKILL.md with frontmatter stripped, served from cache when fresh.
+
+    Args:
+        skill_path: Absolute path to the SKILL.md
+
+    Returns:
+        Skill content without frontmatter, or None if not found
+    """
+    try:
+        st = os.stat(skill_path)
+    except OSError:
+        return None
+    key = (st.st_mtime_ns, st.st_size)
+
+    cached = _content_cache.get(skill_path)
+    if cached is not None and cached[:2] == key:
+        return cached[2]
+
+    try:
+        with open(skill_path, "r", encoding="utf-8") as f:
+            content = strip_frontmatter(f.read())
+    except (IOError, OSError):
+        return None
+    _content_cache[skill_path] = (*key, content)
+    return content
+
+
 def read_skill_content(skill_name: str) -> Optional[str]:
     """Read skill content by skill directory name, stripping frontmatter.
 
@@ -59,19 +86,139 @@ def read_skill_content(skill_name: str) -> Optional[str]:
 
     plugin_root = get_plugin_root()
     skill_path = os.path.join(plugin_root, "skills", skill_name, "SKILL.md")
+    return read_skill_file(skill_path)
 
-    try:
-        with open(skill_path, "r", encoding="utf-8") as f:
-            content = f.read()
-        return strip_frontmatter(content)
-    except (IOError, OSError):
-        return None
+
+# (level, title, start, end) character offsets into stripped skill content
+Section = Tuple[int, str, int, int]
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+_FENCE_RE = re.compile(r"^\s*(```|~~~)")
+
+# content -> section index, for the content most recently indexed per skill
+_section_cache: Dict[str, Tuple[str, List[Section]]] = {}
+
+
+def build_section_index(content: str) -> List[Section]:
+    """Index markdown headings, ignoring lines inside fenced code blocks.
+
+    Each section spans from its heading to the next heading of the same or
+    a higher level, so it includes its subsections.
+
+    Args:
+        content: Skill content without frontmatter
+
+    Returns:
+        Sections in document order as (level, title, start, end)
+    """
+    headings: List[Tuple[int, str, int]] = []
+    fence = None
+    pos = 0
+    for line in content.splitlines(keepends=True):
+        fence_match = _FENCE_RE.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker
+            elif fence == marker:
+                fence = None
+        elif fence is None:
+            heading = _HEADING_RE.match(line.rstrip("\n"))
+            if heading:
+                headings.append((len(heading.group(1)), heading.group(2), pos))
+        pos += len(line)
+
+    sections: List[Section] = []
+    for i, (level, title, start) in enumerate(headings):
+        end = len(content)
+        for next_level, _, next_start in headings[i + 1:]:
+            if next_level <= level:
+                end = next_start
+                break
+        sections.append((level, title, start, end))
+    return sections
+
+
+def get_section_index(skill_name: str, content: str) -> List[Section]:
+    """Section index for a skill's content, rebuilt when the content changes."""
+    cached = _section_cache.get(skill_name)
+    if cached is not None and cached[0] is content:
+        return cached[1]
+    sections = build_section_index(content)
+    _section_cache[skill_name] = (content, sections)
+    return sections
+
+
+def slice_sections(content: str, selectors: Sequence[str], sections: Optional[List[Section]] = None) -> str:
+    """Keep the text before the first section plus the selected sections.
+
+    Selectors match heading titles case-insensitively. Headings of
+    enclosing sections are kept so selected subsections stay in context.
+
+    Args:
+        content: Skill content without frontmatter
+        selectors: Heading titles to keep
+        sections: Precomputed build_section_index(content)
+
+    Returns:
+        Sliced content, or the whole content if nothing matched
+    """
+    if sections is None:
+        sections = build_section_index(content)
+    # The document title (a leading level-1 heading) belongs to the preamble
+    body = [s for s in sections if not (s[0] == 1 and s is sections[0])]
+    if not body:
+        return content
+
+    wanted = {selector.strip().lower() for selector in selectors}
+    selected = [s for s in body if s[1].strip().lower() in wanted]
+    if not selected:
+        return content
+
+    parts = [content[:body[0][2]]]
+    covered_until = body[0][2]
+    for level, title, start, end in body:
+        if start < covered_until:
+            continue
+        if any(s[2] == start for s in selected):
+            parts.append(content[start:end])
+            covered_until = end
+        elif any(start < s[2] < end for s in selected):
+            # Enclosing section: keep only its heading line
+            heading_end = content.find("\n", start) + 1 or end
+            parts.append(content[start:heading_end] + "\n")
+    return "".join(parts).strip()
+
+
+def select_skill_sections(
+    content: str,
+    phase: str,
+    command: Optional[str] = None,
+    skill_name: Optional[str] = None,
+) -> str:
+    """Apply the (command, phase) section selectors to skill content.
+
+    Args:
+        content: Skill content without frontmatter
+        phase: The phase name
+        command: Optional command name
+        skill_name: Skill the content came from (keys the index cache)
+
+    Returns:
+        The selected sections, or the whole content without selectors
+    """
+    selectors = get_sections_for_phase(phase, command)
+    if not selectors:
+        return content
+    sections = get_section_index(skill_name, content) if skill_name else None
+    return slice_sections(content, selectors, sections)
 
 
 def read_phase_skill(phase: str) -> Optional[str]:
     """Read skill content for a phase, stripping frontmatter.
 
-    Legacy function - uses hardcoded PHASE_TO_SKILL mapping.
+    Legacy function - only skills serving the phase in every command
+    (no command-specific skills, no section selectors).
 
     Args:
         phase: The phase name (router, semantic, execute, verify)
@@ -79,7 +226,7 @@ def read_phase_skill(phase: str) -> Optional[str]:
     Returns:
         Skill content without frontmatter, or None if not found
     """
-    skill_name = PHASE_TO_SKILL.get(phase)
+    skill_name = get_skill_for_phase(phase)
     return read_skill_content(skill_name)
 
 
@@ -87,17 +234,21 @@ def read_phase_skill_v2(phase: str, command: Optional[str] = None) -> Optional[s
     """Read skill content for a phase using injection_metadata.
 
     Uses the centralized injection_metadata for phase-to-skill mapping.
-    Supports command-specific phases (e.g., verify/discover vs health-check/discover).
+    Supports command-specific phases (e.g., verify/discover vs health-check/discover)
+    and section selectors.
 
     Args:
         phase: The phase name
         command: Optional command name for command-specific phases
 
     Returns:
-        Skill content without frontmatter, or None if not found
+        Selected skill content without frontmatter, or None if not found
     """
     skill_name = get_skill_for_phase(phase, command)
-    return read_skill_content(skill_name)
+    content = read_skill_content(skill_name)
+    if content is None:
+        return None
+    return select_skill_sections(content, phase, command, skill_name)
 
 
 def format_skill_tag(phase: str, content: str, command: Optional[str] = None) -> str:
@@ -119,7 +270,7 @@ def format_skill_tag(phase: str, content: str, command: Optional[str] = None) ->
 def get_phase_skill_injection(phase: str) -> Optional[str]:
     """Get formatted skill injection for a phase.
 
-    Legacy function - uses hardcoded PHASE_TO_SKILL mapping.
+    Legacy function - see read_phase_skill.
 
     Args:
         phase: The phase name
@@ -137,7 +288,8 @@ def get_phase_skill_injection_v2(phase: str, command: Optional[str] = None) -> O
     """Get formatted skill injection for a phase using injection_metadata.
 
     Uses the centralized injection_metadata for phase-to-skill mapping.
-    Supports command-specific phases.
+    Supports command-specific phases. Served from the precompiled skill
+    bundle when it is present and fresh, else built from the live files.
 
     Args:
         phase: The phase name
@@ -146,6 +298,9 @@ def get_phase_skill_injection_v2(phase: str, command: Optional[str] = None) -> O
     Returns:
         Formatted skill content in tag, or None if not found
     """
+    bundled = lookup_injection(phase, command)
+    if bundled is not None:
+        return bundled
     content = read_phase_skill_v2(phase, command)
     if content:
         return format_skill_tag(phase, content, command)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+State Mirror - Per-session copy of the daemon's workflow state.
+
+phase_hook only needs the gate fields (current_phase, phase_status,
+required_agent, allowed_next_phases) and stop_hook only the can-stop
+verdict. While a client's SSE feed (StatusStream, run by the resident
+hook worker) is connected, it writes every full state it sees (pushes,
+init and status responses) to a mirror file next to current.json, so
+those hooks can decide from one small read - without importing the
+client or making a round trip. With no feed connected nothing writes the
+file and the feed removes it when it drops, so readers fail one open()
+and go straight to the daemon.
+
+Only states pushed over /sse/events (source "sse") are trusted. A
+response to one of our own requests says nothing about changes the daemon
+made afterwards (MCP transitions, cancels), and a request racing a
+transition can re-mirror the phase it is leaving. Those records still
+bump the version, so they supersede older pushes, but readers ask the
+daemon instead of trusting them.
+
+FILES (under <workflows_root>/<session_id>/):
+- state.json       - {"version", "workflow_id", "written_at", "source",
+                      "state": {gate fields}, "can_stop": {...} | absent};
+                     an invalidated mirror keeps only its version; absent
+                     while no SSE feed is connected
+- state.json.lock  - Short lock serializing version bumps
+
+FRESHNESS - read() returns None (query the daemon) when the mirror:
+- is missing, or mirrors another workflow than current.json points at
+- was not written from the SSE feed (see TRUSTED_SOURCES)
+- is older than FORGE3_STATE_MIRROR_TTL seconds (default 10; 0 disables),
+  which bounds trust in a feed whose process died without dropping it
+- may be overtaken by events still waiting in the session's event spool
+
+The mirror is dropped whenever this side causes a state change the
+response does not fully describe (recorded events, transitions,
+phase_hook allowing mcp__workflow__workflow_transition) and whenever the
+SSE feed connects; it is removed when the feed disconnects. The can-stop
+verdict is stored with the version it was computed for, so any newer
+state write discards it.
+"""
+
+import contextlib
+import fcntl
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+from _config import atomic_write_json, get_workflows_root
+
+
+STATE_MIRROR_FILE = "state.json"
+DEFAULT_TTL = 10.0
+
+# Sources whose records reflect every daemon-side change as it happens
+TRUSTED_SOURCES = frozenset({"sse"})
+
+# WorkflowState fields the gate hooks decide from
+MIRROR_FIELDS = (
+    "workflow_id",
+    "command",
+    "current_phase",
+    "phase_status",
+    "required_agent",
+    "allowed_next_phases",
+    "is_dispatcher",
+    "session_id",
+)
+
+
+def mirror_ttl() -> float:
+    try:
+        return float(os.environ.get("FORGE3_STATE_MIRROR_TTL", DEFAULT_TTL))
+    except ValueError:
+        return DEFAULT_TTL
+
+
+def state_fields(state: Any) -> Dict[str, Any]:
+    """Gate fields of a WorkflowState (or a state dict)."""
+    if isinstance(state, dict):
+        return {name: state.get(name) for name in MIRROR_FIELDS}
+    return {name: getattr(state, name, None) for name in MIRROR_FIELDS}
+
+
+class StateMirror:
+    """Mirror file of one session."""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.session_dir = os.path.join(get_workflows_root(), session_id)
+        self.path = os.path.join(self.session_dir, STATE_MIRROR_FILE)
+        self.lock_path = self.path + ".lock"
+
+    @classmethod
+    def for_session(cls, session_id: Optional[str]) -> Optional["StateMirror"]:
+        """Mirror for a session; None without a session or with FORGE3_STATE_MIRROR=0."""
+        if not session_id or os.environ.get("FORGE3_STATE_MIRROR", "1") == "0":
+            return None
+        return cls(session_id)
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return record if isinstance(record, dict) else None
+
+    def _store(self, record: Dict[str, Any]):
+        atomic_write_json(self.path, record)
+
+    @contextlib.contextmanager
+    def _locked(self):
+        os.makedirs(self.session_dir, exist_ok=True)
+        with open(self.lock_path, "a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def read(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        """Fresh mirror record for workflow_id, or None if the daemon must be asked."""
+        ttl = mirror_ttl()
+        if ttl <= 0:
+            return None
+        record = self._load()
+        if record is None or record.get("workflow_id") != workflow_id or not isinstance(record.get("state"), dict):
+            return None
+        if record.get("source") not in TRUSTED_SOURCES:
+            return None
+        if time.time() - record.get("written_at", 0.0) > ttl:
+            return None
+        from event_spool import EventSpool
+
+        if EventSpool(self.session_dir).has_pending():
+            return None
+        return record
+
+    def version(self, workflow_id: str) -> Optional[int]:
+        """Version of the mirrored state of workflow_id, if any."""
+        record = self._load()
+        if record is None or record.get("workflow_id") != workflow_id:
+            return None
+        return record.get("version")
+
+    def write(self, state: Any, source: str):
+        """Mirror a full workflow state (best effort); bumps the version."""
+        fields = state_fields(state)
+        if not fields["workflow_id"]:
+            return
+        try:
+            with self._locked():
+                previous = self._load()
+                record = {
+                    "version": _next_version(previous),
+                    "workflow_id": fields["workflow_id"],
+                    "written_at": time.time(),
+                    "source": source,
+                    "state": fields,
+                }
+                self._store(record)
+        except OSError:
+            pass
+
+    def store_can_stop(self, workflow_id: str, version: int, can_stop: bool, reason: str):
+        """Attach a can-stop verdict computed while the mirror was at version."""
+        try:
+            with self._locked():
+                record = self._load()
+                if record is None or record.get("workflow_id") != workflow_id or record.get("version") != version:
+                    return
+                record["can_stop"] = {"version": version, "can_stop": can_stop, "reason": reason}
+                self._store(record)
+        except OSError:
+            pass
+
+    def invalidate(self):
+        """Drop the mirrored state; the next gate decision asks the daemon.
+
+        The version keeps counting, so a can-stop verdict still in flight
+        for the dropped state can never attach to a later one.
+        """
+        if not os.path.exists(self.path):
+            return
+        try:
+            with self._locked():
+                self._store({"version": _next_version(self._load()), "workflow_id": None, "written_at": time.time()})
+        except OSError:
+            pass
+
+    def remove(self):
+        """Delete the mirror: no trusted record can exist until the next push."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with self._locked():
+                os.unlink(self.path)
+        except OSError:
+            pass
+
+
+def _next_version(previous: Optional[Dict[str, Any]]) -> int:
+    """Version after previous; a recreated mirror starts from the clock in
+    milliseconds, past any version a verdict in flight was computed for."""
+    if previous is None:
+        return int(time.time() * 1000)
+    return previous.get("version", 0) + 1
+
+
+def read_state(session_id: str, workflow_id: str) -> Optional[Dict[str, Any]]:
+    """Fresh mirrored gate fields for the session's workflow, or None."""
+    mirror = StateMirror.for_session(session_id)
+    record = mirror.read(workflow_id) if mirror else None
+    return record["state"] if record else None
+
+
+def read_can_stop(session_id: str, workflow_id: str) -> Optional[Dict[str, Any]]:
+    """Fresh cached can-stop verdict ({"can_stop", "reason"}) for the current mirror version, or None."""
+    mirror = StateMirror.for_session(session_id)
+    record = mirror.read(workflow_id) if mirror else None
+    verdict = record.get("can_stop") if record else None
+    if not isinstance(verdict, dict) or verdict.get("version") != record.get("version"):
+        return None
+    return verdict
+
+
+def invalidate(session_id: str):
+    """Drop the session's mirror (no-op without a session)."""
+    mirror = StateMirror.for_session(session_id)
+    if mirror is not None:
+        mirror.invalidate()
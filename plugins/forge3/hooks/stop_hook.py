@@ -9,6 +9,9 @@ CRITICAL BEHAVIOR:
 - Check if workflow can be stopped via workflow daemon
 - BLOCK if workflow is incomplete
 - ALLOW if workflow is complete, cancelled, or no active workflow
+- A can-stop verdict cached in the state mirror for the current state
+  version is reused without a daemon round trip, as long as that state
+  was pushed over SSE (see state_mirror.py)
 
 Exit codes:
 - 0: Allow stop
@@ -19,11 +22,8 @@ import json
 import sys
 import os
 
-from control_client import WorkflowControlClient
-from _config import get_current_workflow_id
-
-
-client = WorkflowControlClient()
+from _config import get_client, get_current_workflow_id
+from telemetry import span
 
 
 def block_with_message(message: str):
@@ -44,18 +44,28 @@ def allow():
 def main():
     """Handle Stop event."""
     session_id = os.environ.get("CSC_SESSION_ID", "")
-    workflow_id = get_current_workflow_id(session_id)
+    with span("pointer"):
+        workflow_id = get_current_workflow_id(session_id)
     if not workflow_id:
         allow()
 
-    # Check with workflow daemon
-    result = client.can_stop(workflow_id)
+    # Imported past the no-workflow exit, like the client
+    import state_mirror
+
+    with span("mirror"):
+        verdict = state_mirror.read_can_stop(session_id, workflow_id)
+    if verdict is not None:
+        can_stop, reason = verdict["can_stop"], verdict["reason"]
+    else:
+        # Check with workflow daemon
+        result = get_client().can_stop(workflow_id)
+        can_stop, reason = result.can_stop, result.reason
 
-    if result.can_stop:
+    if can_stop:
         allow()
     else:
         block_with_message(
-            f"Cannot stop: {result.reason}\n\n"
+            f"Cannot stop: {reason}\n\n"
             "The workflow is incomplete. Please either:\n"
             "1. Complete the current phase by invoking the required agent and calling mcp__workflow__workflow_transition\n"
             "2. Cancel the workflow explicitly\n"
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Telemetry - Per-hook latency spans with a local metrics export.
+
+Enabled with FORGE3_TELEMETRY=1; otherwise every call here is a no-op.
+
+Each hook invocation collects spans in memory and writes them in one
+append when the hook finishes. The invocation is held in a context
+variable: work the hook runs under contextvars.copy_context() (e.g.
+announce_hook's event recorder thread) reports into it, while the resident worker's
+background threads (spool flusher, SSE subscriber) see no invocation and
+their spans are dropped instead of landing on whichever hook runs next.
+- hook   - the whole hook (begin() .. finish()), with its exit code
+- stage  - span("stdin"), span("pointer"), span("skill"), ...
+- rpc    - every WorkflowControlClient request: endpoint, outcome,
+           status code, bytes sent/received
+
+FILES (under <workflows_root>/.telemetry/):
+- spans.jsonl, spans.jsonl.1 .. .3  - JSON lines, rotated at MAX_SPAN_BYTES
+- histograms.json                   - cumulative latency buckets
+- forge3_hooks.prom                 - Prometheus textfile export, written when
+  FORGE3_TELEMETRY_PROM=1 (or FORGE3_TELEMETRY_PROM=<path> for a
+  node_exporter textfile collector directory)
+
+The export includes forge3_hook_timeout_seconds from hooks.json so p50/p99
+can be compared against each hook's timeout.
+"""
+
+import contextlib
+import contextvars
+import fcntl
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from _config import atomic_write, atomic_write_json, get_workflows_root
+from deadline import hook_timeouts
+
+
+TELEMETRY_DIR = ".telemetry"
+SPAN_FILE = "spans.jsonl"
+HISTOGRAM_FILE = "histograms.json"
+PROM_FILE = "forge3_hooks.prom"
+LOCK_FILE = "telemetry.lock"
+
+MAX_SPAN_BYTES = 5 * 1024 * 1024
+SPAN_BACKUPS = 3
+
+# Histogram bucket upper bounds in seconds (hooks.json timeouts are 5-10s)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Invocation:
+    """Spans of one hook invocation in progress."""
+
+    __slots__ = ("hook", "started", "spans")
+
+    def __init__(self, hook: str):
+        self.hook = hook
+        self.started = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+
+
+_invocation: "contextvars.ContextVar[Optional[_Invocation]]" = contextvars.ContextVar(
+    "forge3_telemetry_invocation", default=None
+)
+
+
+def enabled() -> bool:
+    return os.environ.get("FORGE3_TELEMETRY") == "1"
+
+
+def get_telemetry_dir() -> str:
+    return os.path.join(get_workflows_root(), TELEMETRY_DIR)
+
+
+def begin(hook: str):
+    """Start collecting spans for one hook invocation in the current context."""
+    _invocation.set(_Invocation(hook))
+
+
+def _add(kind: str, name: str, started: float, **attrs):
+    invocation = _invocation.get()
+    if invocation is None:
+        return  # not inside a hook (e.g. a worker background thread)
+    invocation.spans.append({
+        "ts": time.time(),
+        "hook": invocation.hook,
+        "kind": kind,
+        "name": name,
+        "ms": round((time.perf_counter() - started) * 1000, 3),
+        **attrs,
+    })
+
+
+@contextlib.contextmanager
+def _timed_stage(name: str, attrs: Dict[str, Any]):
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except SystemExit:
+        outcome = "exit"
+        raise
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        _add("stage", name, started, outcome=outcome, **attrs)
+
+
+def span(name: str, **attrs):
+    """Time a hook stage: `with span("pointer"): ...`."""
+    if not enabled():
+        return contextlib.nullcontext()
+    return _timed_stage(name, attrs)
+
+
+def record_rpc(
+    method: str,
+    endpoint: str,
+    started: float,
+    outcome: str,
+    status_code: Optional[int] = None,
+    bytes_sent: Optional[int] = None,
+    bytes_received: Optional[int] = None,
+):
+    """Record one daemon request (called by the control client)."""
+    if not enabled():
+        return
+    _add(
+        "rpc",
+        endpoint,
+        started,
+        method=method,
+        outcome=outcome,
+        status_code=status_code,
+        bytes_sent=bytes_sent,
+        bytes_received=bytes_received,
+    )
+
+
+def finish(exit_code: int = 0):
+    """Close the hook span and write the invocation's spans (best effort)."""
+    invocation = _invocation.get()
+    if not enabled() or invocation is None:
+        return
+    _add("hook", invocation.hook, invocation.started, exit_code=exit_code, session_id=os.environ.get("CSC_SESSION_ID", ""))
+    _invocation.set(None)
+    try:
+        _write(invocation.spans)
+    except (OSError, ValueError):
+        pass
+
+
+def _write(spans: List[Dict[str, Any]]):
+    directory = get_telemetry_dir()
+    os.makedirs(directory, exist_ok=True)
+    span_path = os.path.join(directory, SPAN_FILE)
+    payload = "".join(json.dumps(s, separators=(",", ":")) + "\n" for s in spans)
+
+    with open(os.path.join(directory, LOCK_FILE), "a") as lock:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        try:
+            _rotate(span_path)
+            with open(span_path, "a", encoding="utf-8") as f:
+                f.write(payload)
+            prom_target = os.environ.get("FORGE3_TELEMETRY_PROM", "")
+            if prom_target:
+                histograms = _update_histograms(directory, spans)
+                prom_path = os.path.join(directory, PROM_FILE) if prom_target == "1" else prom_target
+                if os.path.isdir(prom_path):
+                    prom_path = os.path.join(prom_path, PROM_FILE)
+                _write_prom(prom_path, histograms)
+        finally:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+
+def _rotate(span_path: str):
+    try:
+        if os.path.getsize(span_path) < MAX_SPAN_BYTES:
+            return
+    except OSError:
+        return
+    for index in range(SPAN_BACKUPS, 0, -1):
+        source = span_path if index == 1 else f"{span_path}.{index - 1}"
+        with contextlib.suppress(OSError):
+            os.replace(source, f"{span_path}.{index}")
+
+
+def _series_key(s: Dict[str, Any]) -> str:
+    """Histogram series: hook total, hook stage, or hook endpoint."""
+    return "\x1f".join((s["kind"], s["hook"] or "", s["name"]))
+
+
+def _update_histograms(directory: str, spans: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Fold spans into the cumulative bucket counts (caller holds the lock)."""
+    path = os.path.join(directory, HISTOGRAM_FILE)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            histograms = json.load(f)
+    except (OSError, ValueError):
+        histograms = {}
+
+    for s in spans:
+        series = histograms.setdefault(
+            _series_key(s), {"buckets": [0] * len(BUCKETS), "count": 0, "sum": 0.0, "outcomes": {}}
+        )
+        seconds = s["ms"] / 1000
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                series["buckets"][i] += 1
+        series["count"] += 1
+        series["sum"] += seconds
+        outcome = str(s.get("outcome") or s.get("exit_code", ""))
+        series["outcomes"][outcome] = series["outcomes"].get(outcome, 0) + 1
+
+    atomic_write_json(path, histograms)
+    return histograms
+
+
+_METRICS = {
+    "hook": ("forge3_hook_duration_seconds", "Hook invocation latency", "hook"),
+    "stage": ("forge3_hook_stage_duration_seconds", "Hook stage latency", "stage"),
+    "rpc": ("forge3_rpc_duration_seconds", "Workflow daemon request latency", "endpoint"),
+}
+
+
+def _write_prom(path: str, histograms: Dict[str, Dict[str, Any]]):
+    """Render histograms in the Prometheus text exposition format."""
+    lines: List[str] = []
+    for kind, (metric, help_text, label) in _METRICS.items():
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} histogram")
+        for key in sorted(histograms):
+            series_kind, hook, name = key.split("\x1f")
+            if series_kind != kind:
+                continue
+            series = histograms[key]
+            labels = f'hook="{hook}"' if kind == "hook" else f'hook="{hook}",{label}="{name}"'
+            for bound, count in zip(BUCKETS, series["buckets"]):
+                lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {series["count"]}')
+            lines.append(f"{metric}_sum{{{labels}}} {series['sum']:.6f}")
+            lines.append(f"{metric}_count{{{labels}}} {series['count']}")
+
+    lines.append("# HELP forge3_rpc_requests_total Workflow daemon requests by outcome")
+    lines.append("# TYPE forge3_rpc_requests_total counter")
+    for key in sorted(histograms):
+        series_kind, hook, name = key.split("\x1f")
+        if series_kind != "rpc":
+            continue
+        for outcome, count in sorted(histograms[key]["outcomes"].items()):
+            lines.append(f'forge3_rpc_requests_total{{hook="{hook}",endpoint="{name}",outcome="{outcome}"}} {count}')
+
+    lines.append("# HELP forge3_hook_timeout_seconds Hook timeout configured in hooks.json")
+    lines.append("# TYPE forge3_hook_timeout_seconds gauge")
+    for hook, timeout in sorted(hook_timeouts().items()):
+        lines.append(f'forge3_hook_timeout_seconds{{hook="{hook}"}} {timeout}')
+
+    atomic_write(path, "\n".join(lines) + "\n")
@@ -10,6 +10,11 @@ CRITICAL BEHAVIOR:
 - Daemon resolves workflow policy internally
 - Exit 0 immediately (NO waiting!)
 - Returns instruction for Claude to invoke required agent
+- Skill content already injected this session is sent as a short
+  reference tag (see injection_ledger.py)
+- A phase whose skill declares `discovery:` gets the component
+  inventory with the skill (see discovery.py)
+- Skill injection is skipped when the hook deadline is close (see deadline.py)
 
 DESIGN PRINCIPLE:
 - Daemon owns ALL workflow policy (SSOT)
@@ -21,11 +26,14 @@ import json
 import sys
 import os
 import re
-import subprocess
 from typing import Optional
 
-from control_client import WorkflowControlClient
+from _config import get_client
 from skill_loader import get_phase_skill_injection_v2
+from injection_ledger import dedupe_injection
+from workspace import resolve_workspace_root
+from telemetry import span
+import deadline
 
 
 # Commands that trigger workflow initialization
@@ -42,35 +50,6 @@ def block_with_message(message: str):
     sys.exit(2)
 
 
-def _git_toplevel(path: str) -> Optional[str]:
-    """Get git repository root."""
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            cwd=path,
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-    except Exception:
-        return None
-
-    if result.returncode != 0:
-        return None
-    return result.stdout.strip() or None
-
-
-def resolve_workspace_root() -> str:
-    """Resolve workspace root from environment or git."""
-    env_root = os.environ.get("WORKFLOW_WORKSPACE_ROOT")
-    if env_root:
-        return os.path.abspath(os.path.expanduser(env_root))
-
-    cwd = os.path.abspath(os.getcwd())
-    git_root = _git_toplevel(cwd)
-    return git_root if git_root else cwd
-
-
 def parse_command(prompt: str) -> tuple[Optional[str], str]:
     """Parse command and task from prompt.
 
@@ -113,7 +92,8 @@ def main():
     """Handle UserPromptSubmit event."""
     try:
         # Read hook input from stdin
-        input_data = json.load(sys.stdin)
+        with span("stdin"):
+            input_data = json.load(sys.stdin)
     except (json.JSONDecodeError, EOFError):
         # No input or invalid JSON - pass through
         sys.exit(0)
@@ -133,15 +113,15 @@ def main():
             "Workflow init failed: CSC_SESSION_ID is required. "
             "Start a supervised session (csc) before running /assist:wizard, /assist:plan, /assist:create, /assist:verify, or /assist:health-check."
         )
-    workspace_root = resolve_workspace_root()
+    with span("workspace"):
+        workspace_root = resolve_workspace_root(session_id)
     
     if not os.path.isdir(workspace_root):
         block_with_message(f"Workflow init failed: invalid workspace_root {workspace_root}")
 
     # Initialize workflow via daemon
     # CRITICAL: Send ONLY command name - daemon resolves policy
-    client = WorkflowControlClient()
-    state = client.init_workflow(
+    state = get_client().init_workflow(
         command=command,
         session_id=session_id,
         workspace_root=workspace_root,
@@ -153,11 +133,29 @@ def main():
     )
 
     if state:
-        # Get skill content for current phase
-        skill_injection = get_phase_skill_injection_v2(
-            phase=state.current_phase,
-            command=state.command,
-        ) or ""
+        skill_injection = ""
+        if deadline.allows():
+            with span("skill"):
+                # Get skill content for current phase
+                skill_injection = get_phase_skill_injection_v2(
+                    phase=state.current_phase,
+                    command=state.command,
+                ) or ""
+                # Full text only the first time this session (or after compaction)
+                skill_injection = dedupe_injection(session_id, state.current_phase, state.command, skill_injection)
+            with span("discovery"):
+                # Phases whose skill declares `discovery:` get a ready-made inventory
+                from discovery import discovery_injection
+                discovery_report = discovery_injection(state.command, state.current_phase, session_id, workspace_root)
+                if discovery_report:
+                    skill_injection = f"{discovery_report}\n\n{skill_injection}"
+                    sys.stderr.write(f"Discovery report: {len(discovery_report.encode('utf-8'))} bytes\n")
+            sys.stderr.write(
+                f"Skill injection: {len(skill_injection.encode('utf-8'))} bytes "
+                f"({state.command}/{state.current_phase})\n"
+            )
+        else:
+            sys.stderr.write("Skill injection skipped: hook deadline close\n")
 
         # Build response based on workflow type
         if state.is_dispatcher:
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Workflow Types - Slotted daemon response types decoded from the wire.
+
+WorkflowState, TransitionResult and CanStopResult are slotted classes.
+decode_workflow_state / decode_transition_result / decode_can_stop_result
+build them straight from the response body (JSON or msgpack bytes):
+
+- With msgspec installed, a per-type schema decodes the bytes directly;
+  unknown fields are skipped without being materialized, and the
+  daemon's `metadata` (which grows with evidence history) is kept as raw
+  bytes until WorkflowState.metadata is first read.
+- Without msgspec (or if a response does not match the schema) the body
+  is parsed with json/msgpack and copied field by field, as before.
+
+from_dict() remains for states that arrive already parsed (SSE events).
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+class WorkflowState:
+    """Workflow state returned by daemon."""
+
+    __slots__ = (
+        "workflow_id",
+        "command",                # "assist:wizard", "assist:plan", "assist:create", "assist:verify", "assist:health-check"
+        "workflow_type",          # "dispatch", "plan", "create", "verify", "health"
+        "phases",                 # From daemon policy
+        "final_phase",            # "schema-check" or None for dispatcher
+        "current_phase",
+        "phase_status",           # "agent_required", "agent_running", "agent_complete"
+        "allowed_next_phases",    # Valid next phases from current
+        "is_dispatcher",          # True for /assist
+        "session_id",
+        "required_agent",         # Agent required for current phase
+        "prompt",
+        "_metadata",              # Decoded metadata, or None until first access
+        "_metadata_raw",          # (raw bytes, "json" | "msgpack") pending decode
+    )
+
+    def __init__(
+        self,
+        workflow_id: str,
+        command: str,
+        workflow_type: str,
+        phases: List[str],
+        final_phase: Optional[str],
+        current_phase: str,
+        phase_status: str,
+        allowed_next_phases: List[str],
+        is_dispatcher: bool,
+        session_id: Optional[str],
+        required_agent: Optional[str],
+        prompt: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        self.workflow_id = workflow_id
+        self.command = command
+        self.workflow_type = workflow_type
+        self.phases = phases
+        self.final_phase = final_phase
+        self.current_phase = current_phase
+        self.phase_status = phase_status
+        self.allowed_next_phases = allowed_next_phases
+        self.is_dispatcher = is_dispatcher
+        self.session_id = session_id
+        self.required_agent = required_agent
+        self.prompt = prompt
+        self._metadata = metadata if metadata is not None else {}
+        self._metadata_raw = None
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Workflow metadata, decoded on first access."""
+        if self._metadata is None:
+            raw, encoding = self._metadata_raw
+            value = msgspec.msgpack.decode(raw) if encoding == "msgpack" else msgspec.json.decode(raw)
+            self._metadata = value if isinstance(value, dict) else {}
+            self._metadata_raw = None
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: Dict[str, Any]):
+        self._metadata = value
+        self._metadata_raw = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WorkflowState":
+        """Create WorkflowState from dict response."""
+        return cls(
+            workflow_id=data.get("workflow_id", ""),
+            command=data.get("command", ""),
+            workflow_type=data.get("workflow_type", ""),
+            phases=data.get("phases", []),
+            final_phase=data.get("final_phase"),
+            current_phase=data.get("current_phase", ""),
+            phase_status=data.get("phase_status", ""),
+            allowed_next_phases=data.get("allowed_next_phases", []),
+            is_dispatcher=data.get("is_dispatcher", False),
+            session_id=data.get("session_id"),
+            required_agent=data.get("required_agent"),
+            prompt=data.get("prompt"),
+            metadata=data.get("metadata") or {},
+        )
+
+    def _fields(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__[:-2]) + (self.metadata,)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, WorkflowState):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __repr__(self) -> str:
+        return (
+            f"WorkflowState(workflow_id={self.workflow_id!r}, command={self.command!r}, "
+            f"current_phase={self.current_phase!r}, phase_status={self.phase_status!r})"
+        )
+
+
+class TransitionResult:
+    """Result of a phase transition."""
+
+    __slots__ = ("success", "message", "new_phase", "new_status", "missing_conditions")
+
+    def __init__(
+        self,
+        success: bool,
+        message: str,
+        new_phase: Optional[str],
+        new_status: Optional[str],
+        missing_conditions: List[str],
+    ):
+        self.success = success
+        self.message = message
+        self.new_phase = new_phase
+        self.new_status = new_status
+        self.missing_conditions = missing_conditions
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TransitionResult":
+        return cls(
+            success=data.get("success", False),
+            message=data.get("message", ""),
+            new_phase=data.get("new_phase"),
+            new_status=data.get("new_status"),
+            missing_conditions=data.get("missing_conditions", []),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TransitionResult):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"TransitionResult(success={self.success!r}, message={self.message!r}, new_phase={self.new_phase!r})"
+
+
+class CanStopResult:
+    """Result of can-stop check."""
+
+    __slots__ = ("can_stop", "reason")
+
+    def __init__(self, can_stop: bool, reason: str):
+        self.can_stop = can_stop
+        self.reason = reason
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CanStopResult":
+        return cls(
+            can_stop=data.get("can_stop", True),
+            reason=data.get("reason", ""),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CanStopResult):
+            return NotImplemented
+        return (self.can_stop, self.reason) == (other.can_stop, other.reason)
+
+    def __repr__(self) -> str:
+        return f"CanStopResult(can_stop={self.can_stop!r}, reason={self.reason!r})"
+
+
+if msgspec is not None:
+    class _WorkflowStateSchema(msgspec.Struct):
+        workflow_id: str = ""
+        command: str = ""
+        workflow_type: str = ""
+        phases: List[str] = []
+        final_phase: Optional[str] = None
+        current_phase: str = ""
+        phase_status: str = ""
+        allowed_next_phases: List[str] = []
+        is_dispatcher: bool = False
+        session_id: Optional[str] = None
+        required_agent: Optional[str] = None
+        prompt: Optional[str] = None
+        metadata: msgspec.Raw = msgspec.Raw()
+
+    class _TransitionResultSchema(msgspec.Struct):
+        success: bool = False
+        message: str = ""
+        new_phase: Optional[str] = None
+        new_status: Optional[str] = None
+        missing_conditions: List[str] = []
+
+    class _CanStopResultSchema(msgspec.Struct):
+        can_stop: bool = True
+        reason: str = ""
+
+    _DECODERS = {
+        (schema, encoding): (msgspec.msgpack.Decoder(schema) if encoding == "msgpack" else msgspec.json.Decoder(schema))
+        for schema in (_WorkflowStateSchema, _TransitionResultSchema, _CanStopResultSchema)
+        for encoding in ("json", "msgpack")
+    }
+
+
+def _parse(content: bytes, encoding: str) -> Dict[str, Any]:
+    """Generic parse (no msgspec, or a body outside the schema)."""
+    if encoding == "msgpack":
+        import msgpack
+
+        data = msgpack.unpackb(content, raw=False)
+    else:
+        data = json.loads(content)
+    return data if isinstance(data, dict) else {}
+
+
+def _decode_schema(schema: Any, content: bytes, encoding: str) -> Optional[Any]:
+    try:
+        return _DECODERS[(schema, encoding)].decode(content)
+    except (msgspec.ValidationError, msgspec.DecodeError):
+        return None
+
+
+def decode_workflow_state(content: bytes, encoding: str = "json") -> WorkflowState:
+    """Decode a /workflow/status or /workflow/init body.
+
+    Args:
+        content: Response body bytes
+        encoding: "json" or "msgpack"
+    """
+    if msgspec is not None:
+        wire = _decode_schema(_WorkflowStateSchema, content, encoding)
+        if wire is not None:
+            state = WorkflowState(
+                workflow_id=wire.workflow_id,
+                command=wire.command,
+                workflow_type=wire.workflow_type,
+                phases=wire.phases,
+                final_phase=wire.final_phase,
+                current_phase=wire.current_phase,
+                phase_status=wire.phase_status,
+                allowed_next_phases=wire.allowed_next_phases,
+                is_dispatcher=wire.is_dispatcher,
+                session_id=wire.session_id,
+                required_agent=wire.required_agent,
+                prompt=wire.prompt,
+            )
+            if len(wire.metadata):
+                state._metadata = None
+                state._metadata_raw = (bytes(wire.metadata), encoding)
+            return state
+    return WorkflowState.from_dict(_parse(content, encoding))
+
+
+def decode_transition_result(content: bytes, encoding: str = "json") -> TransitionResult:
+    """Decode a /workflow/transition body."""
+    if msgspec is not None:
+        wire = _decode_schema(_TransitionResultSchema, content, encoding)
+        if wire is not None:
+            return TransitionResult(
+                wire.success, wire.message, wire.new_phase, wire.new_status, wire.missing_conditions
+            )
+    return TransitionResult.from_dict(_parse(content, encoding))
+
+
+def decode_can_stop_result(content: bytes, encoding: str = "json") -> CanStopResult:
+    """Decode a /workflow/can-stop body."""
+    if msgspec is not None:
+        wire = _decode_schema(_CanStopResultSchema, content, encoding)
+        if wire is not None:
+            return CanStopResult(wire.can_stop, wire.reason)
+    return CanStopResult.from_dict(_parse(content, encoding))
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Workspace - Resolve the workspace root without spawning git.
+
+Equivalent to `git rev-parse --show-toplevel` for the common layouts:
+walk up from the working directory to the first directory holding a
+`.git` entry, which is either a repository directory or a `gitdir:` file
+(linked worktrees, submodules). Falls back to the working directory.
+
+CACHE (under <workflows_root>/<session_id>/):
+- workspace.json - {"<cwd>": "<workspace_root>"}
+
+A cached root is reused while its `.git` entry still exists.
+"""
+
+import json
+import os
+from typing import Dict, Optional
+
+from _config import atomic_write_json, get_workflows_root
+
+
+WORKSPACE_CACHE_FILE = "workspace.json"
+
+# cwd -> workspace root, for this process
+_roots: Dict[str, str] = {}
+
+
+def _is_git_marker(path: str) -> bool:
+    """True if path is a repository .git dir or a valid `gitdir:` file."""
+    if os.path.isdir(path):
+        return os.path.exists(os.path.join(path, "HEAD"))
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            line = f.readline(4096).strip()
+    except (OSError, UnicodeDecodeError):
+        return False
+    if not line.startswith("gitdir:"):
+        return False
+    gitdir = line[len("gitdir:"):].strip()
+    if not os.path.isabs(gitdir):
+        gitdir = os.path.join(os.path.dirname(path), gitdir)
+    return os.path.isdir(gitdir)
+
+
+def find_git_toplevel(path: str) -> Optional[str]:
+    """Nearest ancestor of path (inclusive) that is a git working tree root.
+
+    Args:
+        path: Absolute directory to start from
+
+    Returns:
+        Working tree root, or None outside a repository
+    """
+    work_tree = os.environ.get("GIT_WORK_TREE")
+    if work_tree:
+        return os.path.abspath(os.path.expanduser(work_tree))
+
+    current = os.path.realpath(path)
+    while True:
+        if _is_git_marker(os.path.join(current, ".git")):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def _cache_path(session_id: str) -> str:
+    return os.path.join(get_workflows_root(), session_id, WORKSPACE_CACHE_FILE)
+
+
+def _load_cache(session_id: str) -> Dict[str, str]:
+    try:
+        with open(_cache_path(session_id), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_cache(session_id: str, cache: Dict[str, str]):
+    try:
+        atomic_write_json(_cache_path(session_id), cache)
+    except OSError:
+        pass
+
+
+def _still_valid(cwd: str, root: str) -> bool:
+    """A cached root holds while it contains cwd and keeps its .git entry.
+
+    The non-git fallback (root == cwd without .git) is always re-resolved.
+    """
+    contains = root == cwd or cwd.startswith(root.rstrip(os.sep) + os.sep)
+    return contains and os.path.exists(os.path.join(root, ".git"))
+
+
+def resolve_workspace_root(session_id: Optional[str] = None) -> str:
+    """Resolve workspace root from environment or the enclosing git repository.
+
+    Args:
+        session_id: Session whose cache to use (defaults to CSC_SESSION_ID)
+
+    Returns:
+        Absolute workspace root; the working directory outside a repository
+    """
+    env_root = os.environ.get("WORKFLOW_WORKSPACE_ROOT")
+    if env_root:
+        return os.path.abspath(os.path.expanduser(env_root))
+
+    cwd = os.path.abspath(os.getcwd())
+    root = _roots.get(cwd)
+    if root is not None and _still_valid(cwd, root):
+        return root
+
+    session_id = session_id if session_id is not None else os.environ.get("CSC_SESSION_ID", "")
+    cache = _load_cache(session_id) if session_id else {}
+    root = cache.get(cwd)
+    if root is None or not _still_valid(cwd, root):
+        root = find_git_toplevel(cwd) or cwd
+        if session_id and cache.get(cwd) != root:
+            cache[cwd] = root
+            _save_cache(session_id, cache)
+
+    _roots[cwd] = root
+    return root
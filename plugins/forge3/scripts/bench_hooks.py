@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Hook Benchmark - Latency, memory and daemon round trips per hook event.
+
+Drives the hooks.json entry points (hook_shim.py <hook>) with realistic
+stdin payloads against the local daemon stand-in (standin_daemon.py), in
+two modes:
+
+- cold - no resident worker; every event is a fresh interpreter that runs
+         the hook in-process (the default install)
+- warm - events are forwarded to a resident hook_worker.py for the session
+
+SCENARIOS:
+- no-workflow        - Session without current.json (the common fast path)
+- agent_required     - /assist:create starts; PreToolUse Task for the required
+                       agent; Stop is blocked
+- agent_complete     - SubagentStop of the phase agent; PreToolUse
+                       mcp__workflow__workflow_transition; Stop
+- wizard-auto-chain  - SubagentStop of the router recommending /assist:create,
+                       which starts the routed workflow
+
+Per (scenario, hook, mode) it reports wall latency percentiles, peak RSS
+of the hook process (plus the worker's RSS in warm mode) and daemon
+requests per event.
+
+Usage:
+    python3 scripts/bench_hooks.py                         # print a table
+    python3 scripts/bench_hooks.py --save bench_baseline.json
+    python3 scripts/bench_hooks.py --compare bench_baseline.json
+    python3 scripts/bench_hooks.py --scenario no-workflow --mode cold -n 50
+    python3 scripts/bench_hooks.py --daemon-latency 20 --status-stream
+
+--compare exits 1 if any p50 regressed by more than --threshold percent.
+"""
+
+import argparse
+import json
+import os
+import platform
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from standin_daemon import Fault, StandInDaemon
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PLUGIN_ROOT = SCRIPTS_DIR.parent
+HOOKS_DIR = PLUGIN_ROOT / "hooks"
+SHIM = HOOKS_DIR / "hook_shim.py"
+WORKER = HOOKS_DIR / "hook_worker.py"
+
+MODES = ("cold", "warm")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def run_event(hook: str, payload: Dict[str, Any], env: Dict[str, str], cwd: str) -> Tuple[float, int, int]:
+    """Run one hook event through hook_shim.py.
+
+    Returns:
+        (wall_ms, exit_code, peak_rss_kb)
+    """
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        started = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, str(SHIM), hook],
+            stdin=subprocess.PIPE,
+            stdout=out,
+            stderr=err,
+            env=env,
+            cwd=cwd,
+        )
+        proc.stdin.write(json.dumps(payload).encode("utf-8"))
+        proc.stdin.close()
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall_ms = (time.perf_counter() - started) * 1000
+        proc.returncode = os.waitstatus_to_exitcode(status)
+    return wall_ms, proc.returncode, usage.ru_maxrss
+
+
+def process_rss_kb(pid: int) -> int:
+    """Current resident set size of a process (Linux /proc)."""
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def start_worker(session_id: str, env: Dict[str, str], cwd: str) -> subprocess.Popen:
+    """Start a resident worker and wait until its socket accepts events."""
+    sys.path.insert(0, str(HOOKS_DIR))
+    from _config import get_worker_socket_path
+
+    saved = os.environ.get("WORKFLOW_ENGINE_WORKFLOWS_DIR")
+    os.environ["WORKFLOW_ENGINE_WORKFLOWS_DIR"] = env["WORKFLOW_ENGINE_WORKFLOWS_DIR"]
+    try:
+        socket_path = get_worker_socket_path(session_id)
+    finally:
+        if saved is None:
+            os.environ.pop("WORKFLOW_ENGINE_WORKFLOWS_DIR", None)
+        else:
+            os.environ["WORKFLOW_ENGINE_WORKFLOWS_DIR"] = saved
+
+    proc = subprocess.Popen(
+        [sys.executable, str(WORKER), "--session", session_id, "--idle-timeout", "600"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env=env,
+        cwd=cwd,
+    )
+    deadline = time.monotonic() + 10
+    while not os.path.exists(socket_path):
+        if proc.poll() is not None or time.monotonic() > deadline:
+            raise RuntimeError("hook worker did not start")
+        time.sleep(0.01)
+    return proc
+
+
+def stop_worker(proc: subprocess.Popen):
+    proc.send_signal(signal.SIGTERM)
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+# Scenario: list of (hook, setup) where setup(standin, session_id) -> payload
+Event = Tuple[str, Callable[[StandInDaemon, str], Dict[str, Any]]]
+
+
+def _no_workflow(payload: Dict[str, Any]):
+    def setup(standin: StandInDaemon, session_id: str) -> Dict[str, Any]:
+        (standin.workflows_root / session_id / "current.json").unlink(missing_ok=True)
+        return payload
+    return setup
+
+
+def _with_workflow(command: str, phase_status: str, payload: Callable[[Dict[str, Any]], Dict[str, Any]]):
+    def setup(standin: StandInDaemon, session_id: str) -> Dict[str, Any]:
+        state = standin.start_workflow(command, session_id, task="create a hello skill", phase_status=phase_status)
+        return payload(state)
+    return setup
+
+
+ROUTER_OUTPUT = (
+    "Intent: create_skill\nConfidence: high\n"
+    "Recommended command: /assist:create a hello skill\n"
+)
+
+SCENARIOS: Dict[str, List[Event]] = {
+    "no-workflow": [
+        ("workflow_hook", _no_workflow({"prompt": "explain this repository"})),
+        ("phase_hook", _no_workflow({"tool_name": "Task", "tool_input": {"subagent_type": "forge3:router-agent"}})),
+        ("announce_hook", _no_workflow({"subagent_type": "forge3:router-agent", "tool_output": "done"})),
+        ("stop_hook", _no_workflow({})),
+    ],
+    "agent_required": [
+        ("workflow_hook", _no_workflow({"prompt": "/assist:create a hello skill"})),
+        ("phase_hook", _with_workflow("assist:create", "agent_required", lambda s: {
+            "tool_name": "Task",
+            "tool_input": {"subagent_type": f"forge3:{s['required_agent']}", "prompt": "discover"},
+        })),
+        ("stop_hook", _with_workflow("assist:create", "agent_required", lambda s: {})),
+    ],
+    "agent_complete": [
+        ("announce_hook", _with_workflow("assist:create", "agent_running", lambda s: {
+            "subagent_type": f"forge3:{s['required_agent']}",
+            "tool_output": "DISCOVERY_REPORT\nplugin_path: plugins/demo\n",
+        })),
+        ("phase_hook", _with_workflow("assist:create", "agent_complete", lambda s: {
+            "tool_name": "mcp__workflow__workflow_transition",
+            "tool_input": {"from_phase": s["current_phase"], "to_phase": s["allowed_next_phases"][0]},
+        })),
+        ("stop_hook", _with_workflow("assist:create", "agent_complete", lambda s: {})),
+    ],
+    "wizard-auto-chain": [
+        ("announce_hook", _with_workflow("assist:wizard", "agent_running", lambda s: {
+            "subagent_type": "forge3:router-agent",
+            "tool_output": ROUTER_OUTPUT,
+        })),
+    ],
+}
+
+
+def bench_mode(
+    mode: str,
+    scenarios: List[str],
+    iterations: int,
+    warmup: int,
+    standin: StandInDaemon,
+    env: Dict[str, str],
+    workspace: str,
+) -> Dict[str, Dict[str, Any]]:
+    """Benchmark every event of the selected scenarios in one mode."""
+    session_id = f"bench-{mode}-{uuid.uuid4().hex[:8]}"
+    env = dict(env, CSC_SESSION_ID=session_id)
+    worker = start_worker(session_id, env, workspace) if mode == "warm" else None
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        for scenario in scenarios:
+            for hook, setup in SCENARIOS[scenario]:
+                wall, rss, trips, exits = [], [], [], {}
+                for i in range(warmup + iterations):
+                    payload = setup(standin, session_id)
+                    before = standin.requests
+                    wall_ms, exit_code, rss_kb = run_event(hook, payload, env, workspace)
+                    if i < warmup:
+                        continue
+                    wall.append(wall_ms)
+                    rss.append(rss_kb)
+                    trips.append(standin.requests - before)
+                    exits[str(exit_code)] = exits.get(str(exit_code), 0) + 1
+                results[f"{scenario}/{hook}/{mode}"] = {
+                    "scenario": scenario,
+                    "hook": hook,
+                    "mode": mode,
+                    "iterations": iterations,
+                    "p50_ms": round(percentile(wall, 50), 2),
+                    "p90_ms": round(percentile(wall, 90), 2),
+                    "p99_ms": round(percentile(wall, 99), 2),
+                    "mean_ms": round(sum(wall) / len(wall), 2),
+                    "max_rss_kb": max(rss),
+                    "worker_rss_kb": process_rss_kb(worker.pid) if worker else 0,
+                    "round_trips": round(sum(trips) / len(trips), 2),
+                    "exit_codes": exits,
+                }
+    finally:
+        if worker is not None:
+            stop_worker(worker)
+    return results
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """p50 regressions beyond threshold percent against a saved baseline."""
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get("results", {}).get(key)
+        if not base or not base.get("p50_ms"):
+            continue
+        change = (result["p50_ms"] - base["p50_ms"]) / base["p50_ms"] * 100
+        result["p50_change_pct"] = round(change, 1)
+        if change > threshold:
+            regressions.append(f"{key}: p50 {base['p50_ms']}ms -> {result['p50_ms']}ms (+{change:.1f}%)")
+    return regressions
+
+
+def print_table(results: Dict[str, Dict[str, Any]]):
+    header = f"{'scenario/hook/mode':42} {'p50':>8} {'p90':>8} {'p99':>8} {'rss MB':>7} {'worker MB':>9} {'trips':>6} {'Δp50':>7}"
+    print(header)
+    print("-" * len(header))
+    for key, r in results.items():
+        change = r.get("p50_change_pct")
+        print(
+            f"{key:42} {r['p50_ms']:7.1f}ms {r['p90_ms']:6.1f}ms {r['p99_ms']:6.1f}ms "
+            f"{r['max_rss_kb'] / 1024:7.1f} {r['worker_rss_kb'] / 1024:9.1f} {r['round_trips']:6.1f} "
+            f"{'' if change is None else f'{change:+.1f}%':>7}"
+        )
+
+
+def main():
+    """Run the hook benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark forge3 hook entry points")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Repeatable; default all")
+    parser.add_argument("--mode", action="append", choices=MODES, help="Repeatable; default cold and warm")
+    parser.add_argument("-n", "--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--save", metavar="PATH", help="Write results as a baseline JSON")
+    parser.add_argument("--compare", metavar="PATH", help="Compare p50 against a baseline JSON")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Regression threshold in percent")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--daemon-latency", type=float, default=0.0, metavar="MS",
+                        help="Latency the stand-in adds to every request")
+    parser.add_argument("--status-stream", action="store_true",
+                        help="Let warm workers follow /sse/events (round trips then depend on timing)")
+    args = parser.parse_args()
+
+    scenarios = args.scenario or list(SCENARIOS)
+    modes = args.mode or list(MODES)
+
+    with tempfile.TemporaryDirectory(prefix="forge3-bench-") as tmp:
+        workflows_root = Path(tmp) / "workflows"
+        workspace = Path(tmp) / "workspace"
+        workspace.mkdir(parents=True)
+        faults = {"*": Fault(latency_ms=args.daemon_latency)} if args.daemon_latency else {}
+        standin = StandInDaemon(workflows_root, faults=faults).start()
+
+        env = dict(os.environ)
+        for key in ("WORKFLOW_ENGINE_SOCKET", "WORKFLOW_ENGINE_HOST", "WORKFLOW_ENGINE_PORT",
+                    "FORGE3_HOOK_WORKER", "FORGE3_TELEMETRY", "WORKFLOW_WORKSPACE_ROOT"):
+            env.pop(key, None)
+        env.update({
+            "WORKFLOW_ENGINE_URL": standin.url,
+            "WORKFLOW_ENGINE_WORKFLOWS_DIR": str(workflows_root),
+            "CLAUDE_PLUGIN_ROOT": str(PLUGIN_ROOT),
+            # Deterministic round trips: deliver events inline, poll status
+            "FORGE3_EVENT_SPOOL": "0",
+            "FORGE3_STATUS_STREAM": "1" if args.status_stream else "0",
+        })
+
+        results: Dict[str, Dict[str, Any]] = {}
+        try:
+            for mode in modes:
+                results.update(bench_mode(mode, scenarios, args.iterations, args.warmup, standin, env, str(workspace)))
+        finally:
+            standin.close()
+
+    regressions: List[str] = []
+    if args.compare:
+        regressions = compare(results, json.loads(Path(args.compare).read_text()), args.threshold)
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "iterations": args.iterations,
+        "daemon_latency_ms": args.daemon_latency,
+        "daemon": standin.stats(),
+        "results": results,
+    }
+    if args.save:
+        Path(args.save).write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.json:
+        print(json.dumps(dict(report, regressions=regressions), indent=2))
+    else:
+        print_table(results)
+        for regression in regressions:
+            print(f"  - REGRESSION {regression}")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Import Budget Check - Guard the no-workflow fast path of every hook.
+
+Runs each hooks.json entry point (hook_shim.py <hook>) under
+`python3 -X importtime` with a payload for a session that has no active
+workflow, then checks two things per hook:
+
+- No forbidden module (httpx, workflowd, control_client) was imported
+- Import time attributable to the hook stays within its budget
+
+Import time is the sum of per-module self time for modules that a bare
+`python3 -c pass` does not already import, so interpreter start-up and
+site-packages .pth processing are excluded.
+
+Usage:
+    python3 scripts/check_import_budget.py            # check, exit 1 on failure
+    python3 scripts/check_import_budget.py --json     # machine-readable report
+
+Budgets live in scripts/import_budget.json.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PLUGIN_ROOT = SCRIPTS_DIR.parent
+HOOKS_DIR = PLUGIN_ROOT / "hooks"
+BUDGET_PATH = SCRIPTS_DIR / "import_budget.json"
+
+# Representative no-workflow payloads per hook
+PAYLOADS: Dict[str, dict] = {
+    "workflow_hook": {"prompt": "explain this repository"},
+    "phase_hook": {"tool_name": "Task", "tool_input": {"subagent_type": "forge3:router-agent"}},
+    "announce_hook": {"subagent_type": "forge3:router-agent", "tool_output": "done"},
+    "stop_hook": {},
+    "compact_hook": {"trigger": "auto"},
+    "session_hook": {"source": "clear"},
+}
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Parse `-X importtime` output into {module: self_us}."""
+    modules: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0].strip())
+        except ValueError:
+            continue  # header row
+        modules[parts[2].strip()] = self_us
+    return modules
+
+
+def run_importtime(argv: List[str], payload: str, env: Dict[str, str]) -> Tuple[int, Dict[str, int]]:
+    """Run a command under -X importtime and return (exit_code, modules)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv],
+        input=payload,
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=str(PLUGIN_ROOT),
+        check=False,
+    )
+    return proc.returncode, parse_importtime(proc.stderr)
+
+
+def measure(hook: str, env: Dict[str, str], baseline: Dict[str, int]) -> dict:
+    """Measure one hook's fast path, best of three runs."""
+    payload = json.dumps(PAYLOADS[hook])
+    best = None
+    for _ in range(3):
+        exit_code, modules = run_importtime([str(HOOKS_DIR / "hook_shim.py"), hook], payload, env)
+        own = {name: us for name, us in modules.items() if name not in baseline}
+        total_us = sum(own.values())
+        if best is None or total_us < best["import_us"]:
+            best = {"exit_code": exit_code, "import_us": total_us, "modules": sorted(own)}
+    return best
+
+
+def main():
+    """Check every hook against its import budget."""
+    as_json = "--json" in sys.argv[1:]
+    budgets = json.loads(BUDGET_PATH.read_text())
+
+    with tempfile.TemporaryDirectory(prefix="forge3-budget-") as workflows_root:
+        env = dict(os.environ)
+        for key in ("WORKFLOW_ENGINE_URL", "WORKFLOW_ENGINE_HOST", "WORKFLOW_ENGINE_PORT", "FORGE3_HOOK_WORKER"):
+            env.pop(key, None)
+        env["WORKFLOW_ENGINE_WORKFLOWS_DIR"] = workflows_root
+        env["CSC_SESSION_ID"] = "import-budget-session"
+        env["CLAUDE_PLUGIN_ROOT"] = str(PLUGIN_ROOT)
+
+        _, baseline = run_importtime(["-c", "pass"], "", env)
+
+        report = {}
+        failures = []
+        for hook, budget in budgets["hooks"].items():
+            result = measure(hook, env, baseline)
+            forbidden = [
+                name for name in result["modules"]
+                if name.split(".")[0] in budgets["forbidden_modules"]
+            ]
+            max_us = int(budget["max_import_ms"] * 1000)
+            result.update({"max_import_us": max_us, "forbidden_imported": forbidden})
+            report[hook] = result
+
+            if result["exit_code"] != 0:
+                failures.append(f"{hook}: exited {result['exit_code']} on the no-workflow path")
+            if forbidden:
+                failures.append(f"{hook}: imported {', '.join(forbidden)} on the no-workflow path")
+            if result["import_us"] > max_us:
+                failures.append(
+                    f"{hook}: {result['import_us'] / 1000:.1f}ms of imports exceeds "
+                    f"budget {budget['max_import_ms']}ms"
+                )
+
+    if as_json:
+        print(json.dumps({"report": report, "failures": failures}, indent=2))
+    else:
+        for hook, result in report.items():
+            status = "FAIL" if any(f.startswith(f"{hook}:") for f in failures) else "ok"
+            print(
+                f"{status:4} {hook:14} {result['import_us'] / 1000:6.1f}ms "
+                f"(budget {result['max_import_us'] / 1000:.0f}ms, {len(result['modules'])} modules)"
+            )
+        for failure in failures:
+            print(f"  - {failure}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Hook Load Generator - Many concurrent sessions through the real hook scripts.
+
+Simulates N Claude Code sessions, each with its own CSC_SESSION_ID and
+current.json, running complete /assist:* workflows against one daemon:
+
+    UserPromptSubmit /assist:<command>       -> workflow_hook   (expect 0)
+    per phase:
+        PreToolUse Task(required agent)      -> phase_hook      (expect 0)
+        Stop mid-phase                       -> stop_hook       (expect 2)
+        SubagentStop(agent)                  -> announce_hook   (expect 0)
+        PreToolUse workflow_transition       -> phase_hook      (expect 0)
+        (the MCP tool's POST /workflow/transition)
+    Stop after the last phase                -> stop_hook       (expect 0)
+
+/assist:wizard runs the router and auto-chains into the recommended command.
+Every hook runs as hooks.json does (hook_shim.py <hook>) with that hook's
+hooks.json timeout; a hook still running at its timeout is killed and
+counted as a timeout hit.
+
+Usage:
+    python3 scripts/load_hooks.py --sessions 8 --duration 30
+    python3 scripts/load_hooks.py --sessions 16 --rate 5 --worker
+    python3 scripts/load_hooks.py --daemon-url http://127.0.0.1:8766 --workflows-dir ~/.claude/local/workflows
+
+Without --daemon-url an in-process stand-in daemon is used (see
+standin_daemon.py; --daemon-latency / --error-rate / --drop-rate inject faults).
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import urllib.request
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from bench_hooks import HOOKS_DIR, PLUGIN_ROOT, ROUTER_OUTPUT, SHIM, percentile, start_worker, stop_worker
+from standin_daemon import Fault, StandInDaemon
+
+
+DEFAULT_COMMANDS = ("assist:create", "assist:verify", "assist:plan", "assist:health-check", "assist:wizard")
+
+def load_hook_timeouts() -> Dict[str, float]:
+    """hook module -> timeout seconds, from hooks.json."""
+    config = json.loads((HOOKS_DIR / "hooks.json").read_text())
+    timeouts: Dict[str, float] = {}
+    for entries in config.get("hooks", {}).values():
+        for entry in entries:
+            for hook in entry.get("hooks", []):
+                command = hook.get("command", "").split()
+                if command and "timeout" in hook:
+                    timeouts[command[-1]] = float(hook["timeout"])
+    return timeouts
+
+
+class Results:
+    """Thread-safe per-hook latency, failure and timeout counters."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {}
+        self.failures: Dict[str, int] = {}
+        self.timeouts: Dict[str, int] = {}
+        self.failure_samples: List[str] = []
+        self.workflows_completed = 0
+        self.workflows_failed = 0
+        self.transition_failures = 0
+
+    def record(self, hook: str, ms: float, ok: bool, timed_out: bool, detail: str = ""):
+        with self.lock:
+            self.latencies.setdefault(hook, []).append(ms)
+            if timed_out:
+                self.timeouts[hook] = self.timeouts.get(hook, 0) + 1
+            if not ok:
+                self.failures[hook] = self.failures.get(hook, 0) + 1
+                self.note(f"{hook}: {detail}")
+
+    def note(self, sample: str):
+        """Keep the first few failure descriptions for the report."""
+        if len(self.failure_samples) < 10:
+            self.failure_samples.append(sample)
+
+
+class Session(threading.Thread):
+    """One simulated session running workflows until the deadline."""
+
+    def __init__(
+        self,
+        index: int,
+        args: argparse.Namespace,
+        base_env: Dict[str, str],
+        workflows_root: Path,
+        workspace: str,
+        daemon_url: str,
+        timeouts: Dict[str, float],
+        results: Results,
+        deadline: float,
+    ):
+        super().__init__(name=f"session-{index}", daemon=True)
+        self.session_id = f"load-{index}-{uuid.uuid4().hex[:8]}"
+        self.args = args
+        self.env = dict(base_env, CSC_SESSION_ID=self.session_id)
+        self.workflows_root = workflows_root
+        self.workspace = workspace
+        self.daemon_url = daemon_url
+        self.timeouts = timeouts
+        self.results = results
+        self.deadline = deadline
+        self.interval = 1.0 / args.rate if args.rate > 0 else 0.0
+        self.next_event = time.monotonic()
+        self.commands = list(args.commands)
+        self.worker: Optional[subprocess.Popen] = None
+
+    def fire(self, hook: str, payload: Dict[str, Any], expect_exit: int) -> bool:
+        """Run one hook event at the configured rate and record the outcome."""
+        if self.interval:
+            delay = self.next_event - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self.next_event = max(self.next_event, time.monotonic() - self.interval) + self.interval
+
+        timeout = self.timeouts.get(hook, 10.0)
+        started = time.perf_counter()
+        try:
+            proc = subprocess.run(
+                [sys.executable, str(SHIM), hook],
+                input=json.dumps(payload).encode("utf-8"),
+                capture_output=True,
+                env=self.env,
+                cwd=self.workspace,
+                timeout=timeout,
+                check=False,
+            )
+        except subprocess.TimeoutExpired:
+            ms = (time.perf_counter() - started) * 1000
+            self.results.record(hook, ms, ok=False, timed_out=True, detail=f"timed out after {timeout}s")
+            return False
+        ms = (time.perf_counter() - started) * 1000
+        ok = proc.returncode == expect_exit
+        detail = "" if ok else f"exit {proc.returncode} (expected {expect_exit}) {proc.stdout[:160]!r} {proc.stderr[-160:]!r}"
+        self.results.record(hook, ms, ok=ok, timed_out=False, detail=detail)
+        return ok
+
+    def _current_workflow_id(self) -> Optional[str]:
+        try:
+            return json.loads((self.workflows_root / self.session_id / "current.json").read_text()).get("workflow_id")
+        except (OSError, ValueError):
+            return None
+
+    def _daemon(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Driver-side request (retried, so injected faults only hit the hooks)."""
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        for _ in range(5):
+            request = urllib.request.Request(
+                self.daemon_url + path, data=data, method=method, headers={"content-type": "application/json"}
+            )
+            try:
+                with urllib.request.urlopen(request, timeout=5) as resp:
+                    return json.loads(resp.read() or b"null")
+            except (OSError, ValueError):
+                time.sleep(0.05)
+        return None
+
+    def _status(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        return self._daemon("GET", "/workflow/status?" + urllib.parse.urlencode({"workflow_id": workflow_id}))
+
+    def _wait_for_completion(self, workflow_id: str, timeout: float = 5.0) -> Optional[Dict[str, Any]]:
+        """Wait until the spooled agent_completed event reached the daemon."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._current_workflow_id() != workflow_id:
+                return None  # auto-chained into a new workflow
+            state = self._status(workflow_id)
+            if state and state.get("phase_status") in ("agent_complete", "completed"):
+                return state
+            time.sleep(0.02)
+        return None
+
+    def run_workflow(self, command: str) -> bool:
+        if not self.fire("workflow_hook", {"prompt": f"/{command} load test task"}, 0):
+            return False
+        for _ in range(20):
+            workflow_id = self._current_workflow_id()
+            state = self._status(workflow_id) if workflow_id else None
+            if state is None:
+                with self.results.lock:
+                    self.results.note(f"/{command}: no workflow state for {workflow_id or 'session'}")
+                return False
+            if state.get("phase_status") == "completed":
+                return self.fire("stop_hook", {}, 0)
+
+            agent = state["required_agent"]
+            subagent_type = f"forge3:{agent}"
+            self.fire("phase_hook", {"tool_name": "Task", "tool_input": {"subagent_type": subagent_type}}, 0)
+            self.fire("stop_hook", {}, 2)
+            output = ROUTER_OUTPUT if agent == "router-agent" else f"{agent} finished"
+            self.fire("announce_hook", {"subagent_type": subagent_type, "tool_output": output}, 0)
+
+            state = self._wait_for_completion(workflow_id)
+            if state is None or state.get("phase_status") == "completed" or not state.get("allowed_next_phases"):
+                continue  # auto-chained, finished, or event lost; re-read the pointer
+            to_phase = state["allowed_next_phases"][0]
+            self.fire("phase_hook", {
+                "tool_name": "mcp__workflow__workflow_transition",
+                "tool_input": {"from_phase": state["current_phase"], "to_phase": to_phase},
+            }, 0)
+            result = self._daemon("POST", "/workflow/transition", {
+                "workflow_id": workflow_id,
+                "session_id": self.session_id,
+                "from_phase": state["current_phase"],
+                "to_phase": to_phase,
+                "evidence": {"source": "load_hooks"},
+                "conditions_met": [],
+            })
+            if not result or not result.get("success"):
+                with self.results.lock:
+                    self.results.transition_failures += 1
+                    self.results.note(f"/{command}: transition to {to_phase} failed: {result}")
+                return False
+        with self.results.lock:
+            self.results.note(f"/{command}: did not complete within 20 phases")
+        return False
+
+    def run(self):
+        if self.args.worker:
+            self.worker = start_worker(self.session_id, self.env, self.workspace)
+        try:
+            i = 0
+            while time.monotonic() < self.deadline:
+                ok = self.run_workflow(self.commands[i % len(self.commands)])
+                with self.results.lock:
+                    if ok:
+                        self.results.workflows_completed += 1
+                    else:
+                        self.results.workflows_failed += 1
+                i += 1
+        finally:
+            if self.worker is not None:
+                stop_worker(self.worker)
+
+
+def summarize(results: Results, elapsed: float, timeouts: Dict[str, float]) -> Dict[str, Any]:
+    hooks = {}
+    for hook, values in sorted(results.latencies.items()):
+        hooks[hook] = {
+            "events": len(values),
+            "p50_ms": round(percentile(values, 50), 2),
+            "p90_ms": round(percentile(values, 90), 2),
+            "p99_ms": round(percentile(values, 99), 2),
+            "max_ms": round(max(values), 2),
+            "failures": results.failures.get(hook, 0),
+            "timeout_hits": results.timeouts.get(hook, 0),
+            "timeout_s": timeouts.get(hook),
+        }
+    events = sum(h["events"] for h in hooks.values())
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "events": events,
+        "throughput_eps": round(events / elapsed, 2) if elapsed else 0.0,
+        "workflows_completed": results.workflows_completed,
+        "workflows_failed": results.workflows_failed,
+        "transition_failures": results.transition_failures,
+        "hooks": hooks,
+        "failure_samples": results.failure_samples,
+    }
+
+
+def main():
+    """Run the load test."""
+    parser = argparse.ArgumentParser(description="Multi-session load generator for forge3 hooks")
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to keep starting workflows")
+    parser.add_argument("--rate", type=float, default=0.0, help="Hook events per second per session (0 = unpaced)")
+    parser.add_argument("--commands", type=lambda v: v.split(","), default=list(DEFAULT_COMMANDS))
+    parser.add_argument("--worker", action="store_true", help="Serve each session from a resident hook worker")
+    parser.add_argument("--daemon-url", help="Use a running daemon instead of the stand-in")
+    parser.add_argument("--workflows-dir", help="Workflows root of --daemon-url's daemon")
+    parser.add_argument("--daemon-latency", type=float, default=0.0, metavar="MS")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    timeouts = load_hook_timeouts()
+    results = Results()
+
+    with tempfile.TemporaryDirectory(prefix="forge3-load-") as tmp:
+        workspace = Path(tmp) / "workspace"
+        workspace.mkdir()
+        standin = None
+        if args.daemon_url:
+            if not args.workflows_dir:
+                parser.error("--workflows-dir is required with --daemon-url")
+            if not args.daemon_url.startswith("http://"):
+                parser.error("--daemon-url must be an http:// URL")
+            daemon_url = args.daemon_url.rstrip("/")
+            workflows_root = Path(args.workflows_dir).expanduser()
+        else:
+            workflows_root = Path(tmp) / "workflows"
+            fault = Fault(latency_ms=args.daemon_latency, error_rate=args.error_rate, drop_rate=args.drop_rate)
+            standin = StandInDaemon(workflows_root, faults={"*": fault}).start()
+            daemon_url = standin.url
+
+        env = dict(os.environ)
+        for key in ("WORKFLOW_ENGINE_SOCKET", "WORKFLOW_ENGINE_HOST", "WORKFLOW_ENGINE_PORT",
+                    "FORGE3_HOOK_WORKER", "WORKFLOW_WORKSPACE_ROOT"):
+            env.pop(key, None)
+        env.update({
+            "WORKFLOW_ENGINE_URL": daemon_url,
+            "WORKFLOW_ENGINE_WORKFLOWS_DIR": str(workflows_root),
+            "CLAUDE_PLUGIN_ROOT": str(PLUGIN_ROOT),
+        })
+
+        started = time.monotonic()
+        deadline = started + args.duration
+        sessions = [
+            Session(i, args, env, workflows_root, str(workspace), daemon_url, timeouts, results, deadline)
+            for i in range(args.sessions)
+        ]
+        try:
+            for session in sessions:
+                session.start()
+            for session in sessions:
+                session.join()
+        finally:
+            elapsed = time.monotonic() - started
+            daemon_stats = standin.stats() if standin else None
+            if standin is not None:
+                standin.close()
+
+    summary = summarize(results, elapsed, timeouts)
+    summary.update({"sessions": args.sessions, "rate": args.rate, "worker": args.worker, "daemon": daemon_stats})
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(
+            f"{args.sessions} sessions, {summary['elapsed_s']}s: {summary['events']} events "
+            f"({summary['throughput_eps']}/s), workflows {summary['workflows_completed']} ok / "
+            f"{summary['workflows_failed']} failed"
+        )
+        print(f"{'hook':14} {'events':>7} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9} {'fail':>5} {'timeout':>8}")
+        for hook, h in summary["hooks"].items():
+            print(
+                f"{hook:14} {h['events']:7} {h['p50_ms']:7.1f}ms {h['p90_ms']:7.1f}ms {h['p99_ms']:7.1f}ms "
+                f"{h['max_ms']:7.1f}ms {h['failures']:5} {h['timeout_hits']:4}/{h['timeout_s']:.0f}s"
+            )
+        for sample in summary["failure_samples"]:
+            print(f"  - {sample}")
+
+    sys.exit(1 if results.failures or results.workflows_failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+"""
+Stand-in Daemon - Local workflow daemon for benchmarks and fault testing.
+
+Implements the daemon API the control client uses, with the policy shapes
+it expects, without csc/workflow-daemon:
+
+- POST /workflow/init        - Start a workflow; writes <root>/<session>/current.json
+- GET  /workflow/status      - WorkflowState (ETag / If-None-Match -> 304)
+- POST /workflow/transition  - Validated against allowed_next_phases and phase_status
+- GET  /workflow/can-stop    - Only completed workflows may stop
+- POST /event/record         - agent_started -> agent_running, agent_completed -> agent_complete
+- POST /event/batch          - Ordered batch of events (event_id deduplicated)
+- GET  /sse/events           - State changes as `data: {"workflow_id", "state"}`
+- GET  /health
+- GET  /standin/stats        - Per-endpoint counters; POST /standin/reset clears them
+
+FAULT INJECTION (per endpoint path, or "*" for all):
+- latency      - Added delay in ms (optionally with jitter)
+- error rate   - Fraction of requests answered 503
+- drop rate    - Fraction of connections closed without a response
+
+Usage:
+    python3 scripts/standin_daemon.py --port 8766
+    python3 scripts/standin_daemon.py --socket /tmp/workflowd.sock \\
+        --latency /workflow/status=50 --error-rate /event/record=0.1 --drop-rate '*=0.01'
+
+In-process:
+    daemon = StandInDaemon(workflows_root, faults={"/workflow/status": Fault(latency_ms=20)})
+    daemon.start()      # daemon.url -> WORKFLOW_ENGINE_URL
+    ...
+    daemon.stats()
+    daemon.close()
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import queue
+import random
+import socket
+import socketserver
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+# Phase sequence, final phase and workflow type per command
+POLICIES: Dict[str, Dict[str, Any]] = {
+    "assist:wizard": {"type": "dispatcher", "phases": ["router"], "final": None, "dispatcher": True},
+    "assist:plan": {"type": "plan", "phases": ["discover", "semantic"], "final": "schema-check"},
+    "assist:create": {"type": "create", "phases": ["discover", "semantic", "execute"], "final": "schema-check"},
+    "assist:verify": {"type": "verify", "phases": ["discover", "validate"], "final": "schema-check"},
+    "assist:health-check": {"type": "health-check", "phases": ["discover", "analyze", "aggregate"], "final": "schema-check"},
+}
+
+# Agent required by each phase
+PHASE_AGENTS: Dict[str, str] = {
+    "router": "router-agent",
+    "discover": "discovery-agent",
+    "semantic": "semantic-agent",
+    "execute": "execute-agent",
+    "validate": "analyzer-agent",
+    "analyze": "analyzer-agent",
+    "aggregate": "reporter-agent",
+    "schema-check": "schema-check-agent",
+}
+
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+@dataclass
+class Fault:
+    """Injected behaviour for one endpoint."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    drop_rate: float = 0.0
+
+
+class EndpointStats:
+    """Request counters and latency histogram for one endpoint."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.dropped = 0
+        self.status_codes: Dict[str, int] = {}
+        self.latencies_ms: List[float] = []
+
+    def as_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies_ms)
+
+        def pct(p: float) -> float:
+            if not ordered:
+                return 0.0
+            return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))], 3)
+
+        buckets = {str(bound): sum(1 for v in ordered if v <= bound) for bound in LATENCY_BUCKETS_MS}
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "dropped": self.dropped,
+            "error_rate": round(self.errors / self.requests, 4) if self.requests else 0.0,
+            "status_codes": dict(self.status_codes),
+            "p50_ms": pct(50),
+            "p99_ms": pct(99),
+            "latency_buckets_ms": buckets,
+        }
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        conn, _ = super().get_request()
+        # BaseHTTPRequestHandler expects a (host, port) client address
+        return conn, ("unix", 0)
+
+
+class StandInDaemon:
+    """Threaded HTTP stand-in for the workflow daemon."""
+
+    def __init__(
+        self,
+        workflows_root: Path,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        socket_path: Optional[str] = None,
+        faults: Optional[Dict[str, Fault]] = None,
+        seed: Optional[int] = None,
+    ):
+        self.workflows_root = Path(workflows_root)
+        self.host = host
+        self.port = port
+        self.socket_path = socket_path
+        self.faults: Dict[str, Fault] = dict(faults or {})
+        self.workflows: Dict[str, Dict[str, Any]] = {}
+        self.versions: Dict[str, int] = {}
+        self.seen_event_ids: set = set()
+        self.requests = 0
+        self._stats: Dict[str, EndpointStats] = {}
+        self._subscribers: List[queue.Queue] = []
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._closing = threading.Event()
+        self.server: Optional[socketserver.BaseServer] = None
+        self.url = ""
+
+
+    def start(self) -> "StandInDaemon":
+        """Bind and serve on a background thread; sets self.url."""
+        handler = self._handler()
+        if self.socket_path:
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            self.server = _UnixHTTPServer(self.socket_path, handler)
+            self.url = f"unix://{os.path.abspath(self.socket_path)}"
+        else:
+            self.server = ThreadingHTTPServer((self.host, self.port), handler)
+            self.server.daemon_threads = True
+            self.url = f"http://{self.host}:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, name="standin-daemon", daemon=True).start()
+        return self
+
+    def close(self):
+        self._closing.set()
+        for subscriber in list(self._subscribers):
+            subscriber.put(None)
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if self.socket_path and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def __enter__(self) -> "StandInDaemon":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+    def set_fault(self, endpoint: str, fault: Fault):
+        """Configure faults for an endpoint path ("*" for all)."""
+        with self._lock:
+            self.faults[endpoint] = fault
+
+    def _fault_for(self, endpoint: str) -> Fault:
+        return self.faults.get(endpoint) or self.faults.get("*") or Fault()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "workflows": len(self.workflows),
+                "sse_subscribers": len(self._subscribers),
+                "endpoints": {path: s.as_dict() for path, s in sorted(self._stats.items())},
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.requests = 0
+            self._stats.clear()
+
+    def _record(self, endpoint: str, started: float, status: Optional[int], dropped: bool = False):
+        with self._lock:
+            stats = self._stats.setdefault(endpoint, EndpointStats())
+            stats.requests += 1
+            if dropped:
+                stats.dropped += 1
+            else:
+                stats.status_codes[str(status)] = stats.status_codes.get(str(status), 0) + 1
+                if status is not None and status >= 500:
+                    stats.errors += 1
+            stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+
+
+    def start_workflow(
+        self,
+        command: str,
+        session_id: str,
+        task: str = "",
+        phase_status: str = "agent_required",
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Create a workflow and point the session at it."""
+        policy = POLICIES[command]
+        state = {
+            "workflow_id": f"wf-{uuid.uuid4().hex[:12]}",
+            "command": command,
+            "workflow_type": policy["type"],
+            "phases": list(policy["phases"]),
+            "final_phase": policy["final"],
+            "current_phase": "",
+            "phase_status": phase_status,
+            "allowed_next_phases": [],
+            "is_dispatcher": policy.get("dispatcher", False),
+            "session_id": session_id,
+            "required_agent": None,
+            "prompt": task,
+            "metadata": metadata or {},
+        }
+        self._enter_phase(state, policy["phases"][0], phase_status)
+        self._publish(state)
+        if session_id:
+            session_dir = self.workflows_root / session_id
+            session_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = session_dir / f"current.json.{uuid.uuid4().hex}.tmp"
+            tmp_path.write_text(json.dumps({"workflow_id": state["workflow_id"]}))
+            os.replace(tmp_path, session_dir / "current.json")
+        return state
+
+    @staticmethod
+    def _sequence(state: Dict[str, Any]) -> List[str]:
+        return state["phases"] + ([state["final_phase"]] if state["final_phase"] else [])
+
+    def _enter_phase(self, state: Dict[str, Any], phase: str, phase_status: str = "agent_required"):
+        sequence = self._sequence(state)
+        index = sequence.index(phase)
+        state["current_phase"] = phase
+        state["phase_status"] = phase_status
+        state["required_agent"] = PHASE_AGENTS.get(phase)
+        state["allowed_next_phases"] = sequence[index + 1:index + 2]
+
+    def _publish(self, state: Dict[str, Any]):
+        """Store a state change and fan it out to SSE subscribers."""
+        with self._lock:
+            self.workflows[state["workflow_id"]] = state
+            self.versions[state["workflow_id"]] = self.versions.get(state["workflow_id"], 0) + 1
+            subscribers = list(self._subscribers)
+        message = json.dumps({"workflow_id": state["workflow_id"], "state": state})
+        for subscriber in subscribers:
+            subscriber.put(message)
+
+    def _etag(self, workflow_id: str) -> str:
+        digest = hashlib.sha1(f"{workflow_id}:{self.versions.get(workflow_id, 0)}".encode()).hexdigest()[:16]
+        return f'"{digest}"'
+
+    def apply_event(self, event: Dict[str, Any]) -> bool:
+        """Apply one event; events already seen (by event_id) are acknowledged only."""
+        event_id = event.get("event_id")
+        with self._lock:
+            if event_id and event_id in self.seen_event_ids:
+                return True
+            if event_id:
+                self.seen_event_ids.add(event_id)
+            state = self.workflows.get(event.get("workflow_id") or "")
+        if state is None:
+            return True
+        event_type = event.get("event_type")
+        if event_type == "agent_started" and state["phase_status"] == "agent_required":
+            state = dict(state, phase_status="agent_running")
+        elif event_type == "agent_completed" and state["phase_status"] in ("agent_required", "agent_running"):
+            state = dict(state, phase_status="agent_complete")
+            if state["is_dispatcher"] or not state["allowed_next_phases"]:
+                state["phase_status"] = "completed"
+        else:
+            return True
+        self._publish(state)
+        return True
+
+    def transition(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        state = self.workflows.get(body.get("workflow_id") or "")
+        if state is None:
+            return {"success": False, "message": "Unknown workflow", "missing_conditions": []}
+        to_phase = body.get("to_phase")
+        if body.get("from_phase") != state["current_phase"]:
+            return {"success": False, "message": f"Current phase is {state['current_phase']}", "missing_conditions": []}
+        if to_phase not in state["allowed_next_phases"]:
+            return {"success": False, "message": f"{to_phase} not allowed", "missing_conditions": []}
+        if state["phase_status"] != "agent_complete":
+            return {"success": False, "message": "Agent not complete", "missing_conditions": ["agent_completed"]}
+        state = dict(state)
+        self._enter_phase(state, to_phase)
+        self._publish(state)
+        return {
+            "success": True,
+            "message": f"Transitioned to {to_phase}",
+            "new_phase": to_phase,
+            "new_status": state["phase_status"],
+            "missing_conditions": [],
+        }
+
+
+    def _handler(self):
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, code: int, payload: Any = None, headers: Optional[Dict[str, str]] = None) -> int:
+                body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+                self.send_response(code)
+                if payload is not None:
+                    self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+                return code
+
+            def _query(self, name: str) -> str:
+                return (parse_qs(urlparse(self.path).query).get(name) or [""])[0]
+
+            def _body(self) -> Dict[str, Any]:
+                length = int(self.headers.get("content-length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    return {}
+                return body if isinstance(body, dict) else {}
+
+            def _serve(self, method: str):
+                endpoint = urlparse(self.path).path
+                started = time.perf_counter()
+                body = self._body() if method == "POST" else {}
+                with daemon._lock:
+                    daemon.requests += 1
+                fault = daemon._fault_for(endpoint)
+                delay = fault.latency_ms + (daemon._random.uniform(0, fault.jitter_ms) if fault.jitter_ms else 0)
+                if delay:
+                    time.sleep(delay / 1000)
+                if fault.drop_rate and daemon._random.random() < fault.drop_rate:
+                    self.close_connection = True
+                    try:
+                        self.connection.shutdown(socket.SHUT_RDWR)
+                    except OSError:
+                        pass
+                    daemon._record(endpoint, started, None, dropped=True)
+                    return
+                if fault.error_rate and daemon._random.random() < fault.error_rate:
+                    status = self._reply(503, {"detail": "injected error"})
+                elif endpoint == "/sse/events" and method == "GET":
+                    daemon._record(endpoint, started, 200)
+                    self._stream()
+                    return
+                else:
+                    status = self._route(method, endpoint, body)
+                daemon._record(endpoint, started, status)
+
+            def _route(self, method: str, endpoint: str, body: Dict[str, Any]) -> int:
+                if method == "GET" and endpoint == "/health":
+                    return self._reply(200, {"status": "ok"})
+                if method == "GET" and endpoint == "/standin/stats":
+                    return self._reply(200, daemon.stats())
+                if method == "POST" and endpoint == "/standin/reset":
+                    daemon.reset_stats()
+                    return self._reply(200, {"reset": True})
+                if method == "POST" and endpoint == "/workflow/init":
+                    command = body.get("command")
+                    if command not in POLICIES:
+                        return self._reply(400, {"detail": f"Unknown command: {command}"})
+                    state = daemon.start_workflow(
+                        command, body.get("session_id") or "", body.get("task") or "", metadata=body.get("metadata")
+                    )
+                    return self._reply(200, state, {"ETag": daemon._etag(state["workflow_id"])})
+                if method == "GET" and endpoint == "/workflow/status":
+                    workflow_id = self._query("workflow_id")
+                    state = daemon.workflows.get(workflow_id)
+                    if state is None:
+                        return self._reply(404, {"detail": "Workflow not found"})
+                    etag = daemon._etag(workflow_id)
+                    if self.headers.get("If-None-Match") == etag:
+                        return self._reply(304, None, {"ETag": etag})
+                    return self._reply(200, state, {"ETag": etag})
+                if method == "POST" and endpoint == "/workflow/transition":
+                    return self._reply(200, daemon.transition(body))
+                if method == "GET" and endpoint == "/workflow/can-stop":
+                    state = daemon.workflows.get(self._query("workflow_id"))
+                    if state is None or state["phase_status"] in ("completed", "cancelled"):
+                        return self._reply(200, {"can_stop": True, "reason": ""})
+                    return self._reply(200, {
+                        "can_stop": False,
+                        "reason": f"Phase {state['current_phase']} is {state['phase_status']}",
+                    })
+                if method == "POST" and endpoint == "/event/record":
+                    return self._reply(200, {"recorded": daemon.apply_event(body)})
+                if method == "POST" and endpoint == "/event/batch":
+                    events = body.get("events") if isinstance(body.get("events"), list) else []
+                    accepted = sum(1 for event in events if isinstance(event, dict) and daemon.apply_event(event))
+                    return self._reply(200, {"accepted": accepted})
+                return self._reply(404, {"detail": "Not found"})
+
+            def _stream(self):
+                subscriber: queue.Queue = queue.Queue()
+                with daemon._lock:
+                    daemon._subscribers.append(subscriber)
+                try:
+                    self.send_response(200)
+                    self.send_header("content-type", "text/event-stream")
+                    self.send_header("cache-control", "no-cache")
+                    self.end_headers()
+                    self.wfile.write(b": connected\n\n")
+                    self.wfile.flush()
+                    while not daemon._closing.is_set():
+                        try:
+                            message = subscriber.get(timeout=15.0)
+                        except queue.Empty:
+                            message = ""
+                        if message is None:
+                            break
+                        chunk = f"data: {message}\n\n" if message else ": keepalive\n\n"
+                        self.wfile.write(chunk.encode("utf-8"))
+                        self.wfile.flush()
+                except OSError:
+                    pass
+                finally:
+                    self.close_connection = True
+                    with daemon._lock:
+                        if subscriber in daemon._subscribers:
+                            daemon._subscribers.remove(subscriber)
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+        return Handler
+
+
+def _parse_faults(specs: List[str], field: str, faults: Dict[str, Fault]):
+    """Apply ENDPOINT=VALUE specs (e.g. /workflow/status=50) to faults[endpoint].field."""
+    for spec in specs or []:
+        endpoint, _, value = spec.rpartition("=")
+        if not endpoint:
+            raise SystemExit(f"expected ENDPOINT=VALUE, got {spec!r}")
+        setattr(faults.setdefault(endpoint, Fault()), field, float(value))
+
+
+def main():
+    """Run the stand-in daemon in the foreground."""
+    parser = argparse.ArgumentParser(description="Stand-in forge3 workflow daemon")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--socket", help="Serve on a Unix domain socket instead of TCP")
+    parser.add_argument("--workflows-dir", default=os.environ.get("WORKFLOW_ENGINE_WORKFLOWS_DIR")
+                        or str(Path.home() / ".claude" / "local" / "workflows"))
+    parser.add_argument("--latency", action="append", metavar="ENDPOINT=MS")
+    parser.add_argument("--jitter", action="append", metavar="ENDPOINT=MS")
+    parser.add_argument("--error-rate", action="append", metavar="ENDPOINT=FRACTION")
+    parser.add_argument("--drop-rate", action="append", metavar="ENDPOINT=FRACTION")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    faults: Dict[str, Fault] = {}
+    _parse_faults(args.latency, "latency_ms", faults)
+    _parse_faults(args.jitter, "jitter_ms", faults)
+    _parse_faults(args.error_rate, "error_rate", faults)
+    _parse_faults(args.drop_rate, "drop_rate", faults)
+
+    daemon = StandInDaemon(
+        Path(args.workflows_dir).expanduser(),
+        host=args.host,
+        port=args.port,
+        socket_path=args.socket,
+        faults=faults,
+        seed=args.seed,
+    ).start()
+    print(f"Stand-in daemon at {daemon.url} (workflows: {daemon.workflows_root})", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(daemon.stats(), indent=2), file=sys.stderr)
+        daemon.close()
+
+
+if __name__ == "__main__":
+    main()